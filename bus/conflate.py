@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+bus/conflate.py — 심볼별 최신값 병합(conflation) 입력 버퍼
+
+피드가 Hub.on_tick 보다 빠를 때:
+- put(): 심볼별 최신값만 유지 (같은 심볼이 처리 전에 다시 오면 덮어쓰기 = merged)
+- 버퍼는 심볼 수(max_symbols)로 제한 → 가득 찬 상태에서 새 심볼은 버림 (dropped)
+- take(): 쌓인 최신값을 한 번에 꺼내 snapshot {sym: val} 으로 반환, 가장 오래된 대기 시간(queue age) 기록
+
+생산자(피드 스레드) / 소비자(Hub 루프) 1:1 기준. 메트릭은 summary_dict() 로 조회.
+"""
+from __future__ import annotations
+import threading
+from time import perf_counter_ns
+from typing import Any, Dict, Optional, Tuple
+
+from obs.latency import LatencyHistogram
+
+__all__ = ["ConflatingBuffer"]
+
+
+class ConflatingBuffer:
+    def __init__(self, max_symbols: int = 4096) -> None:
+        self.max_symbols = max(1, int(max_symbols))
+        self._pending: Dict[str, Tuple[Any, int]] = {}  # sym -> (최신값, 최초 대기 시각 ns)
+        self._cv = threading.Condition()
+        self._closed = False
+        # ---- 메트릭
+        self.received = 0       # put 된 심볼 업데이트 수
+        self.merged = 0         # 처리 전에 덮어쓴 업데이트 수
+        self.dropped = 0        # 버퍼 가득 참으로 버린 업데이트 수
+        self.batches = 0        # take 로 꺼낸 snapshot 수
+        self.max_depth = 0      # 최대 대기 심볼 수
+        self.age = LatencyHistogram()  # take 시점의 가장 오래된 대기 시간(ns)
+
+    # ---------- 생산자 ----------
+    def put(self, snapshot: Dict[str, Any]) -> None:
+        """snapshot {sym: val} 의 각 심볼을 병합 저장"""
+        now = perf_counter_ns()
+        with self._cv:
+            pending = self._pending
+            for sym, val in snapshot.items():
+                self.received += 1
+                prev = pending.get(sym)
+                if prev is not None:
+                    pending[sym] = (val, prev[1])  # 대기 시작 시각은 최초 도착 기준 유지
+                    self.merged += 1
+                elif len(pending) < self.max_symbols:
+                    pending[sym] = (val, now)
+                else:
+                    self.dropped += 1
+            if len(pending) > self.max_depth:
+                self.max_depth = len(pending)
+            self._cv.notify()
+
+    def close(self) -> None:
+        """더 이상 입력 없음 — 남은 값은 take 로 계속 꺼낼 수 있음"""
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+
+    # ---------- 소비자 ----------
+    def take(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        대기 중인 최신값 전체를 snapshot 으로 반환.
+        비어 있으면 timeout 까지 대기, 닫혔고 비었으면 None.
+        """
+        with self._cv:
+            if not self._pending and not self._closed:
+                self._cv.wait(timeout)
+            if not self._pending:
+                return None if self._closed else {}
+            pending, self._pending = self._pending, {}
+        now = perf_counter_ns()
+        oldest = min(t for _, t in pending.values())
+        self.age.record(now - oldest)
+        self.batches += 1
+        return {sym: v for sym, (v, _) in pending.items()}
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def summary_dict(self) -> Dict[str, Any]:
+        age = self.age.summary_dict()
+        return {
+            "received": self.received,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "max_depth": self.max_depth,
+            "queue_age_p50_us": age["p50_us"],
+            "queue_age_p99_us": age["p99_us"],
+            "queue_age_max_us": age["max_us"],
+        }
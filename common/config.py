@@ -46,5 +46,13 @@ TRAIL_PCT = 0.010  # 1.0%
 BROKER = "KIWOOM"         # "MOCK" | "KIWOOM"
 ACCOUNT_NO = "00000000"   # 모의/실계좌 번호
 DRY_RUN = True            # 안전 기본값: 실주문 차단 (내일 필요 시 False로)
-ORDER_RATE_LIMIT_MS = 120
+# 토큰 버킷 레이트리밋 (키움 TR 초당 제한): 주문/취소/조회 각각 초당 N회, 버스트 허용량
+# (구 ORDER_RATE_LIMIT_MS 고정 간격 설정은 폐지 — ORDER_RATE_PER_SEC 가 대체.
+#  ORDER_RATE_PER_SEC 없이 ORDER_RATE_LIMIT_MS 만 남은 설정이면 라우터가 1000/ms 건/초로 환산)
+# OrderRouter.buy/sell/cancel 은 토큰이 없으면 retry_after 만큼 기다렸다 재시도 (ORDER_BLOCK_ON_LIMIT=False 면 즉시 RATE_LIMITED)
+ORDER_RATE_PER_SEC = 5
+CANCEL_RATE_PER_SEC = 5
+QUERY_RATE_PER_SEC = 5
+ORDER_BURST = 5
+ORDER_BLOCK_ON_LIMIT = True
 # ====== END: BROKER SETTINGS ======
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+common/cooldown.py — 해시드 타이밍 휠 기반 쿨다운 서비스
+
+- 키: (symbol, reason) — 예) ("005930", "reentry"), ("005930", "exit"), ("*", "daydd")
+- TimingWheel: 만료시각을 슬롯(= 만료 버킷 % 슬롯 수)에 해시 → arm/check/cancel O(1)
+  advance(now) 가 지나간 버킷만 훑어 만료 항목 제거 → 메모리는 '활성 쿨다운 수'로 제한
+- CooldownService: 틱 단위(ticks) + 벽시계 초 단위(clock) 휠 두 개를 묶어 Hub/ExitRules/정책이 공유
+
+check(active/until)는 만료시각을 직접 비교하므로 advance 주기와 무관하게 정확하다.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+__all__ = ["TimingWheel", "CooldownService"]
+
+
+class TimingWheel:
+    """
+    단일 시간 단위 해시드 타이밍 휠.
+    resolution: 버킷 폭(틱 휠=1, 초 휠=1.0초 등), slots: 슬롯 수(한 바퀴 = resolution*slots)
+    한 바퀴보다 먼 만료도 허용(같은 슬롯에 남아 다음 바퀴에 다시 검사됨).
+    """
+    __slots__ = ("resolution", "_slots", "_deadline", "_bucket")
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512) -> None:
+        if resolution <= 0 or slots <= 0:
+            raise ValueError("resolution/slots must be positive")
+        self.resolution = resolution
+        self._slots: List[Dict[Hashable, float]] = [{} for _ in range(int(slots))]
+        self._deadline: Dict[Hashable, float] = {}
+        self._bucket: Optional[int] = None  # 마지막으로 훑은 버킷
+
+    def _bucket_of(self, t: float) -> int:
+        return int(t // self.resolution)
+
+    def _slot(self, t: float) -> Dict[Hashable, float]:
+        return self._slots[self._bucket_of(t) % len(self._slots)]
+
+    # ---------- 갱신 ----------
+    def arm(self, key: Hashable, until: float, now: Optional[float] = None) -> None:
+        """key를 until(절대시각)까지 쿨다운. 기존 항목은 교체(연장/단축 모두)."""
+        if now is not None:
+            self.advance(now)
+            if until <= now:
+                self.cancel(key)
+                return
+        old = self._deadline.get(key)
+        if old is not None:
+            self._slot(old).pop(key, None)
+        self._deadline[key] = until
+        self._slot(until)[key] = until
+
+    def cancel(self, key: Hashable) -> bool:
+        old = self._deadline.pop(key, None)
+        if old is None:
+            return False
+        self._slot(old).pop(key, None)
+        return True
+
+    def advance(self, now: float) -> int:
+        """now 까지 지나간 버킷의 만료 항목 제거. 제거 수 반환."""
+        target = self._bucket_of(now)
+        start = self._bucket
+        if start is None:
+            self._bucket = target
+            return 0
+        if target <= start:
+            return 0
+        n = len(self._slots)
+        removed = 0
+        deadline = self._deadline
+        # 직전 버킷부터 다시 훑음(버킷 안에서 now 이후였던 항목 처리). 한 바퀴 넘게 건너뛰면 전 슬롯 1회.
+        for b in range(start, min(target, start + n - 1) + 1):
+            slot = self._slots[b % n]
+            if not slot:
+                continue
+            expired = [k for k, t in slot.items() if t <= now]
+            for k in expired:
+                del slot[k]
+                del deadline[k]
+            removed += len(expired)
+        self._bucket = target
+        return removed
+
+    # ---------- 조회 ----------
+    def until(self, key: Hashable, now: float) -> float:
+        """활성 쿨다운의 만료시각 (없거나 지났으면 0.0)"""
+        t = self._deadline.get(key)
+        return t if t is not None and now < t else 0.0
+
+    def active(self, key: Hashable, now: float) -> bool:
+        t = self._deadline.get(key)
+        return t is not None and now < t
+
+    def remaining(self, key: Hashable, now: float) -> float:
+        t = self._deadline.get(key)
+        return max(0.0, t - now) if t is not None else 0.0
+
+    def items(self) -> List[Tuple[Hashable, float]]:
+        """활성 (key, 만료시각) 목록 (체크포인트용)"""
+        return list(self._deadline.items())
+
+    def clear(self) -> None:
+        for slot in self._slots:
+            slot.clear()
+        self._deadline.clear()
+        self._bucket = None
+
+    def __len__(self) -> int:
+        return len(self._deadline)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._deadline
+
+
+class CooldownService:
+    """
+    틱/벽시계 쿨다운 묶음. Hub가 소유하고 ExitRules·정책(ctx["cooldowns"])이 공유.
+      ticks: 틱 인덱스 기준 (재진입/청산 쿨다운, 스로틀)
+      clock: epoch 초 기준 (DayDD 하드컷 쿨다운 등)
+    """
+    __slots__ = ("ticks", "clock")
+
+    def __init__(self, tick_slots: int = 256, clock_slots: int = 1024,
+                 clock_resolution: float = 1.0) -> None:
+        self.ticks = TimingWheel(1, tick_slots)
+        self.clock = TimingWheel(clock_resolution, clock_slots)
+
+    def advance(self, tick: Optional[int] = None, now_ts: Optional[float] = None) -> None:
+        if tick is not None:
+            self.ticks.advance(tick)
+        if now_ts is not None:
+            self.clock.advance(now_ts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tick_active": len(self.ticks), "clock_active": len(self.clock)}
+
+    def __repr__(self) -> str:
+        return f"CooldownService(ticks={len(self.ticks)}, clock={len(self.clock)})"
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+common/position_book.py — 컬럼형 포지션 북 (PositionBook)
+
+- 심볼 → int id 인턴 (id는 세션 내 고정, 청산 후 재진입 시 같은 슬롯 재사용)
+- 병렬 array.array 컬럼: qty, avg_price, last_high, last_price, entry_ts, hold_ticks, exit_code
+- NumPy가 있으면 np.frombuffer 로 컬럼을 복사 없이 보고 MTM/노출/PnL을 벡터 연산 (없으면 순수 파이썬 폴백)
+- Hub / ExitRules / ExposurePolicy / RiskContext 가 같은 북을 직접 읽음 → 포지션 상태 단일 저장
+- Mapping 인터페이스(열린 포지션만): book.get(sym) → {"qty", "avg_price", "last_high"} (정책 호환)
+
+주의: 컬럼 뷰(np.frombuffer)는 다음 intern(신규 심볼) 전까지만 유효 — 보관하지 말 것
+"""
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 순수 파이썬 경로
+    np = None  # type: ignore
+
+__all__ = ["Position", "PositionBook", "EXIT_REASONS"]
+
+
+@dataclass
+class Position:
+    """북의 한 행을 꺼낸 스냅샷 (로깅/디버그용)"""
+    symbol: str
+    qty: int
+    avg_price: float
+    last_high: float = 0.0
+    entry_ts: float = 0.0
+    exit_reason: Optional[str] = None
+
+
+# exit_code ↔ 사유 (0 = 없음). 미등록 사유는 register 시 뒤에 추가
+EXIT_REASONS: List[str] = ["", "take_profit", "stop_loss", "trailing_stop", "exit"]
+
+
+class PositionBook(Mapping):
+    _COLS = (
+        ("qty", "q"),
+        ("avg_price", "d"),
+        ("last_high", "d"),
+        ("last_price", "d"),
+        ("entry_ts", "d"),
+        ("hold_ticks", "i"),
+        ("exit_code", "b"),
+    )
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.qty = array("q")
+        self.avg_price = array("d")
+        self.last_high = array("d")
+        self.last_price = array("d")
+        self.entry_ts = array("d")
+        self.hold_ticks = array("i")
+        self.exit_code = array("b")
+        self._n_open = 0
+        self._reason_code: Dict[str, int] = {r: i for i, r in enumerate(EXIT_REASONS)}
+
+    # ---------- 인턴 ----------
+    def intern(self, symbol: str) -> int:
+        i = self._ids.get(symbol)
+        if i is None:
+            i = len(self.symbols)
+            self._ids[symbol] = i
+            self.symbols.append(symbol)
+            for name, code in self._COLS:
+                getattr(self, name).append(0)
+        return i
+
+    def id_of(self, symbol: str) -> Optional[int]:
+        return self._ids.get(symbol)
+
+    def reason_code(self, reason: Optional[str]) -> int:
+        if not reason:
+            return 0
+        c = self._reason_code.get(reason)
+        if c is None:
+            c = len(EXIT_REASONS)
+            if c > 127:
+                return self._reason_code["exit"]
+            EXIT_REASONS.append(reason)
+            self._reason_code[reason] = c
+        return c
+
+    # ---------- 덤프/복원 (체크포인트) ----------
+    def dump(self) -> Tuple[List[str], Dict[str, bytes]]:
+        """(심볼 목록, {컬럼명: 원시 바이트}) — 컬럼 바이트는 array 메모리 그대로"""
+        return list(self.symbols), {name: getattr(self, name).tobytes() for name, _ in self._COLS}
+
+    def restore(self, symbols: Sequence[str], columns: Mapping[str, bytes],
+                reasons: Optional[Sequence[str]] = None) -> None:
+        """
+        덤프로 북 전체 교체 (컬럼 배열 객체는 유지한 채 내용만 교체).
+        reasons: 저장 당시 EXIT_REASONS — 현재 프로세스의 사유 코드로 다시 매핑
+        """
+        n = len(symbols)
+        for name, code in self._COLS:
+            col = getattr(self, name)
+            del col[:]
+            col.frombytes(columns[name])
+            if len(col) != n:
+                raise RuntimeError(f"체크포인트 컬럼 길이 불일치: {name} {len(col)} != {n}")
+        self.symbols = list(symbols)
+        self._ids = {s: i for i, s in enumerate(self.symbols)}
+        if reasons is not None and list(reasons) != EXIT_REASONS[:len(reasons)]:
+            remap = [self.reason_code(r) for r in reasons]
+            ec = self.exit_code
+            for i in range(n):
+                ec[i] = remap[ec[i]] if 0 <= ec[i] < len(remap) else 0
+        self._n_open = sum(1 for q in self.qty if q > 0)
+
+    # ---------- 쓰기 ----------
+    def open(self, symbol: str, qty: int, avg_price: float, entry_ts: float = 0.0) -> int:
+        """신규 진입: 고점/보유틱/청산사유 초기화"""
+        i = self.intern(symbol)
+        if self.qty[i] <= 0 < qty:
+            self._n_open += 1
+        self.qty[i] = int(qty)
+        self.avg_price[i] = float(avg_price)
+        self.last_high[i] = float(avg_price)
+        self.last_price[i] = float(avg_price)
+        self.entry_ts[i] = float(entry_ts)
+        self.hold_ticks[i] = 0
+        self.exit_code[i] = 0
+        return i
+
+    def set(self, symbol: str, qty: int, avg_price: float) -> int:
+        """부분 체결 등 수량/평단만 조정 (qty<=0 이면 close)"""
+        if qty <= 0:
+            return self.close(symbol)
+        i = self.intern(symbol)
+        if self.qty[i] <= 0:
+            return self.open(symbol, qty, avg_price)
+        self.qty[i] = int(qty)
+        self.avg_price[i] = float(avg_price)
+        return i
+
+    def close(self, symbol: str, reason: Optional[str] = None) -> int:
+        i = self.intern(symbol)
+        if self.qty[i] > 0:
+            self._n_open -= 1
+        self.qty[i] = 0
+        self.hold_ticks[i] = 0
+        self.exit_code[i] = self.reason_code(reason)
+        return i
+
+    def mark(self, ids: Sequence[int], prices: Sequence[float]) -> None:
+        """현재가 반영: last_price 갱신 + 고점(last_high) 갱신"""
+        if not len(ids):
+            return
+        if np is not None:
+            idx = np.asarray(ids, dtype=np.intp)
+            px = np.asarray(prices, dtype=np.float64)
+            lp = self.view("last_price")
+            hi = self.view("last_high")
+            lp[idx] = px
+            hi[idx] = np.maximum(hi[idx], px)
+            return
+        lp, hi = self.last_price, self.last_high
+        for i, p in zip(ids, prices):
+            lp[i] = p
+            if p > hi[i]:
+                hi[i] = p
+
+    # ---------- 읽기 ----------
+    def is_open(self, symbol: str) -> bool:
+        i = self._ids.get(symbol)
+        return i is not None and self.qty[i] > 0
+
+    def open_ids(self) -> List[int]:
+        if np is not None:
+            return np.flatnonzero(self.view("qty") > 0).tolist()
+        return [i for i, q in enumerate(self.qty) if q > 0]
+
+    def gather(self, snapshot: Mapping[str, Any],
+               price_of: Callable[[Any], Optional[float]] = float) -> Tuple[List[int], List[float]]:
+        """열린 포지션 중 snapshot에 가격이 있는 (ids, prices)"""
+        ids: List[int] = []
+        pxs: List[float] = []
+        syms = self.symbols
+        for i in self.open_ids():
+            val = snapshot.get(syms[i])
+            if val is None:
+                continue
+            p = price_of(val)
+            if p is None:
+                continue
+            ids.append(i)
+            pxs.append(p)
+        return ids, pxs
+
+    def position(self, symbol: str) -> Optional[Position]:
+        i = self._ids.get(symbol)
+        if i is None:
+            return None
+        code = self.exit_code[i]
+        return Position(symbol, int(self.qty[i]), self.avg_price[i], self.last_high[i],
+                        self.entry_ts[i], EXIT_REASONS[code] if code else None)
+
+    def exit_reason(self, symbol: str) -> Optional[str]:
+        i = self._ids.get(symbol)
+        return EXIT_REASONS[self.exit_code[i]] if i is not None and self.exit_code[i] else None
+
+    # ---------- 벡터 쿼리 ----------
+    def view(self, name: str):
+        """컬럼을 복사 없이 ndarray로 (NumPy 경로 전용)"""
+        col = getattr(self, name)
+        return np.frombuffer(col, dtype=_NP_DTYPE[col.typecode])
+
+    def exposure(self) -> float:
+        """원가(평단) 기준 총 노출"""
+        if np is not None:
+            return float(np.dot(self.view("qty"), self.view("avg_price")))
+        return float(sum(q * a for q, a in zip(self.qty, self.avg_price) if q > 0))
+
+    def mtm(self) -> float:
+        """현재가(last_price) 기준 평가금액"""
+        if np is not None:
+            return float(np.dot(self.view("qty"), self.view("last_price")))
+        return float(sum(q * p for q, p in zip(self.qty, self.last_price) if q > 0))
+
+    def unrealized_pnl(self) -> float:
+        if np is not None:
+            q = self.view("qty")
+            return float(np.dot(q, self.view("last_price") - self.view("avg_price")))
+        return float(sum(q * (p - a) for q, p, a in zip(self.qty, self.last_price, self.avg_price) if q > 0))
+
+    def pnl_pct(self) -> Dict[str, float]:
+        """열린 포지션별 평가손익률 (last_price/avg - 1)"""
+        out: Dict[str, float] = {}
+        for i in self.open_ids():
+            a = self.avg_price[i]
+            out[self.symbols[i]] = (self.last_price[i] / a - 1.0) if a else 0.0
+        return out
+
+    def symbol_value(self, symbol: str) -> float:
+        i = self._ids.get(symbol)
+        if i is None or self.qty[i] <= 0:
+            return 0.0
+        return self.qty[i] * self.avg_price[i]
+
+    def sector_values(self, sector_of: Callable[[str], Optional[str]],
+                      default: Optional[str] = "UNKNOWN") -> Dict[str, float]:
+        """섹터별 원가 노출 (섹터 미상은 default; None 이면 제외)"""
+        by_sector: Dict[str, float] = {}
+        for i in self.open_ids():
+            sector = sector_of(self.symbols[i]) or default
+            if sector is None:
+                continue
+            by_sector[sector] = by_sector.get(sector, 0.0) + self.qty[i] * self.avg_price[i]
+        return by_sector
+
+    # ---------- Mapping (열린 포지션만) ----------
+    def __getitem__(self, symbol: str) -> Dict[str, float]:
+        i = self._ids.get(symbol)
+        if i is None or self.qty[i] <= 0:
+            raise KeyError(symbol)
+        return {"qty": float(self.qty[i]), "avg_price": self.avg_price[i], "last_high": self.last_high[i]}
+
+    def get(self, symbol: str, default: Any = None) -> Any:
+        i = self._ids.get(symbol)
+        if i is None or self.qty[i] <= 0:
+            return default
+        return {"qty": float(self.qty[i]), "avg_price": self.avg_price[i], "last_high": self.last_high[i]}
+
+    def __contains__(self, symbol: object) -> bool:
+        i = self._ids.get(symbol)  # type: ignore[arg-type]
+        return i is not None and self.qty[i] > 0
+
+    def __iter__(self) -> Iterator[str]:
+        syms = self.symbols
+        return iter([syms[i] for i in self.open_ids()])
+
+    def __len__(self) -> int:
+        return self._n_open
+
+    def __repr__(self) -> str:
+        return f"PositionBook(open={self._n_open}, interned={len(self.symbols)})"
+
+
+_NP_DTYPE = {"q": "int64", "d": "float64", "i": "int32", "b": "int8"}
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+hub/binding.py — ScoreEngine/RiskGate 호출 시그니처 1회 바인딩
+
+- Hub 생성 시점에 주입된 scorer/risk 객체를 inspect로 1회 해석
+- 틱마다 TypeError를 제어흐름으로 쓰던 시그니처 탐색을 제거
+- 결과 정규화기(normalizer)는 반환 타입별로 1회 선택 후 캐시
+- 어떤 시그니처도 맞지 않으면 생성 시점에 RuntimeError (조용한 0.0/allow 금지)
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class RiskEvalRes:
+    allow: bool
+    reason: str = ""
+    max_qty_hint: Optional[int] = None
+
+
+# (sym, price, snap, ctx) → 점수
+ScoreFn = Callable[[str, float, Dict[str, Any], Any], float]
+# (symbol, price, portfolio, score, ctx) → RiskEvalRes
+RiskFn = Callable[[str, float, Any, float, Any], RiskEvalRes]
+
+
+# ========== 시그니처 판정 ==========
+def _accepts(fn: Callable, *args: Any, **kwargs: Any) -> bool:
+    """fn(*args, **kwargs) 호출이 시그니처상 가능한지(실제 호출 없이) 판정"""
+    try:
+        sig = inspect.signature(fn)
+    except (TypeError, ValueError):
+        # C 구현 등 시그니처를 알 수 없으면 첫 후보를 그대로 수용
+        return True
+    try:
+        sig.bind(*args, **kwargs)
+        return True
+    except TypeError:
+        return False
+
+
+# ========== Scorer ==========
+# 과거 Hub._safe_score 가 매 틱 시도하던 순서 그대로 (앞선 후보 우선)
+_SCORE_METHODS = ("score", "evaluate")
+_SCORE_FORMS: Tuple[Tuple[str, int, Callable[[Callable], ScoreFn]], ...] = (
+    ("(sym, price, ctx)", 3, lambda f: (lambda sym, price, snap, ctx: f(sym, price, ctx))),
+    ("(sym, price)",      2, lambda f: (lambda sym, price, snap, ctx: f(sym, price))),
+    ("(snap, ctx)",       2, lambda f: (lambda sym, price, snap, ctx: f(snap, ctx))),
+    ("(snap,)",           1, lambda f: (lambda sym, price, snap, ctx: f(snap))),
+    ("(price,)",          1, lambda f: (lambda sym, price, snap, ctx: f(price))),
+    ("(sym,)",            1, lambda f: (lambda sym, price, snap, ctx: f(sym))),
+    ("()",                0, lambda f: (lambda sym, price, snap, ctx: f())),
+)
+
+
+def bind_scorer(scorer: Any) -> Tuple[ScoreFn, str]:
+    """scorer의 호출 형태를 1회 결정하고 (sym, price, snap, ctx) → float 호출자를 반환"""
+    for meth in _SCORE_METHODS:
+        fn = getattr(scorer, meth, None)
+        if not callable(fn):
+            continue
+        for label, arity, make in _SCORE_FORMS:
+            if not _accepts(fn, *([None] * arity)):
+                continue
+            call = make(fn)
+
+            def bound(sym: str, price: float, snap: Dict[str, Any], ctx: Any,
+                      _call: ScoreFn = call) -> float:
+                try:
+                    return float(_call(sym, price, snap, ctx))
+                except Exception:
+                    return 0.0
+
+            return bound, f"{type(scorer).__name__}.{meth}{label}"
+    raise RuntimeError(
+        f"scorer 바인딩 실패: {type(scorer).__name__} 에 호출 가능한 score/evaluate 시그니처가 없습니다."
+    )
+
+
+def bind_batch_scorer(scorer: Any) -> Optional[Callable[[List[Dict[str, Any]]], List[float]]]:
+    """
+    scorer.evaluate_many(snaps) 가 있으면 배치 호출자, 없으면 None.
+    배치 호출이 실패하면 None 을 돌려 Hub 가 심볼별 호출로 폴백.
+    """
+    fn = getattr(scorer, "evaluate_many", None)
+    if not callable(fn) or not _accepts(fn, []):
+        return None
+
+    def batch(snaps: List[Dict[str, Any]]) -> Optional[List[float]]:
+        try:
+            return [float(x) for x in fn(snaps)]
+        except Exception:
+            return None
+
+    return batch
+
+
+def bind_pnl_hook(scorer: Any) -> Optional[Callable[[float, Any], None]]:
+    """
+    scorer.on_realized_pnl 호출자 (pnl, features) → None. 없으면 None.
+    features 인자를 받지 않는 구 시그니처면 pnl 만 전달, 보정기 예외는 체결 처리로 번지지 않게 흡수.
+    """
+    fn = getattr(scorer, "on_realized_pnl", None)
+    if not callable(fn):
+        return None
+    with_features = _accepts(fn, 0.0, None)
+
+    def hook(pnl: float, features: Any) -> None:
+        try:
+            if with_features:
+                fn(pnl, features)
+            else:
+                fn(pnl)
+        except Exception:
+            pass
+
+    return hook
+
+
+# ========== Risk 결과 정규화 ==========
+def _norm_identity(res: Any) -> RiskEvalRes:
+    return res
+
+
+def _norm_attr(res: Any) -> RiskEvalRes:
+    return RiskEvalRes(bool(getattr(res, "allow")),
+                       str(getattr(res, "reason", "")),
+                       getattr(res, "max_qty_hint", None))
+
+
+def _norm_dict(res: Dict[str, Any]) -> RiskEvalRes:
+    return RiskEvalRes(bool(res.get("allow", True)),
+                       str(res.get("reason", "")),
+                       res.get("max_qty_hint"))
+
+
+def _norm_tuple(res: tuple) -> RiskEvalRes:
+    if not res:
+        return RiskEvalRes(True)
+    allow = bool(res[0])
+    reason = str(res[1]) if len(res) > 1 else ""
+    hint = res[2] if len(res) > 2 else None
+    return RiskEvalRes(allow, reason, hint)
+
+
+def _norm_bool(res: Any) -> RiskEvalRes:
+    return RiskEvalRes(bool(res))
+
+
+def _norm_default(res: Any) -> RiskEvalRes:
+    # 과거 구현: 인식 불가 반환형은 허용으로 간주
+    return RiskEvalRes(True)
+
+
+def _pick_normalizer(res: Any) -> Callable[[Any], RiskEvalRes]:
+    if isinstance(res, RiskEvalRes):
+        return _norm_identity
+    if hasattr(res, "allow"):
+        return _norm_attr
+    if isinstance(res, dict):
+        return _norm_dict
+    if isinstance(res, tuple):
+        return _norm_tuple
+    if isinstance(res, bool):
+        return _norm_bool
+    return _norm_default
+
+
+class RiskResultNormalizer:
+    """반환 타입별 정규화 함수를 1회 선택해 캐시 (타입당 isinstance 사다리 1회)"""
+    __slots__ = ("_by_type",)
+
+    def __init__(self) -> None:
+        self._by_type: Dict[type, Callable[[Any], RiskEvalRes]] = {}
+
+    def __call__(self, res: Any) -> RiskEvalRes:
+        t = type(res)
+        fn = self._by_type.get(t)
+        if fn is None:
+            fn = _pick_normalizer(res)
+            self._by_type[t] = fn
+        return fn(res)
+
+
+# ========== RiskGate ==========
+# RiskGate.check(symbol, price, portfolio, ctx) 는 Hub 호환 엔트리이므로 evaluate(context)보다 우선
+_RISK_METHODS = ("evaluate_entry", "check", "evaluate", "check_entry", "gate", "allow")
+_RISK_KWARGS = ("symbol", "price", "portfolio", "score", "ctx")
+_RISK_FORMS: Tuple[Tuple[str, int, Callable[[Callable], RiskFn]], ...] = (
+    ("(symbol, price, portfolio, score, ctx)", 5,
+     lambda f: (lambda sym, px, pf, sc, cx: f(sym, px, pf, sc, cx))),
+    ("(symbol, price, portfolio, ctx)", 4,
+     lambda f: (lambda sym, px, pf, sc, cx: f(sym, px, pf, cx))),
+    ("(portfolio, ctx)", 2,
+     lambda f: (lambda sym, px, pf, sc, cx: f(pf, cx))),
+    ("(symbol, price, ctx)", 3,
+     lambda f: (lambda sym, px, pf, sc, cx: f(sym, px, cx))),
+    ("(symbol, price)", 2,
+     lambda f: (lambda sym, px, pf, sc, cx: f(sym, px))),
+    ("(portfolio,)", 1,
+     lambda f: (lambda sym, px, pf, sc, cx: f(pf))),
+    ("(ctx,)", 1,
+     lambda f: (lambda sym, px, pf, sc, cx: f(cx))),
+    ("()", 0,
+     lambda f: (lambda sym, px, pf, sc, cx: f())),
+)
+
+
+def _resolve_risk_call(risk: Any) -> Tuple[str, RiskFn, str]:
+    # 1) 키워드 호출 우선
+    for meth in _RISK_METHODS:
+        fn = getattr(risk, meth, None)
+        if callable(fn) and _accepts(fn, **{k: None for k in _RISK_KWARGS}):
+            call: RiskFn = (lambda f: (lambda sym, px, pf, sc, cx:
+                                       f(symbol=sym, price=px, portfolio=pf, score=sc, ctx=cx)))(fn)
+            return meth, call, "(symbol=, price=, portfolio=, score=, ctx=)"
+    # 2) 위치인자 폴백
+    for meth in _RISK_METHODS:
+        fn = getattr(risk, meth, None)
+        if not callable(fn):
+            continue
+        for label, arity, make in _RISK_FORMS:
+            if _accepts(fn, *([None] * arity)):
+                return meth, make(fn), label
+    raise RuntimeError(
+        f"risk 바인딩 실패: {type(risk).__name__} 에 호출 가능한 "
+        f"{'/'.join(_RISK_METHODS)} 시그니처가 없습니다."
+    )
+
+
+def bind_risk(risk: Any) -> Tuple[RiskFn, str]:
+    """risk 객체의 호출 형태를 1회 결정하고 정규화까지 포함한 호출자를 반환"""
+    meth, call, label = _resolve_risk_call(risk)
+    normalize = RiskResultNormalizer()
+
+    def bound(symbol: str, price: float, portfolio: Any, score: float, ctx: Any) -> RiskEvalRes:
+        try:
+            res = call(symbol, price, portfolio, score, ctx)
+        except Exception as e:
+            return RiskEvalRes(False, reason=f"{meth}_error:{e}")
+        return normalize(res)
+
+    return bound, f"{type(risk).__name__}.{meth}{label}"
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+hub/checkpoint.py — Hub 상태 체크포인트/복원 (버전 있는 바이너리, 원자적 rename)
+
+저장 대상: tick_idx, PositionBook 전체 컬럼(수량/평단/고점/보유틱/청산사유 …), 쿨다운 휠(틱/초),
+           저장 시점 저널 seq (복원 후 그 이후 체결만 저널에서 재적용)
+
+파일 형식 (리틀엔디언):
+  헤더  : b"HCKP" u16 version u16 flags i64 tick_idx f64 saved_ts i64 journal_seq u32 n_rows
+  블록  : u32 길이 + 바이트 — symbols("\\n" 구분) / exit reasons("\\n" 구분) / cooldowns(JSON)
+  컬럼  : PositionBook._COLS 순서대로 u8 typecode + u32 길이 + array 원시 바이트
+  꼬리  : u32 crc32(앞 전체)
+- 쓰기: tmp 파일 write+fsync → os.replace → 디렉터리 fsync (중간 크래시에도 이전 파일 유지)
+- CheckpointWriter: 틱 스레드는 직렬화(bytes)만, 파일 쓰기/fsync 는 백그라운드 (최신 것만 남김)
+"""
+from __future__ import annotations
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.position_book import PositionBook
+
+__all__ = ["Checkpoint", "encode_checkpoint", "decode_checkpoint", "save_checkpoint",
+           "load_checkpoint", "CheckpointWriter"]
+
+MAGIC = b"HCKP"
+VERSION = 1
+_HDR = struct.Struct("<4sHHqdqI")
+_U32 = struct.Struct("<I")
+_COL = struct.Struct("<BI")
+
+
+@dataclass
+class Checkpoint:
+    tick_idx: int
+    saved_ts: float
+    journal_seq: int
+    symbols: List[str]
+    columns: Dict[str, bytes]
+    reasons: List[str]
+    cooldowns: List[Tuple[str, Any, float]] = field(default_factory=list)  # (wheel, key, until)
+
+
+def _blob(out: bytearray, data: bytes) -> None:
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _key_out(key: Any) -> Any:
+    return list(key) if isinstance(key, tuple) else key
+
+
+def _key_in(key: Any) -> Any:
+    return tuple(key) if isinstance(key, list) else key
+
+
+def encode_checkpoint(ck: Checkpoint) -> bytes:
+    out = bytearray(_HDR.pack(MAGIC, VERSION, 0, ck.tick_idx, ck.saved_ts, ck.journal_seq, len(ck.symbols)))
+    _blob(out, "\n".join(ck.symbols).encode("utf-8"))
+    _blob(out, "\n".join(ck.reasons).encode("utf-8"))
+    _blob(out, json.dumps([[w, _key_out(k), t] for w, k, t in ck.cooldowns]).encode("utf-8"))
+    for name, code in PositionBook._COLS:
+        data = ck.columns[name]
+        out += _COL.pack(ord(code), len(data))
+        out += data
+    out += _U32.pack(zlib.crc32(out))
+    return bytes(out)
+
+
+def decode_checkpoint(data: bytes) -> Checkpoint:
+    if len(data) < _HDR.size + _U32.size or zlib.crc32(data[:-_U32.size]) != _U32.unpack_from(data, len(data) - _U32.size)[0]:
+        raise RuntimeError("체크포인트가 손상되었습니다 (crc 불일치)")
+    magic, ver, _flags, tick_idx, saved_ts, jseq, n = _HDR.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise RuntimeError("Hub 체크포인트 형식이 아닙니다")
+    if ver != VERSION:
+        raise RuntimeError(f"지원하지 않는 체크포인트 버전입니다: {ver}")
+    mv = memoryview(data)
+    off = _HDR.size
+    blobs = []
+    for _ in range(3):
+        ln = _U32.unpack_from(data, off)[0]
+        off += _U32.size
+        blobs.append(bytes(mv[off:off + ln]).decode("utf-8"))
+        off += ln
+    symbols = blobs[0].split("\n") if n else []
+    reasons = blobs[1].split("\n")
+    cools = [(w, _key_in(k), float(t)) for w, k, t in json.loads(blobs[2])]
+    cols: Dict[str, bytes] = {}
+    for name, code in PositionBook._COLS:
+        tc, ln = _COL.unpack_from(data, off)
+        off += _COL.size
+        if chr(tc) != code:
+            raise RuntimeError(f"체크포인트 컬럼 타입 불일치: {name} {chr(tc)} != {code}")
+        cols[name] = mv[off:off + ln]
+        off += ln
+    return Checkpoint(tick_idx, saved_ts, jseq, symbols, cols, reasons, cools)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    try:  # rename 자체를 디스크에 고정 (POSIX). Windows 는 디렉터리 open 불가 → 생략
+        fd = os.open(d, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def save_checkpoint(path: str, ck: Checkpoint) -> int:
+    data = encode_checkpoint(ck)
+    _atomic_write(path, data)
+    return len(data)
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """없으면 None, 손상/버전 불일치는 RuntimeError"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as fh:
+        return decode_checkpoint(fh.read())
+
+
+class CheckpointWriter:
+    """직렬화된 체크포인트를 백그라운드에서 원자적으로 기록 (밀리면 최신 것만 기록)"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._latest: Optional[bytes] = None
+        self._cv = threading.Condition()
+        self._io = threading.Lock()   # 백그라운드 기록과 동기 기록(write)이 같은 .tmp 를 쓰지 않게
+        self._closed = False
+        self.written = 0
+        self.skipped = 0          # 기록 전에 더 새 체크포인트로 대체된 수
+        self.last_write_ms = 0.0
+        self._thread = threading.Thread(target=self._run, name="hub-checkpoint", daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes) -> None:
+        with self._cv:
+            if self._latest is not None:
+                self.skipped += 1
+            self._latest = data
+            self._cv.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while self._latest is None and not self._closed:
+                    self._cv.wait()
+                data, self._latest = self._latest, None
+                if data is None:
+                    return
+            self._write(data)
+
+    def _write(self, data: bytes) -> None:
+        with self._io:
+            t0 = time.perf_counter()
+            _atomic_write(self.path, data)
+            self.last_write_ms = (time.perf_counter() - t0) * 1e3
+            self.written += 1
+
+    def write(self, data: bytes) -> int:
+        """동기 기록 (세션 종료용). 대기 중인 체크포인트는 더 새 것으로 대체됨. 반환: 바이트 수"""
+        with self._cv:
+            if self._latest is not None:
+                self._latest = None
+                self.skipped += 1
+        self._write(data)
+        return len(data)
+
+    def close(self) -> None:
+        """남은 체크포인트 기록 후 종료"""
+        with self._cv:
+            self._closed = True
+            self._cv.notify()
+        self._thread.join(5.0)
@@ -2,17 +2,47 @@
 """
 Hub / HubTrade — ExitRules → RiskGate → OrderRouter 통합 루프
 - 보유 포지션은 ExitRules 우선평가로 즉시 청산
-- 같은 틱에서 막 청산한 심볼은 재진입 쿨다운
+- 같은 틱에서 막 청산한 심볼은 재진입 쿨다운 (공유 타이밍 휠, 키=(symbol, "reentry"))
 - exit_reason 로깅
+- 심볼별 입력 지문(가격+거래량/체결흐름) + RiskContext version 이 바뀐 심볼만 재평가 (dirty-set)
+  (캐시는 임계값 미달 판단만 — 리스크가 거부한 후보는 다음 틱에 다시 평가)
+- 포지션 상태는 컬럼형 PositionBook 하나에 저장 (Hub/ExitRules/RiskContext/ExposurePolicy 공유)
+- scorer 가 evaluate_many 를 지원하면 재평가 대상 심볼을 모아 틱당 한 번에 배치 평가
+- scorer 가 begin_tick/lookup 을 지원하면 틱마다 피처 메모를 열고, 진입 시점 FeatureVector 를
+  BUY 로그와 청산 실현손익(on_realized_pnl → Calibrator 기여도)에 그대로 사용
+- 신규 진입은 점수 상위 K개(heap)를 골라 남은 노출 한도를 한 번의 배치 리스크 점검으로 greedy 배분
+- config["latency_stats"]=True 면 단계별(context/exit/score/risk/route/tick) 지연 히스토그램 기록
+- HubTrade.run_session(conflate=True): 피드 스레드 → 심볼별 최신값 병합 버퍼 → Hub (backpressure)
+- 주문은 OrderPipeline 에 의도(intent)로 넘기고 즉시 반환, 체결은 FillEvent 로 돌아와 포지션에 반영
+  (config["async_orders"]=True 면 디스패처 스레드가 브로커 레이트리밋을 틱 루프 밖에서 소화)
+- 비동기 모드에서는 한 틱의 주문 의도를 한 묶음으로 디스패처에 넘김 (config["coalesce_orders"])
+  Hub 는 심볼당 미체결 의도를 1건으로 제한(in-flight 게이트)하므로 이 경로에서는 병합/상계가 일어나지 않음
+  — 상계는 OrderPipeline 을 직접 쓰는 호출자(같은 심볼 의도를 여러 건 제출)에만 해당
+- config["journal_path"]: 주문/체결 WAL 저널 기록, 시작 시 저널의 체결로 포지션 복구
+- config["checkpoint_path"]: checkpoint_every 틱마다 북/쿨다운/tick_idx 스냅샷 (백그라운드 원자적 기록)
+  재시작 시 체크포인트 로드 → 저장 시점 이후의 저널 체결만 재적용 (저널 전체 재생 없음)
+- Hub.clock: 진입시각/체결 기록 시각의 시계 (리플레이는 테이프 시각으로 교체, hub/replay.py)
+- config["record_decisions"]=True 면 체결을 Hub.decisions 에 기록 (write_session_report 입력)
+- config["tick_record_dir"]: 입력 틱을 일자/심볼별 바이너리 컬럼으로 기록 (market/tickstore.py)
+- config["indicators"]: 스코어 전에 심볼별 증분 지표(fast/slow·VWAP·RSI·ATR·고저)를 snapshot 에 덧붙임
+  (market/indicators.py, True 또는 IndicatorConfig 필드 dict). 시작 시 indicator_warmup_dir
+  (기본 tick_record_dir) 의 마지막 기록 일자로 warm-up
+- config["volume_baseline"]: 심볼별 시간대 거래량 곡선 + 장중 EWMA 로 avg_vol 을 직접 산출
+  (market/volume_baseline.py). volume_baseline_path 가 있으면 시작 시 로드, close 때 저장 (일자 간 유지)
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Tuple
+from collections import ChainMap
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+import heapq
+import threading
 import time
 
+from common.cooldown import CooldownService
+from common.position_book import EXIT_REASONS, Position, PositionBook
 from scoring.core import ScoreEngine
 from scoring.rules.exit_rules import ExitRules
 from risk.core import RiskGate
+from risk.context import RiskContext, PolicyContext
 from risk.policies.exposure import ExposurePolicy
 try:
     from risk.policies.day_dd import make_daydd
@@ -20,30 +50,72 @@ except ImportError:
     from risk.core import make_daydd
 
 from order.router import OrderRouter
+from order.pipeline import FillEvent, OrderIntent, OrderPipeline
+from order.journal import OrderJournal, recover
+from hub.checkpoint import Checkpoint, CheckpointWriter, encode_checkpoint, load_checkpoint, save_checkpoint
 from obs.log import get_logger
+from obs.latency import StageLatency, perf_counter_ns
+from bus.conflate import ConflatingBuffer
+from market.indicators import IndicatorConfig, IndicatorEngine
+from market.tickstore import TickRecorder, TickStore
+from market.volume_baseline import VolumeBaseline, VolumeBaselineConfig
+from hub.binding import RiskEvalRes, bind_batch_scorer, bind_pnl_hook, bind_scorer, bind_risk
 
 logger = get_logger(__name__)
 
 
-# ========== 데이터 모델 ==========
-@dataclass
-class Position:
-    symbol: str
-    qty: int
-    avg_price: float
-    last_high: float = 0.0
-    entry_ts: float = 0.0
-    exit_reason: Optional[str] = None
+# ========== 유틸 ==========
+# 틱 입력 지문에 쓰는 필드 (가격 + 거래량/체결흐름/이평)
+_FP_FIELDS = ("price", "volume", "curr_vol", "avg_vol", "volume_avg", "buy_vol", "sell_vol", "fast", "slow")
 
 
-@dataclass
-class RiskEvalRes:
-    allow: bool
-    reason: str = ""
-    max_qty_hint: Optional[int] = None
+def _tick_price(val: Any) -> Optional[float]:
+    """snapshot 값(가격 float 또는 dict/obj 틱)에서 가격 추출"""
+    if isinstance(val, (int, float)):
+        return float(val)
+    p = val.get("price") if isinstance(val, dict) else getattr(val, "price", None)
+    return float(p) if p is not None else None
+
+
+def _tick_fingerprint(val: Any) -> Any:
+    """스코어/리스크 입력이 바뀌었는지 판정하는 지문 (가격만 오면 가격 그 자체)"""
+    if isinstance(val, (int, float)):
+        return val
+    if isinstance(val, dict):
+        return tuple(map(val.get, _FP_FIELDS)) + (len(val.get("prints") or ()),)
+    return tuple(getattr(val, k, None) for k in _FP_FIELDS)
+
+
+def _tick_snapshot(sym: str, price: float, val: Any) -> Dict[str, Any]:
+    """scorer 입력 스냅샷 {symbol, price, ...필드}"""
+    if isinstance(val, dict):
+        if val.get("symbol") == sym:
+            return val
+        snap = dict(val)
+        snap["symbol"] = sym
+        snap.setdefault("price", price)
+        return snap
+    if isinstance(val, (int, float)):
+        return {"symbol": sym, "price": price}
+    snap = {k: getattr(val, k) for k in _FP_FIELDS if getattr(val, k, None) is not None}
+    snap["symbol"] = sym
+    snap["price"] = price
+    return snap
+
+
+def _optional_method(obj: Any, name: str) -> Optional[Callable[..., Any]]:
+    fn = getattr(obj, name, None)
+    return fn if callable(fn) else None
+
+
+def _as_snapshot(item: Any) -> Dict[str, Any]:
+    """피드 항목 → snapshot. {sym: val} 은 그대로, Tick 류 객체(.symbol)는 {symbol: tick}"""
+    if isinstance(item, dict):
+        return item
+    sym = getattr(item, "symbol", None)
+    return {sym: item} if sym is not None else {}
 
 
-# ========== 유틸 ==========
 def _make_default_scorer() -> ScoreEngine:
     """ScoreEngine.default() 유무/시그니처 차이를 흡수하는 방어 생성"""
     if hasattr(ScoreEngine, "default"):
@@ -118,200 +190,158 @@ class Hub:
         self.exit_rules = exit_rules
         self.min_reentry_cooldown_ticks = min_reentry_cooldown_ticks
 
-        self.positions: Dict[str, Position] = {}
-        self.recent_exit_tick: Dict[str, int] = {}  # 재진입 쿨다운 기록
+        # ---- scorer/risk 호출 시그니처 1회 바인딩 (실패 시 즉시 예외)
+        self._score_fn, score_sig = bind_scorer(scorer)
+        # 배치 평가(evaluate_many) 지원 시 dirty 심볼을 모아 틱당 1회 호출
+        self._score_batch = bind_batch_scorer(scorer) if (config or {}).get("batch_score", True) else None
+        # 피처 메모(begin_tick/lookup) + 실현손익 훅 — 지원하지 않는 scorer 면 None
+        self._begin_tick = _optional_method(scorer, "begin_tick")
+        self._lookup = _optional_method(scorer, "lookup")
+        self._on_pnl = bind_pnl_hook(scorer)
+        self._entry_features: Dict[str, Any] = {}   # 보유 심볼 → 진입 시점 FeatureVector
+        self._risk_fn, risk_sig = bind_risk(risk)
+        # 배치 점검(check_batch) 지원 시 순위 배분을 한 번에, 없으면 후보별 _risk_eval
+        self._risk_batch = getattr(risk, "check_batch", None)
+        if not callable(self._risk_batch):
+            self._risk_batch = None
+        logger.info(f"[Hub] bound scorer={score_sig} risk={risk_sig}")
+        # 점수가 호출자 ctx 에 의존하면 입력 지문만으로 직전 판단을 재사용할 수 없음 → dirty-set 끔
+        self._score_uses_ctx = score_sig.endswith("ctx)")
+
+        # ---- 포지션 북: 심볼 id 인턴 + 컬럼 배열 (ExitRules는 북 컬럼을 직접 읽고 씀)
+        self.book = PositionBook()
+        if hasattr(exit_rules, "bind_book"):
+            exit_rules.bind_book(self.book)
+        # ---- 쿨다운: 틱/초 타이밍 휠 하나를 ExitRules·정책(ctx["cooldowns"])과 공유
+        self.cooldowns = CooldownService()
+        if hasattr(exit_rules, "bind_cooldowns"):
+            exit_rules.bind_cooldowns(self.cooldowns)
         self.tick_idx: int = 0
+        self.clock: Callable[[], float] = time.time
 
-        # ---- Risk ctx 기본 슬롯
+        # ---- 주문 파이프라인: _buy/_sell 은 의도만 제출, 체결 이벤트는 _apply_fills 에서 반영
         self.config: Dict[str, Any] = config or {}
+        async_orders = bool(self.config.get("async_orders", False))
+        jpath = self.config.get("journal_path")
+        ckpath = self.config.get("checkpoint_path")
+        ckpt = load_checkpoint(ckpath) if ckpath else None
+        self.journal: Optional[OrderJournal] = OrderJournal(
+            jpath, flush_interval_ms=float(self.config.get("journal_flush_ms", 5.0)),
+            flush_records=int(self.config.get("journal_flush_records", 64)),
+        ) if jpath else None
+        self.orders = OrderPipeline(
+            router, threaded=async_orders, logger=logger,
+            coalesce=bool(self.config.get("coalesce_orders", async_orders)),
+            coalesce_window=float(self.config.get("coalesce_window_s", 0.0)),
+            workers=int(self.config.get("order_workers", 1)),
+            journal=self.journal,
+        )
+        self._inflight: Dict[str, OrderIntent] = {}  # 심볼별 미체결 의도 (중복 주문 방지)
+        self._inflight_value: float = 0.0            # 미체결 BUY 명목가 (배분 시 남은 한도에서 차감)
+        # 체결 결정 기록 {"ts","symbol","action","qty","price","reason"} (비활성 시 None)
+        self.decisions: Optional[List[Dict[str, Any]]] = [] if self.config.get("record_decisions") else None
+        tick_dir = self.config.get("tick_record_dir")
+        self.recorder: Optional[TickRecorder] = TickRecorder(tick_dir) if tick_dir else None
+        self.indicators: Optional[IndicatorEngine] = self._make_indicators(
+            self.config.get("indicators"), self.config.get("indicator_warmup_dir", tick_dir))
+        self.volume_baseline_path: Optional[str] = self.config.get("volume_baseline_path")
+        self.volume_baseline: Optional[VolumeBaseline] = self._make_volume_baseline(
+            self.config.get("volume_baseline"), self.volume_baseline_path)
+        # 시뮬레이션 브로커(LOB 매칭 엔진)면 Hub 와 같은 틱을 먼저 공급 → 체결가가 테이프를 따름
+        feed = getattr(router, "market_feed", None)
+        self._market_feed = feed if callable(feed) else None
+
+        # ---- dirty-set: 심볼별 마지막 평가 시점의 (입력 지문, RiskContext version)
+        self._last_eval: Dict[str, Tuple[Any, int]] = {}
+        self.stats: Dict[str, int] = {"symbols_evaluated": 0, "symbols_skipped": 0,
+                                      "last_evaluated": 0, "last_skipped": 0}
+
+        # ---- Risk ctx 기본 슬롯
+        self.top_k: int = max(1, int(self.config.get("entry_top_k", 10)))  # 틱당 신규 진입 후보 수
+        # 단계별 지연 히스토그램 (비활성 시 단계마다 분기 1회만)
+        self.latency = StageLatency(enabled=bool(self.config.get("latency_stats", False)))
         self.sector_map: Dict[str, str] = {}  # 섹터 정책에서 사용할 맵
         self.sector_of = lambda s: self.sector_map.get(s)  # ✅ 섹터 판별 함수
         # equity/sector 노출 계산 스텁
         self._equity_now = lambda: float(self.config.get("budget") or 0.0)  # 예산을 기본 equity로
-        self._sector_exposure = lambda: {}
-
-    # --- helper: PnL 기반 상태 업데이트 (trailing 고점 갱신 등)
-    def _update_pos_state(self, pos: Position, last_price: float) -> None:
-        if last_price > pos.last_high:
-            pos.last_high = last_price
-
-    # --- safe scorer wrapper: 다양한 시그니처를 흡수
-    def _safe_score(self, sym: str, price: float, ctx: Dict[str, Any]) -> float:
-        s = self.scorer
-        snap = {sym: price}
-        for args in (
-            (sym, price, ctx),
-            (sym, price),
-            (snap, ctx),
-            (snap,),
-            (price,),
-            (sym,),
-            tuple(),
-        ):
-            try:
-                val = s.score(*args)  # type: ignore[misc]
-                return float(val)
-            except TypeError:
-                continue
-            except Exception:
-                return 0.0
-        return 0.0
-
-    # --- safe risk wrapper: 다양한 RiskGate 시그니처/반환형 흡수 (portfolio/ctx 우선)
-    def _risk_eval(self, symbol: str, price: float, score: float, ctx: Dict[str, Any]) -> RiskEvalRes:
-        r = self.risk
-
-        # 1) 현재 포지션 → 간단한 portfolio dict
-        portfolio: Dict[str, Dict[str, float]] = {
-            s: {"qty": float(p.qty), "avg_price": float(p.avg_price)}
-            for s, p in self.positions.items()
-        }
 
-        # 2) ctx 보강 (먼저 완성)
-        safe_ctx: Dict[str, Any] = {}
-        if isinstance(ctx, dict):
-            safe_ctx.update(ctx)
-
-        budget_val = float(self.config.get("budget") or 0.0)
-        equity_val = float(self._equity_now() or budget_val)
-
-        account_block = {"equity": equity_val}
-        exposure_block = {
-            "budget": budget_val,
-            "equity": equity_val,
-            "equity_now": equity_val,
-            "cash": budget_val,               # alias
-            "account": account_block,         # ExposurePolicy 호환
-            "portfolio": portfolio,
-            "positions": portfolio,           # alias
-            "sector_map": self.sector_map,
-            "sector_exposure": self._sector_exposure() or {},
-        }
-
-        safe_ctx.update({
-            "tick_idx": self.tick_idx,
-            "symbol": symbol,
-            "price": price,
-            "score": score,
-
-            # top-level aliases
-            "budget": budget_val,
-            "equity": equity_val,
-            "equity_now": equity_val,
-            "cash": budget_val,
-            "account": account_block,
-            "portfolio": portfolio,
-            "positions": portfolio,
-            "sector_map": self.sector_map,
-            "sector_exposure": exposure_block["sector_exposure"],
-            "sector_of": self.sector_of,      # ✅ 섹터 판별 함수 전달
-
-            # nested blocks
-            "exposure": exposure_block,
-            "exposure_ctx": exposure_block,
-            "risk_ctx": exposure_block,
-        })
-
-        # 2.5) RiskGate/Policy 인스턴스 속성에도 컨텍스트 강제 주입
-        try:
-            for attr in ("ctx", "_ctx", "exposure_ctx", "risk_ctx", "last_ctx", "_last_ctx"):
-                setattr(self.risk, attr, safe_ctx)
-            policies = getattr(self.risk, "policies", None)
-            if isinstance(policies, (list, tuple)):
-                for p in policies:
-                    for attr in ("ctx", "_ctx", "exposure_ctx", "risk_ctx", "last_ctx", "_last_ctx"):
-                        try:
-                            setattr(p, attr, safe_ctx)
-                        except Exception:
-                            pass
-                    if hasattr(p, "set_ctx") and callable(getattr(p, "set_ctx")):
-                        try:
-                            p.set_ctx(safe_ctx)
-                        except Exception:
-                            pass
-            if hasattr(self.risk, "set_ctx") and callable(getattr(self.risk, "set_ctx")):
-                try:
-                    self.risk.set_ctx(safe_ctx)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        # 3) 다양한 구현을 지원하는 호출 시도: kwargs 우선 → 위치인자 폴백
-        for meth in ("evaluate_entry", "evaluate", "check_entry", "gate", "allow"):
-            fn = getattr(r, meth, None)
-            if not callable(fn):
-                continue
-            try:
-                res = fn(symbol=symbol, price=price, portfolio=portfolio, score=score, ctx=safe_ctx)
-                # normalize
-                if isinstance(res, RiskEvalRes):
-                    return res
-                if hasattr(res, "allow"):
-                    return RiskEvalRes(bool(getattr(res, "allow")),
-                                       str(getattr(res, "reason", "")),
-                                       getattr(res, "max_qty_hint", None))
-                if isinstance(res, dict):
-                    return RiskEvalRes(bool(res.get("allow", True)),
-                                       str(res.get("reason", "")),
-                                       res.get("max_qty_hint"))
-                if isinstance(res, tuple) and res:
-                    allow = bool(res[0])
-                    reason = str(res[1]) if len(res) > 1 else ""
-                    hint = res[2] if len(res) > 2 else None
-                    return RiskEvalRes(allow, reason, hint)
-                if isinstance(res, bool):
-                    return RiskEvalRes(res)
-            except TypeError:
-                pass
-            except Exception as e:
-                return RiskEvalRes(False, reason=f"{meth}_error:{e}")
-
-        arg_sets = (
-            (symbol, price, portfolio, score, safe_ctx),
-            (symbol, price, portfolio, safe_ctx),
-            (portfolio, safe_ctx),
-            (symbol, price, safe_ctx),
-            (symbol, price),
-            (portfolio,),
-            (safe_ctx,),
-            tuple(),
+        # ---- 영속 리스크 컨텍스트: 체결/평가금 변경 시에만 갱신, RiskGate/정책은 참조로 읽음
+        self.risk_ctx = RiskContext(
+            budget=float(self.config.get("budget") or 0.0),
+            sector_map=self.sector_map,
+            sector_of=self.sector_of,
+            book=self.book,
+            cooldowns=self.cooldowns,
         )
-        for meth in ("evaluate_entry", "evaluate", "check_entry", "gate", "allow"):
-            fn = getattr(r, meth, None)
-            if not callable(fn):
-                continue
-            for args in arg_sets:
-                try:
-                    res = fn(*args)  # type: ignore[misc]
-                except TypeError:
-                    continue
-                except Exception as e:
-                    return RiskEvalRes(False, reason=f"{meth}_error:{e}")
-
-                if isinstance(res, RiskEvalRes):
-                    return res
-                if hasattr(res, "allow"):
-                    return RiskEvalRes(
-                        bool(getattr(res, "allow")),
-                        str(getattr(res, "reason", "")),
-                        getattr(res, "max_qty_hint", None),
-                    )
-                if isinstance(res, dict):
-                    return RiskEvalRes(
-                        bool(res.get("allow", True)),
-                        str(res.get("reason", "")),
-                        res.get("max_qty_hint"),
-                    )
-                if isinstance(res, tuple) and res:
-                    allow = bool(res[0])
-                    reason = str(res[1]) if len(res) > 1 else ""
-                    hint = res[2] if len(res) > 2 else None
-                    return RiskEvalRes(allow, reason, hint)
-                if isinstance(res, bool):
-                    return RiskEvalRes(res)
-
-        return RiskEvalRes(True)
+        if ckpt is not None:
+            self.restore_state(ckpt)
+            logger.info(f"[CHECKPOINT] {ckpath} restored tick={ckpt.tick_idx} positions={len(self.book)} "
+                        f"cooldowns={len(ckpt.cooldowns)} journal_seq={ckpt.journal_seq}")
+        if jpath:
+            # 체크포인트가 있으면 그 포지션을 기준으로 저장 이후 레코드만 재적용
+            base = {p.symbol: (p.qty, p.avg_price, p.entry_ts) for p in map(self.book.position, self.book)}
+            recovered = recover(jpath, after_seq=ckpt.journal_seq if ckpt else 0, base=base)
+            self._replay_journal(recovered)
+            logger.info(f"[JOURNAL] {jpath} records={recovered.records} positions={len(recovered.positions)} "
+                        f"open_intents={len(recovered.open_intents)}")
+
+        # ---- 주기 체크포인트: 틱 스레드는 직렬화만, 파일 기록은 CheckpointWriter 스레드
+        self.checkpoint_path: Optional[str] = ckpath
+        self.checkpoint_every = max(1, int(self.config.get("checkpoint_every", 100)))
+        self._ckpt_due = False
+        self._ckpt_writer: Optional[CheckpointWriter] = CheckpointWriter(ckpath) if ckpath else None
+
+    def _make_indicators(self, spec: Any, warmup_dir: Optional[str]) -> Optional[IndicatorEngine]:
+        if not spec:
+            return None
+        ind = IndicatorEngine(IndicatorConfig(**spec) if isinstance(spec, dict) else None)
+        store = TickStore(warmup_dir) if warmup_dir else None
+        days = store.days() if store is not None else []
+        if days:
+            n = ind.warmup_store(store, days[-1])
+            if days[-1] != time.strftime("%Y%m%d", time.localtime(self.clock())):
+                ind.reset_session()  # 지난 일자 이력이면 VWAP 누적은 버림
+            logger.info(f"[INDICATORS] warm-up {warmup_dir}/{days[-1]} symbols={n}")
+        if store is not None:
+            store.close()
+        return ind
+
+    def _make_volume_baseline(self, spec: Any, path: Optional[str]) -> Optional[VolumeBaseline]:
+        if not spec:
+            return None
+        vb = VolumeBaseline.load(path) if path else None
+        if vb is not None:
+            logger.info(f"[VOLUME] baseline {path} day={vb.day} symbols={len(vb)}")
+            return vb
+        return VolumeBaseline(VolumeBaselineConfig(**spec) if isinstance(spec, dict) else None)
+
+    @property
+    def positions(self) -> PositionBook:
+        """열린 포지션 Mapping (기존 self.positions 호환; 실체는 PositionBook)"""
+        return self.book
+
+    def set_sector_map(self, sector_map: Dict[str, str]) -> None:
+        """섹터맵 교체 → RiskContext 섹터 노출 재집계(version 증가)"""
+        self.risk_ctx.set_sector_map(sector_map)
+
+    # --- scorer wrapper: Hub 생성 시 1회 바인딩된 호출자 사용
+    def _safe_score(self, sym: str, price: float, ctx: Mapping[str, Any],
+                    snap: Optional[Dict[str, Any]] = None) -> float:
+        if snap is None:
+            snap = {"symbol": sym, "price": price}
+        return self._score_fn(sym, price, snap, ctx)
+
+    # --- risk wrapper: 영속 RiskContext 위에 심볼별 필드만 얹은 읽기 전용 컨텍스트를 명시 전달
+    def _risk_eval(self, symbol: str, price: float, score: float, ctx: Mapping[str, Any],
+                   planned_qty: Optional[int] = None) -> RiskEvalRes:
+        # ctx: on_tick이 만든 틱 컨텍스트(RiskContext 우선 + 호출자 ctx) — 복사 없이 한 겹만 얹음
+        fields: Dict[str, Any] = {"tick_idx": self.tick_idx, "symbol": symbol, "price": price, "score": score}
+        if planned_qty is not None:
+            fields["planned_qty"] = planned_qty
+        pctx = PolicyContext(ctx if ctx is not None else self.risk_ctx, **fields)
+
+        # Hub 생성 시 결정된 단일 호출 경로 (portfolio는 RiskContext 참조 그대로)
+        return self._risk_fn(symbol, price, self.risk_ctx.portfolio, score, pctx)
 
     def _get_buy_threshold(self) -> float:
         """ScoreEngine의 buy_threshold가 없으면 0.55를 기본 사용"""
@@ -320,121 +350,326 @@ class Hub:
         except Exception:
             return 0.55
 
-    # --- buy/sell wrappers
+    # --- buy/sell wrappers: 의도 제출 후 즉시 반환 (동기 모드면 체결 이벤트가 바로 반영됨)
     def _buy(self, symbol: str, price: float, qty: int, reason: str) -> None:
-        ok, fill_qty, fill_price = self.router.buy(symbol, qty, price, reason)
-        if ok and fill_qty > 0:
-            self.positions[symbol] = Position(
-                symbol=symbol,
-                qty=fill_qty,
-                avg_price=fill_price,
-                last_high=fill_price,
-                entry_ts=time.time(),
-            )
-            logger.info(f"[BUY] {symbol} x{fill_qty} @ {fill_price:.3f} reason={reason}")
-
-    def _sell(self, symbol: str, price: float, qty: int, reason: str) -> None:
-        ok, fill_qty, fill_price = self.router.sell(symbol, qty, price, reason)
-        if ok and fill_qty > 0:
-            logger.info(f"[SELL] {symbol} x{fill_qty} @ {fill_price:.3f} reason={reason}")
+        intent = OrderIntent(symbol, "BUY", qty, price, reason)
+        if self._lookup is not None:
+            intent.meta["features"] = self._lookup(symbol)
+        self._inflight[symbol] = intent
+        self._inflight_value += qty * price
+        self.orders.submit(intent)
+        self._apply_fills()
+
+    def _sell(self, symbol: str, price: float, qty: int, reason: str,
+              prev: Optional[Position] = None) -> None:
+        """prev: 청산 직전 포지션 — SELL 실패/부분체결 시 잔량 복원에 사용"""
+        intent = OrderIntent(symbol, "SELL", qty, price, reason, meta={"prev": prev})
+        self._inflight[symbol] = intent
+        self.orders.submit(intent)
+        self._apply_fills()
+
+    def _apply_fills(self) -> int:
+        """도착한 FillEvent 를 포지션/RiskContext 에 반영. 반환: 처리한 이벤트 수"""
+        fills = self.orders.poll_fills()
+        for ev in fills:
+            self._on_fill(ev)
+        return len(fills)
+
+    def _on_fill(self, ev: FillEvent) -> None:
+        it = ev.intent
+        sym = it.symbol
+        if self._inflight.get(sym) is it:
+            del self._inflight[sym]
+        if it.side == "BUY":
+            self._inflight_value = max(0.0, self._inflight_value - it.qty * float(it.price or 0.0))
+            if ev.ok:
+                self.risk_ctx.set_position(sym, ev.qty, ev.price, entry_ts=self.clock())
+                self._record(ev)
+                logger.info(f"[BUY] {sym} x{ev.qty} @ {ev.price:.3f} reason={it.reason}")
+                fv = it.meta.get("features")
+                if fv is not None:
+                    self._entry_features[sym] = fv
+                    logger.debug(f"[BUY-FEAT] {sym} {fv.as_dict()}")
+            else:
+                logger.debug(f"[BUY-FAIL] {sym} reason={it.reason} msg={ev.message}")
+            return
+        # SELL: 청산 시 북은 이미 닫혔음 → 실패/부분체결이면 남은 수량을 원래 평단으로 복원
+        prev = it.meta.get("prev")
+        if ev.ok:
+            self._record(ev)
+            logger.info(f"[SELL] {sym} x{ev.qty} @ {ev.price:.3f} reason={it.reason}")
+            if self._on_pnl is not None and prev is not None and prev.avg_price > 0 and ev.qty > 0:
+                # 실현 수익률(0.01 = 1%) + 진입 시점 피처 → scorer 보정기
+                self._on_pnl(ev.price / prev.avg_price - 1.0, self._entry_features.get(sym))
+        left = it.qty - (ev.qty if ev.ok else 0)
+        if left <= 0:
+            self._entry_features.pop(sym, None)
+        if left > 0 and prev is not None and sym not in self.book:
+            self.risk_ctx.set_position(sym, left, prev.avg_price, entry_ts=prev.entry_ts)
+            logger.warning(f"[SELL-FAIL] {sym} 잔량 {left} 복원 reason={it.reason} msg={ev.message}")
+
+    def _record(self, ev: FillEvent) -> None:
+        if self.decisions is not None and ev.qty > 0:
+            it = ev.intent
+            self.decisions.append({"ts": self.clock(), "symbol": it.symbol, "action": it.side,
+                                   "qty": ev.qty, "price": ev.price, "reason": it.reason})
+
+    def close(self) -> None:
+        """주문 파이프라인 종료 + 저널 커밋/닫기 + 체크포인트 기록 스레드 종료 + 거래량 기준선 저장 + 틱 기록 flush"""
+        self.drain_orders()
+        self.orders.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self._ckpt_writer is not None:
+            self._ckpt_writer.close()
+        if self.volume_baseline is not None and self.volume_baseline_path:
+            self.volume_baseline.save(self.volume_baseline_path)
+        if self.recorder is not None:
+            self.recorder.close()
+
+    # ---------- 체크포인트 ----------
+    def checkpoint_state(self) -> Checkpoint:
+        """현재 북/쿨다운/tick_idx 스냅샷 (미체결 주문이 없을 때 호출해야 저널 seq 와 일치)"""
+        symbols, cols = self.book.dump()
+        cd = self.cooldowns
+        cools = [("ticks", k, t) for k, t in cd.ticks.items()] + [("clock", k, t) for k, t in cd.clock.items()]
+        return Checkpoint(self.tick_idx, self.clock(), self.journal.seq if self.journal is not None else 0,
+                          symbols, cols, list(EXIT_REASONS), cools)
+
+    def save_checkpoint(self, path: Optional[str] = None) -> int:
+        """동기 체크포인트 (세션 종료용). 반환: 기록 바이트 수"""
+        path = path or self.checkpoint_path
+        if not path:
+            return 0
+        self.drain_orders()
+        if self.journal is not None:
+            self.journal.sync()
+        w = self._ckpt_writer
+        if w is not None and path == w.path:
+            return w.write(encode_checkpoint(self.checkpoint_state()))
+        return save_checkpoint(path, self.checkpoint_state())
+
+    def restore_state(self, ck: Checkpoint) -> None:
+        """체크포인트 → 북/쿨다운/tick_idx 교체 후 리스크 컨텍스트 노출 재집계(version 증가)"""
+        self.book.restore(ck.symbols, ck.columns, ck.reasons)
+        self.tick_idx = ck.tick_idx
+        cd = self.cooldowns
+        cd.ticks.clear()
+        cd.clock.clear()
+        cd.ticks.advance(self.tick_idx)
+        now = self.clock()   # 만료시각은 Hub 시계 기준 (리플레이 시뮬레이션 시계 포함)
+        for wheel, key, until in ck.cooldowns:
+            if wheel == "ticks":
+                cd.ticks.arm(key, until, now=self.tick_idx)
+            else:
+                cd.clock.arm(key, until, now=now)
+        self._last_eval.clear()
+        self.risk_ctx.set_sector_map(dict(self.sector_map))
+
+    def _replay_journal(self, rec) -> None:
+        """저널 복구 결과를 북에 맞춤 (체크포인트 이후 체결만 반영된 포지션과 비교)"""
+        book = self.book
+        for sym in [s for s in book.keys() if s not in rec.positions]:
+            self.risk_ctx.set_position(sym, 0, 0.0, reason="exit")
+        for sym, (qty, avg, ts) in rec.positions.items():
+            p = book.get(sym)
+            if p is None:
+                self.risk_ctx.set_position(sym, qty, avg, entry_ts=ts)
+            elif p["qty"] != qty or abs(p["avg_price"] - avg) > 1e-9:
+                self.risk_ctx.set_position(sym, qty, avg)
+
+    def _maybe_checkpoint(self) -> None:
+        # 미체결 주문이 남아 있으면 북과 저널 seq 가 어긋나므로 다음 틱으로 미룸
+        if self._inflight:
+            self._ckpt_due = True
+            return
+        self._ckpt_due = False
+        self._ckpt_writer.submit(encode_checkpoint(self.checkpoint_state()))
+
+    def drain_orders(self, timeout: float = 5.0) -> bool:
+        """제출된 주문이 모두 처리될 때까지 대기 후 체결 반영 (세션 종료/리플레이용)"""
+        done = self.orders.flush(timeout)
+        self._apply_fills()
+        return done
+
+    # --- 순위 배분: 점수 내림차순 후보에 남은 노출 한도를 greedy 배정
+    def _allocate(self, ranked: List[Tuple[float, int, str, float]], ctx: Mapping[str, Any],
+                  budget_val: float, lat: Optional[StageLatency] = None) -> int:
+        """반환: 주문 라우팅에 쓴 시간[ns] (lat 비활성 시 0) — risk 단계는 여기서 기록"""
+        # 임시 계획 수량(계좌 5% 기준) → 정책이 planned_qty를 고려해 하드블록 판단
+        planned = [(sym, price, max(1, int((budget_val * 0.05) / max(1e-9, price))), score)
+                   for score, _, sym, price in ranked]
+        risk_ns = route_ns = 0
+
+        if self._risk_batch is None:
+            # 배치 미지원 risk: 순위대로 1건씩 평가/주문 (앞 체결이 RiskContext에 반영된 뒤 다음 평가)
+            for sym, price, planned_qty, score in planned:
+                if lat is not None:
+                    t0 = perf_counter_ns()
+                res = self._risk_eval(symbol=sym, price=price, score=score, ctx=ctx, planned_qty=planned_qty)
+                if lat is not None:
+                    t1 = perf_counter_ns()
+                    risk_ns += t1 - t0
+                if not res.allow:
+                    logger.debug(f"[RISK-HOLD] {sym} reason={res.reason}")
+                    continue
+                self._buy(sym, price, max(1, int(res.max_qty_hint or 0)), reason=f"score={score:.3f}")
+                if lat is not None:
+                    route_ns += perf_counter_ns() - t1
+            if lat is not None:
+                lat.record("risk", risk_ns)
+            return route_ns
+
+        if lat is not None:
+            t0 = perf_counter_ns()
+        budget_left = (float(self.risk_ctx.get("equity") or budget_val)
+                       - self.book.exposure() - self._inflight_value)
+        pctx = PolicyContext(ctx, tick_idx=self.tick_idx)
+        results = self._risk_batch(planned, self.risk_ctx.portfolio, pctx, budget_left=budget_left)
+        if lat is not None:
+            t1 = perf_counter_ns()
+            lat.record("risk", t1 - t0)
+        for (sym, price, _, score), (allow, reason, hint) in zip(planned, results):
+            if not allow:
+                logger.debug(f"[RISK-HOLD] {sym} reason={reason}")
+                continue
+            self._buy(sym, price, max(1, int(hint or 0)), reason=f"score={score:.3f}")
+        if lat is not None:
+            route_ns = perf_counter_ns() - t1
+        return route_ns
 
     # --- main tick entry
-    def on_tick(self, snapshot: Dict[str, float], ctx: Optional[Dict[str, Any]] = None) -> None:
+    def on_tick(self, snapshot: Dict[str, Any], ctx: Optional[Dict[str, Any]] = None) -> None:
+        """snapshot: {sym: price} 또는 {sym: {"price", "volume", "buy_vol", ...}}"""
+        # 틱 안에서 제출된 주문 의도는 틱이 끝난 뒤 한 묶음으로 디스패처에 넘어감
+        if self.recorder is not None:
+            self.recorder.record_snapshot(self.clock(), snapshot)
+        if self.volume_baseline is not None:
+            snapshot = self.volume_baseline.enrich(snapshot, self.clock())
+        if self.indicators is not None:
+            snapshot = self.indicators.enrich(snapshot)
+        orders = self.orders
+        orders.hold()
+        try:
+            self._on_tick(snapshot, ctx)
+        finally:
+            orders.release()
+
+    def _on_tick(self, snapshot: Dict[str, Any], ctx: Optional[Dict[str, Any]]) -> None:
+        lat = self.latency.active()
+        if lat is not None:
+            t_start = t0 = perf_counter_ns()
         self.tick_idx += 1
-
-        # 0) 실행 컨텍스트 구성
-        safe_ctx: Dict[str, Any] = {}
-        if isinstance(ctx, dict):
-            safe_ctx.update(ctx)
-
+        if self._begin_tick is not None:
+            self._begin_tick(self.tick_idx)
+        if self._market_feed is not None:
+            self._market_feed(snapshot)
+        if self._inflight:
+            self._apply_fills()  # 직전 틱 이후 도착한 체결 반영 (비동기 모드)
+        self.cooldowns.ticks.advance(self.tick_idx)  # 지나간 버킷의 만료 쿨다운 정리 (초 휠은 arm 시 정리)
+
+        # 0) 실행 컨텍스트: 영속 RiskContext는 평가금 변경 시에만 갱신(version 증가)
         budget_val = float(self.config.get("budget") or 0.0)
-        equity_val = float(self._equity_now() or budget_val)
-        account_block = {"equity": equity_val}
-
-        exposure_block = {
-            "budget": budget_val,
-            "equity": equity_val,
-            "equity_now": equity_val,
-            "cash": budget_val,
-            "portfolio": {
-                s: {"qty": float(p.qty), "avg_price": float(p.avg_price)}
-                for s, p in self.positions.items()
-            },
-            "positions": {
-                s: {"qty": float(p.qty), "avg_price": float(p.avg_price)}
-                for s, p in self.positions.items()
-            },  # alias
-            "sector_map": self.sector_map,
-            "sector_exposure": self._sector_exposure() or {},
-            "account": account_block,
-        }
-
-        safe_ctx.update({
-            "budget": budget_val,
-            "equity": equity_val,
-            "equity_now": equity_val,
-            "cash": budget_val,
-            "sector_map": self.sector_map,
-            "sector_exposure": exposure_block["sector_exposure"],
-            "portfolio": exposure_block["portfolio"],
-            "positions": exposure_block["positions"],
-            "account": account_block,
-            "exposure": exposure_block,
-            "exposure_ctx": exposure_block,
-            "risk_ctx": exposure_block,
-            "sector_of": self.sector_of,  # ✅ 섹터 함수 주입
-        })
+        self.risk_ctx.set_budget(budget_val)
+        self.risk_ctx.set_equity(float(self._equity_now() or budget_val))
+        tick_ctx: Mapping[str, Any] = ChainMap(self.risk_ctx, ctx) if ctx else self.risk_ctx
+        route_ns = 0
+        if lat is not None:
+            t1 = perf_counter_ns()
+            lat.record("context", t1 - t0)
+            t0 = t1
 
         # 1) 포지션 보유 종목: ExitRules 우선 평가
-        if self.positions:
-            to_close: List[Tuple[str, Position, object]] = []
-            for sym, pos in list(self.positions.items()):
-                price = snapshot.get(sym)
-                if price is None:
-                    continue
-                self._update_pos_state(pos, price)
-
-                dec = self.exit_rules.apply_exit(
-                    price_now=price,
-                    avg_price=pos.avg_price,
-                    last_high=pos.last_high,
-                    min_hold_ticks=1,
-                )
-                if getattr(dec, "should_exit", False):
-                    to_close.append((sym, pos, dec))
-
-            for sym, pos, dec in to_close:
-                self._sell(sym, snapshot[sym], pos.qty, reason=getattr(dec, "reason", "exit"))
-                self.recent_exit_tick[sym] = self.tick_idx
-                pos.exit_reason = getattr(dec, "reason", None)
-                logger.info(f"[EXIT] {sym} reason={pos.exit_reason}")
-                del self.positions[sym]
-
-        # 2) 신규 진입: RiskGate → BUY
-        for sym, price in snapshot.items():
+        book = self.book
+        reentry = self.cooldowns.ticks
+        if len(book):
+            ids, prices = book.gather(snapshot, _tick_price)
+            book.mark(ids, prices)  # last_price/last_high 컬럼 일괄 갱신
+
+            # 열린 포지션 전체를 한 번에 판정 (TP/SL/트레일링 마스크)
+            exits = self.exit_rules.apply_exit_book(book, ids, prices, self.tick_idx)
+            if lat is not None:
+                t1 = perf_counter_ns()
+                lat.record("exit", t1 - t0)
+                t0 = t1
+            for ex in exits:
+                sym, reason = ex["symbol"], ex["reason"]
+                prev = book.position(sym)
+                # 북은 낙관적으로 먼저 닫고 SELL 의도 제출 (실패 체결 시 _on_fill 이 복원)
+                reentry.arm((sym, "reentry"), self.tick_idx + self.min_reentry_cooldown_ticks)
+                logger.info(f"[EXIT] {sym} reason={reason}")
+                self.risk_ctx.set_position(sym, 0, 0.0, reason=reason)
+                self._sell(sym, ex["price"], ex["qty"], reason=reason, prev=prev)
+            if lat is not None and exits:
+                t1 = perf_counter_ns()
+                route_ns += t1 - t0
+                t0 = t1
+
+        # 2) 신규 진입: 점수 → 상위 K 선별(heap) → 배치 리스크 배분 → BUY (입력/컨텍스트가 바뀐 심볼만 평가)
+        last_eval = self._last_eval
+        evaluated = skipped = 0
+        buy_th = self._get_buy_threshold()
+        cands: List[Tuple[float, int, str, float]] = []  # (score, -도착순서, sym, price)
+        inflight = self._inflight
+        batch = self._score_batch
+        pending: List[Tuple[str, float, Dict[str, Any]]] = []  # 배치 평가 대기 (sym, price, snap)
+        for sym, val in snapshot.items():
             # 같은 틱에 막 청산한 심볼은 재진입 차단
-            last_exit_tick = self.recent_exit_tick.get(sym, -10**9)
-            if self.tick_idx - last_exit_tick < self.min_reentry_cooldown_ticks:
+            if reentry.active((sym, "reentry"), self.tick_idx):
                 continue
-            # 이미 보유 중이면 skip
-            if sym in self.positions:
+            # 이미 보유 중이거나 주문이 처리 중이면 skip
+            if sym in book or sym in inflight:
                 continue
-
-            # 임시 계획 수량(계좌 5% 기준) → 정책이 planned_qty를 고려해 하드블록 판단
-            planned_qty = max(1, int((budget_val * 0.05) / max(1e-9, float(price))))
-            safe_ctx["planned_qty"] = planned_qty  # ✅ planned_qty 주입
-
-            score = self._safe_score(sym, float(price), safe_ctx)
-            risk_res = self._risk_eval(symbol=sym, price=float(price), score=score, ctx=safe_ctx)
-            if not risk_res.allow:
-                logger.debug(f"[RISK-HOLD] {sym} reason={risk_res.reason}")
+            price = _tick_price(val)
+            if price is None:
                 continue
 
-            qty_hint = int(risk_res.max_qty_hint or 0)
-            qty = max(1, qty_hint)
+            # dirty-set: 입력 지문과 RiskContext version 이 모두 같으면 직전 판단(임계값 미달) 유지
+            if not self._score_uses_ctx:
+                key = (_tick_fingerprint(val), self.risk_ctx.version)
+                if last_eval.get(sym) == key:
+                    skipped += 1
+                    continue
+                last_eval[sym] = key
+            evaluated += 1
 
-            if score >= self._get_buy_threshold():
-                self._buy(sym, float(price), qty, reason=f"score={score:.3f}")
+            snap = _tick_snapshot(sym, price, val)
+            if batch is not None:
+                pending.append((sym, price, snap))
+                continue
+            score = self._safe_score(sym, price, tick_ctx, snap)
+            if score >= buy_th:
+                cands.append((score, -len(cands), sym, price))
+        if pending:
+            scores = batch([p[2] for p in pending])
+            if scores is None:  # 배치 실패 → 심볼별 평가
+                scores = [self._safe_score(sym, price, tick_ctx, snap) for sym, price, snap in pending]
+            for (sym, price, _), score in zip(pending, scores):
+                if score >= buy_th:
+                    cands.append((score, -len(cands), sym, price))
+
+        if lat is not None:
+            lat.record("score", perf_counter_ns() - t0)
+
+        if cands:
+            route_ns += self._allocate(heapq.nlargest(self.top_k, cands), tick_ctx, budget_val, lat)
+            # 임계값은 넘었지만 진입하지 못한 후보(리스크 거부/쿨다운/상위 K 탈락)는 캐시하지 않음
+            # → DayDD·쿨다운·호출자 ctx 가 풀리면 입력 지문이 같아도 다음 틱에 다시 평가
+            for _, _, sym, _ in cands:
+                if sym not in book and sym not in inflight:
+                    last_eval.pop(sym, None)
+        if lat is not None:
+            if route_ns:
+                lat.record("route", route_ns)
+            lat.record("tick", perf_counter_ns() - t_start)
+
+        st = self.stats
+        st["symbols_evaluated"] += evaluated
+        st["symbols_skipped"] += skipped
+        st["last_evaluated"] = evaluated
+        st["last_skipped"] = skipped
+        if self._ckpt_writer is not None and (self._ckpt_due or self.tick_idx % self.checkpoint_every == 0):
+            self._maybe_checkpoint()
 
 
 # ========== HubTrade ==========
@@ -473,11 +708,91 @@ class HubTrade:
             config=self.config,
         )
 
-    def run_session(self, price_feed_iter, max_ticks: int = 1000):
+        self.input_buffer: Optional[ConflatingBuffer] = None
+
+    def run_session(self, price_feed_iter, max_ticks: int = 1000, conflate: Optional[bool] = None,
+                    ctx: Optional[Dict[str, Any]] = None):
+        """
+        conflate=True (또는 config["conflate"]): 피드를 별도 스레드로 읽어 병합 버퍼에 쌓고,
+        Hub는 처리할 때마다 심볼별 최신값만 꺼냄 → 피드가 빨라도 지연이 누적되지 않음
+        ctx: 틱마다 Hub.on_tick 에 넘길 호출자 컨텍스트 (RiskContext 뒤에 체인, 예: 섹터/now_ts)
+        세션이 끝나면(예외 포함) Hub.close — 세션 하나가 Hub 수명 (다음 세션은 새 HubTrade 로 복원)
+        """
+        if conflate is None:
+            conflate = bool(self.config.get("conflate", False))
+        try:
+            if conflate:
+                ticks = self._run_conflated(price_feed_iter, max_ticks, ctx)
+            else:
+                ticks = 0
+                for snapshot in price_feed_iter:
+                    self.hub.on_tick(snapshot, ctx)
+                    ticks += 1
+                    if ticks >= max_ticks:
+                        break
+            self.hub.drain_orders()
+            self.hub.orders.close()
+            if self.hub.journal is not None:
+                self.hub.journal.sync()
+            if self.hub.recorder is not None:
+                self.hub.recorder.flush()
+                logger.info(f"[TICKS] {self.hub.recorder.root} rows={self.hub.recorder.rows}")
+            if self.hub.checkpoint_path:
+                nbytes = self.hub.save_checkpoint()
+                w = self.hub._ckpt_writer
+                logger.info(f"[CHECKPOINT] {self.hub.checkpoint_path} bytes={nbytes} periodic={w.written} "
+                            f"superseded={w.skipped} last_write={w.last_write_ms:.2f}ms")
+            st = self.hub.stats
+            logger.info(f"[SESSION END] ticks={ticks} evaluated={st['symbols_evaluated']} "
+                        f"skipped={st['symbols_skipped']}")
+            om = self.hub.orders.summary_dict()
+            logger.info(f"[ORDERS] submitted={om['submitted']} dispatched={om['dispatched']} "
+                        f"failed={om['failed']} max_depth={om['max_depth']}")
+            lock_stats = getattr(self.router, "lock_stats", None)
+            if callable(lock_stats):
+                lk = lock_stats()["orders"]
+                logger.info(f"[LOCKS] acquires={lk['acquires']} contended={lk['contended']} "
+                            f"wait/acquire={lk['wait_per_acquire_us']}us p99={lk['wait_p99_us']}us")
+            if self.hub.latency.enabled:
+                for stage, d in self.hub.latency.summary_dict().items():
+                    logger.info(f"[LATENCY] {stage} n={d['count']} p50={d['p50_us']}us "
+                                f"p99={d['p99_us']}us max={d['max_us']}us")
+        finally:
+            self.hub.close()   # 예외/중단에도 저널·체크포인트 기록 스레드 종료 + 거래량 기준선 저장
+        return ticks
+
+    def _run_conflated(self, price_feed_iter, max_ticks: int, ctx: Optional[Dict[str, Any]] = None) -> int:
+        buf = ConflatingBuffer(int(self.config.get("conflate_max_symbols", 4096)))
+        self.input_buffer = buf
+        stop = threading.Event()
+
+        def _pump() -> None:
+            try:
+                for item in price_feed_iter:
+                    if stop.is_set():
+                        break
+                    buf.put(_as_snapshot(item))
+            except Exception as e:
+                logger.warning(f"[FEED] 피드 중단: {e}")
+            finally:
+                buf.close()
+
+        th = threading.Thread(target=_pump, name="hub-feed", daemon=True)
+        th.start()
         ticks = 0
-        for snapshot in price_feed_iter:
-            self.hub.on_tick(snapshot)
-            ticks += 1
-            if ticks >= max_ticks:
-                break
-        logger.info(f"[SESSION END] ticks={ticks}")
+        try:
+            while ticks < max_ticks:
+                snapshot = buf.take(timeout=0.5)
+                if snapshot is None:      # 피드 종료 + 잔여 없음
+                    break
+                if not snapshot:
+                    continue
+                self.hub.on_tick(snapshot, ctx)
+                ticks += 1
+        finally:
+            stop.set()
+        m = buf.summary_dict()
+        logger.info(f"[INPUT] received={m['received']} merged={m['merged']} dropped={m['dropped']} "
+                    f"batches={m['batches']} age_p99={m['queue_age_p99_us']}us "
+                    f"age_max={m['queue_age_max_us']}us")
+        return ticks
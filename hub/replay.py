@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+hub/replay.py — 기록된 틱 파일을 HubTrade 에 최대 속도로 흘리는 결정적 리플레이 백테스터
+
+- 틱 파일: CSV(헤더 ts,symbol,price[,volume,buy_vol,...]) 또는 JSONL(행마다 같은 필드의 객체)
+  같은 ts 가 연속된 행은 한 snapshot 으로 묶음 (파일은 ts 오름차순이어야 함)
+  디렉터리면 바이너리 틱 저장소(market/tickstore.py)로 보고 일자 순으로 mmap 재생
+- 시뮬레이션 시계: 각 snapshot 의 ts 를 ctx["now_ts"] 로 주입 + Hub.clock 교체
+  (DayDD 쿨다운·진입시각·체결 기록 시각이 벽시계 대신 테이프 시각을 따름)
+- sleep 없음, 동기 주문(틱 루프 안에서 체결 반영), 브로커는 LOB 매칭 엔진 → 같은 입력이면 같은 결과
+- scorer 상태: 리플레이마다 reset_state (ScoreEngine 의 모듈 전역 폴백 직전가가 이전 실행에서 새지 않게),
+  뉴스 감정(벽시계·최신 뉴스 파일 의존)은 기본 끔 (news=True 로 켬 — 그 경우 결정성 보장 없음)
+- 결과: 체결 결정 목록(write_session_report 입력) + ticks/sec 처리량
+
+사용:
+    rp = ReplayEngine.build(symbols, budget=10_000_000)
+    res = rp.run(read_tick_file("ticks_20250101.csv"))
+    res.ticks_per_sec, res.decisions
+"""
+from __future__ import annotations
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from hub.hub_trade import HubTrade
+from market.tickstore import TickStore
+from obs.log import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = ["read_tick_file", "read_tick_source", "group_ticks", "make_replay_router", "ReplayResult", "ReplayEngine",
+           "REPLAY_CONFIG"]
+
+# 리플레이 강제 설정: 동기 주문(틱 안에서 체결 반영) + 입력 병합 없음 + 체결 기록
+REPLAY_CONFIG: Dict[str, Any] = {"async_orders": False, "conflate": False, "record_decisions": True}
+
+# 숫자로 읽는 틱 필드 (나머지 열은 문자열 그대로)
+_NUMERIC = ("price", "volume", "curr_vol", "avg_vol", "volume_avg", "buy_vol", "sell_vol",
+            "fast", "slow", "bid", "ask", "bid_size", "ask_size")
+
+
+def _parse_ts(v: Any) -> float:
+    if isinstance(v, (int, float)):
+        return float(v)
+    s = str(v).strip()
+    try:
+        return float(s)
+    except ValueError:
+        return datetime.fromisoformat(s).timestamp()
+
+
+def _rows(path: str) -> Iterator[Dict[str, Any]]:
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+            yield from csv.DictReader(fh)
+
+
+def group_ticks(rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """틱 행 → (ts, snapshot). 같은 ts 연속 행을 묶고 ts 역행은 RuntimeError"""
+    cur_ts: Optional[float] = None
+    snap: Dict[str, Any] = {}
+    for r in rows:
+        ts = _parse_ts(r["ts"])
+        if cur_ts is not None and ts != cur_ts:
+            if ts < cur_ts:
+                raise RuntimeError(f"틱 파일 시각이 역행합니다: {ts} < {cur_ts}")
+            yield cur_ts, snap
+            snap = {}
+        cur_ts = ts
+        tick: Dict[str, Any] = {}
+        for k, v in r.items():
+            if k in ("ts", "symbol") or v is None or v == "":
+                continue
+            tick[k] = float(v) if k in _NUMERIC else v
+        snap[str(r["symbol"])] = tick
+    if cur_ts is not None:
+        yield cur_ts, snap
+
+
+def read_tick_file(path: str) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """CSV/JSONL 틱 파일 → (ts, snapshot) 스트림"""
+    return group_ticks(_rows(path))
+
+
+def read_tick_source(path: str, days: Optional[List[str]] = None) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """틱 파일 또는 틱 저장소 디렉터리(일자 순, days 로 제한 가능) → (ts, snapshot) 스트림"""
+    if not os.path.isdir(path):
+        yield from read_tick_file(path)
+        return
+    store = TickStore(path)
+    try:
+        for day in days or store.days():
+            yield from store.iter_snapshots(day)
+    finally:
+        store.close()
+
+
+def make_replay_router(budget: float):
+    """LOB 매칭 엔진 시뮬레이션 브로커를 붙인 OrderRouter (체결가/체결량이 테이프를 따름)"""
+    from order.adapters.lob import LobAdapter
+    from order.router import OrderRouter
+    adapter = LobAdapter(cash=budget)
+    adapter.connect()
+    return OrderRouter(logger=logger, adapter=adapter)
+
+
+@dataclass
+class ReplayResult:
+    ticks: int                   # snapshot 수 (Hub.on_tick 호출 수)
+    rows: int                    # 심볼 틱 수 (snapshot 안의 심볼 합)
+    elapsed_s: float
+    ticks_per_sec: float
+    first_ts: Optional[float]
+    last_ts: Optional[float]
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+    positions: Dict[str, Tuple[int, float]] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"ticks": self.ticks, "rows": self.rows, "elapsed_s": round(self.elapsed_s, 6),
+                "ticks_per_sec": round(self.ticks_per_sec, 1),
+                "first_ts": self.first_ts, "last_ts": self.last_ts,
+                "decisions": self.decisions,
+                "positions": {s: list(v) for s, v in self.positions.items()}}
+
+
+class ReplayEngine:
+    def __init__(self, hub_trade: HubTrade, news: bool = False) -> None:
+        self.trade = hub_trade
+        self.now_ts = 0.0
+        hub = hub_trade.hub
+        hub.clock = lambda: self.now_ts
+        scorer = hub.scorer
+        if callable(getattr(scorer, "reset_state", None)):
+            scorer.reset_state()
+        if hasattr(scorer, "use_news"):
+            scorer.use_news = bool(news)
+        if hub.decisions is None:
+            hub.decisions = []
+        if hub.orders.threaded:
+            logger.warning("[REPLAY] 비동기 주문 파이프라인 — 체결 순서가 스레드 스케줄에 따라 달라질 수 있음")
+
+    @classmethod
+    def build(cls, symbols: List[str], budget: float, config: Optional[Dict[str, Any]] = None,
+              news: bool = False, **hub_kwargs: Any) -> "ReplayEngine":
+        """LOB 시뮬레이션 브로커 + 동기 주문으로 HubTrade 구성 (router 를 넘기면 그대로 사용)"""
+        cfg: Dict[str, Any] = {"budget": budget, "latency_stats": False}
+        cfg.update(config or {})
+        cfg.update(REPLAY_CONFIG)
+        if hub_kwargs.get("router") is None:
+            hub_kwargs["router"] = make_replay_router(budget)
+        return cls(HubTrade(symbols, config=cfg, **hub_kwargs), news=news)
+
+    def _drive(self, source: Iterable[Tuple[float, Dict[str, Any]]],
+               ctx: Dict[str, Any], span: List[Any]) -> Iterator[Dict[str, Any]]:
+        for ts, snap in source:
+            self.now_ts = ts
+            ctx["now_ts"] = ts
+            if span[0] is None:
+                span[0] = ts
+            span[1] = ts
+            span[2] += len(snap)
+            yield snap
+
+    def run(self, source: Iterable[Tuple[float, Dict[str, Any]]], max_ticks: Optional[int] = None,
+            ctx: Optional[Dict[str, Any]] = None) -> ReplayResult:
+        """(ts, snapshot) 스트림을 끝까지(또는 max_ticks) 재생"""
+        run_ctx: Dict[str, Any] = dict(ctx or {})
+        span: List[Any] = [None, None, 0]   # 첫 ts, 마지막 ts, 심볼 틱 수
+        t0 = time.perf_counter()
+        ticks = self.trade.run_session(self._drive(source, run_ctx, span),
+                                       max_ticks=max_ticks or 1 << 62, conflate=False, ctx=run_ctx)
+        elapsed = time.perf_counter() - t0
+        hub = self.trade.hub
+        book = hub.book
+        res = ReplayResult(ticks, span[2], elapsed, ticks / elapsed if elapsed > 0 else 0.0, span[0], span[1],
+                           list(hub.decisions or []),
+                           {s: (book.position(s).qty, book.position(s).avg_price) for s in book})
+        logger.info(f"[REPLAY] ticks={ticks} rows={span[2]} elapsed={elapsed:.3f}s ticks/sec={res.ticks_per_sec:,.0f} "
+                    f"fills={len(res.decisions)} open={len(res.positions)}")
+        return res
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+market/indicators.py — 심볼별 증분 기술지표 엔진 (틱당 O(1), 심볼당 고정 메모리)
+
+- SMA fast/slow: 링 버퍼(max(fast, slow)) + 이동 합계 (링이 한 바퀴 돌 때마다 합계를 다시 계산해 오차 누적 차단)
+- EMA fast/slow: α = 2/(n+1), 첫 틱 가격으로 시드
+- RSI / ATR: Wilder 평활(α = 1/period), 첫 가격 변화로 시드. 틱 데이터라 TR = |Δ가격|
+- VWAP: 세션 누적 Σp·v / Σv (reset_session 으로 일자 경계 초기화)
+- 롤링 고가/저가: hl_window 틱 단조 덱 (분할상환 O(1))
+- enrich(snapshot): 지표를 갱신하고 {"fast","slow","ema_fast",...} 를 붙인 새 snapshot 반환
+  (상위에서 이미 fast/slow 를 준 심볼은 그 값을 유지, slow 창이 찰 때까지 fast/slow 미기재 → ma_cross 0)
+- warmup(symbol, prices, volumes): 기록된 이력으로 상태를 한 번에 구성 (NumPy 벡터 연산, 없으면 update 반복)
+  warmup_store(store, day): market/tickstore.TickStore 의 mmap 컬럼에서 심볼별 warmup
+
+사용:
+    ind = IndicatorEngine(IndicatorConfig(fast=5, slow=20))
+    ind.warmup_store(TickStore("ticks"), "20250101")
+    hub.on_tick(ind.enrich(snapshot))
+"""
+from __future__ import annotations
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 warmup 은 update 반복
+    np = None  # type: ignore
+
+__all__ = ["IndicatorConfig", "IndicatorEngine", "INDICATOR_FIELDS"]
+
+# enrich 가 snapshot 에 붙이는 필드
+INDICATOR_FIELDS = ("fast", "slow", "sma_fast", "sma_slow", "ema_fast", "ema_slow",
+                    "vwap", "rsi", "atr", "hl_high", "hl_low")
+
+
+@dataclass
+class IndicatorConfig:
+    fast: int = 5
+    slow: int = 20
+    ma: str = "sma"          # fast/slow 필드에 쓸 평균 ("sma" | "ema")
+    rsi_period: int = 14
+    atr_period: int = 14
+    hl_window: int = 20
+
+
+class _SymState:
+    __slots__ = ("n", "pos", "ring", "sum_f", "sum_s", "ema_f", "ema_s", "prev",
+                 "gain", "loss", "atr", "pv", "vol", "hi", "lo")
+
+    def __init__(self, size: int) -> None:
+        self.n = 0
+        self.pos = 0
+        self.ring = array("d", bytes(8 * size))
+        self.sum_f = self.sum_s = 0.0
+        self.ema_f = self.ema_s = 0.0
+        self.prev = 0.0
+        self.gain = self.loss = self.atr = 0.0
+        self.pv = self.vol = 0.0
+        self.hi: deque = deque()   # (seq, price) 단조 감소
+        self.lo: deque = deque()   # (seq, price) 단조 증가
+
+
+def _price_of(val: Any) -> Optional[float]:
+    if isinstance(val, (int, float)):
+        return float(val)
+    p = val.get("price") if isinstance(val, dict) else getattr(val, "price", None)
+    return float(p) if p is not None else None
+
+
+def _volume_of(val: Any) -> float:
+    if isinstance(val, dict):
+        v = val.get("volume") or val.get("curr_vol")
+    else:
+        v = getattr(val, "volume", None) or getattr(val, "curr_vol", None)
+    try:
+        return float(v or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class IndicatorEngine:
+    def __init__(self, config: Optional[IndicatorConfig] = None) -> None:
+        self.cfg = c = config or IndicatorConfig()
+        if min(c.fast, c.slow, c.rsi_period, c.atr_period, c.hl_window) < 1:
+            raise RuntimeError(f"지표 기간은 1 이상이어야 합니다: {c}")
+        if c.ma not in ("sma", "ema"):
+            raise RuntimeError(f"알 수 없는 이동평균 종류: {c.ma}")
+        self._size = max(c.fast, c.slow)
+        self._af = 2.0 / (c.fast + 1)
+        self._as = 2.0 / (c.slow + 1)
+        self._ar = 1.0 / c.rsi_period
+        self._aa = 1.0 / c.atr_period
+        self._state: Dict[str, _SymState] = {}
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._state
+
+    # ---------- 증분 갱신 ----------
+    def update(self, symbol: str, price: float, volume: float = 0.0) -> None:
+        st = self._state.get(symbol)
+        if st is None:
+            st = self._state[symbol] = _SymState(self._size)
+        c = self.cfg
+        ring, R, pos, n = st.ring, self._size, st.pos, st.n
+        # 창에서 빠지는 값은 덮어쓰기 전에 읽음 (fast == R 이면 ring[pos] 자신)
+        if n >= c.fast:
+            st.sum_f -= ring[(pos - c.fast) % R]
+        if n >= c.slow:
+            st.sum_s -= ring[(pos - c.slow) % R]
+        st.sum_f += price
+        st.sum_s += price
+        ring[pos] = price
+        st.pos = pos = (pos + 1) % R
+        if pos == 0:  # 한 바퀴마다 합계 재계산 (분할상환 O(1))
+            st.sum_f = sum(ring[(pos - k) % R] for k in range(1, min(n + 1, c.fast) + 1))
+            st.sum_s = sum(ring[(pos - k) % R] for k in range(1, min(n + 1, c.slow) + 1))
+
+        if n == 0:
+            st.ema_f = st.ema_s = price
+        else:
+            st.ema_f += self._af * (price - st.ema_f)
+            st.ema_s += self._as * (price - st.ema_s)
+            d = price - st.prev
+            g, l = (d, 0.0) if d > 0 else (0.0, -d)
+            if n == 1:
+                st.gain, st.loss, st.atr = g, l, abs(d)
+            else:
+                st.gain += self._ar * (g - st.gain)
+                st.loss += self._ar * (l - st.loss)
+                st.atr += self._aa * (abs(d) - st.atr)
+        st.prev = price
+        if volume > 0:
+            st.pv += price * volume
+            st.vol += volume
+
+        st.n = n = n + 1
+        hi, lo, cut = st.hi, st.lo, n - c.hl_window
+        while hi and hi[-1][1] <= price:
+            hi.pop()
+        hi.append((n, price))
+        while lo and lo[-1][1] >= price:
+            lo.pop()
+        lo.append((n, price))
+        while hi[0][0] <= cut:
+            hi.popleft()
+        while lo[0][0] <= cut:
+            lo.popleft()
+
+    def values(self, symbol: str) -> Dict[str, float]:
+        """현재 지표 값 (창이 덜 찬 지표는 생략)"""
+        st = self._state.get(symbol)
+        if st is None:
+            return {}
+        c, n = self.cfg, st.n
+        out: Dict[str, float] = {"sma_fast": st.sum_f / min(n, c.fast), "sma_slow": st.sum_s / min(n, c.slow),
+                                 "ema_fast": st.ema_f, "ema_slow": st.ema_s,
+                                 "hl_high": st.hi[0][1], "hl_low": st.lo[0][1]}
+        if n >= c.slow:
+            out["fast"], out["slow"] = ((out["sma_fast"], out["sma_slow"]) if c.ma == "sma"
+                                        else (st.ema_f, st.ema_s))
+        if n > c.rsi_period:
+            out["rsi"] = (100.0 - 100.0 / (1.0 + st.gain / st.loss) if st.loss > 0
+                          else 100.0 if st.gain > 0 else 50.0)
+        if n > c.atr_period:
+            out["atr"] = st.atr
+        if st.vol > 0:
+            out["vwap"] = st.pv / st.vol
+        return out
+
+    def enrich(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """snapshot {sym: price | {...} | Tick} → 지표 갱신 후 {sym: {..., 지표 필드}} (입력 dict 는 수정하지 않음)"""
+        out: Dict[str, Any] = {}
+        for sym, val in snapshot.items():
+            price = _price_of(val)
+            if price is None:
+                out[sym] = val
+                continue
+            self.update(sym, price, _volume_of(val))
+            ind = self.values(sym)
+            if isinstance(val, dict):
+                tick = dict(val)
+                for k, v in ind.items():
+                    tick.setdefault(k, v)
+            else:
+                tick = {"price": price}
+                for k in ("volume", "curr_vol", "buy_vol", "sell_vol", "avg_vol"):
+                    v = getattr(val, k, None)
+                    if v is not None:
+                        tick[k] = v
+                tick.update(ind)
+            out[sym] = tick
+        return out
+
+    def reset_session(self) -> None:
+        """일자 경계: VWAP 누적만 초기화 (이평/RSI/ATR/고저는 이어감)"""
+        for st in self._state.values():
+            st.pv = st.vol = 0.0
+
+    # ---------- 이력 warm-up ----------
+    def warmup(self, symbol: str, prices: Sequence[float], volumes: Optional[Sequence[float]] = None) -> None:
+        """기록된 가격(과 거래량) 이력으로 심볼 상태를 새로 구성 — update 를 차례로 부른 것과 같은 상태"""
+        self._state.pop(symbol, None)
+        if np is None:
+            vols = volumes if volumes is not None else [0.0] * len(prices)
+            for p, v in zip(prices, vols):
+                self.update(symbol, float(p), float(v))
+            return
+        P = np.asarray(prices, dtype=float)
+        T = len(P)
+        if T == 0:
+            return
+        c, R = self.cfg, self._size
+        st = self._state[symbol] = _SymState(R)
+        idx = np.arange(max(0, T - R), T)
+        ring = np.frombuffer(st.ring, dtype=float)
+        ring[idx % R] = P[idx]
+        st.n, st.pos, st.prev = T, T % R, float(P[-1])
+        st.sum_f = float(P[-c.fast:].sum())
+        st.sum_s = float(P[-c.slow:].sum())
+        st.ema_f = _ema_last(P[1:], self._af, P[0])
+        st.ema_s = _ema_last(P[1:], self._as, P[0])
+        if T > 1:
+            D = np.diff(P)
+            G, L = np.maximum(D, 0.0), np.maximum(-D, 0.0)
+            st.gain = _ema_last(G[1:], self._ar, G[0])
+            st.loss = _ema_last(L[1:], self._ar, L[0])
+            A = np.abs(D)
+            st.atr = _ema_last(A[1:], self._aa, A[0])
+        if volumes is not None:
+            V = np.asarray(volumes, dtype=float)
+            V = np.where(V > 0, V, 0.0)
+            st.pv, st.vol = float(P @ V), float(V.sum())
+        # 고/저 단조 덱은 마지막 hl_window 틱만 차례로 (창 크기로 제한된 루프)
+        for seq, p in zip(range(max(0, T - c.hl_window) + 1, T + 1), P[-c.hl_window:].tolist()):
+            while st.hi and st.hi[-1][1] <= p:
+                st.hi.pop()
+            st.hi.append((seq, p))
+            while st.lo and st.lo[-1][1] >= p:
+                st.lo.pop()
+            st.lo.append((seq, p))
+
+    def warmup_store(self, store: Any, day: str, symbols: Optional[Iterable[str]] = None) -> int:
+        """TickStore 하루치 컬럼(mmap)으로 심볼별 warmup. 반환: warmup 한 심볼 수"""
+        n = 0
+        for sym in (symbols if symbols is not None else store.symbols(day)):
+            try:
+                cols = store.columns(day, sym)
+            except RuntimeError:
+                continue
+            if len(cols):
+                self.warmup(sym, cols.price, cols.volume)
+                n += 1
+        return n
+
+
+def _ema_last(x: Any, alpha: float, seed: float) -> float:
+    """e0 = seed, e_t = e_{t-1} + α(x_t - e_{t-1}) 의 마지막 값 (닫힌 형태 가중합)"""
+    m = len(x)
+    if m == 0:
+        return float(seed)
+    decay = (1.0 - alpha) ** np.arange(m - 1, -1, -1, dtype=float)
+    return float((1.0 - alpha) ** m * seed + alpha * (decay @ x))
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+market/synthetic.py — NumPy 배치 합성 시장 피드 (부하 테스트용)
+
+- 가격: 단일 팩터 상관 GBM + 복합 포아송 점프
+    dW_i = sqrt(rho)·Z_mkt + sqrt(1-rho)·Z_i,   log S(t+1) = log S(t) + (mu - σ²/2)dt + σ·sqrt(dt)·dW + J
+- 거래량: 로그정규 기본량 × (1 + |수익률|/σ√dt) — 크게 움직인 틱에 거래가 몰림
+- 매수/매도 체결: 수익률 부호 쪽으로 기운 비율로 거래량 분할 (buy_vol/sell_vol)
+- fast/slow: 가격 EMA (scoring/features/ta.ma_cross 입력)
+- batch_ticks 틱을 (T×N) 행렬로 한 번에 생성 → 틱당 파이썬 루프는 snapshot dict 구성뿐
+
+사용:
+    feed = SyntheticMarket(SyntheticConfig(n_symbols=10_000, seed=1))
+    for snap in feed.stream(ticks=1000, rate=100):   # rate=0 이면 sleep 없이 최대 속도
+        hub.on_tick(snap)
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 생성 불가 (SyntheticMarket 생성 시 RuntimeError)
+    np = None  # type: ignore
+
+__all__ = ["SyntheticConfig", "SyntheticBatch", "SyntheticMarket"]
+
+
+@dataclass
+class SyntheticConfig:
+    n_symbols: int = 1000
+    seed: Optional[int] = None
+    start_price: float = 50_000.0
+    price_spread: float = 0.8        # 시작가 로그 분산 (심볼마다 다른 가격대)
+    mu: float = 0.0                  # 연율 드리프트
+    sigma: float = 0.35              # 연율 변동성
+    rho: float = 0.3                 # 시장 팩터 상관
+    dt: float = 1.0 / (252 * 6.5 * 3600)   # 틱 = 1초 (장중 초 단위)
+    jump_rate: float = 1e-4          # 틱당 점프 확률
+    jump_mu: float = 0.0
+    jump_sigma: float = 0.02         # 점프 크기 (로그)
+    base_volume: float = 200.0       # 틱당 거래량 중앙값
+    volume_sigma: float = 0.8
+    fast_span: int = 5
+    slow_span: int = 20
+    batch_ticks: int = 64
+    tick_size: float = 0.0           # >0 이면 가격을 호가 단위로 반올림
+    prefix: str = "S"
+
+
+@dataclass
+class SyntheticBatch:
+    """(T×N) 배열 묶음 — 행 = 틱, 열 = 심볼"""
+    ts: Any
+    price: Any
+    volume: Any
+    buy_vol: Any
+    sell_vol: Any
+    fast: Any
+    slow: Any
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+class SyntheticMarket:
+    def __init__(self, config: Optional[SyntheticConfig] = None, symbols: Optional[List[str]] = None,
+                 start_ts: Optional[float] = None) -> None:
+        if np is None:
+            raise RuntimeError("SyntheticMarket 은 NumPy 가 필요합니다")
+        self.cfg = c = config or SyntheticConfig()
+        n = len(symbols) if symbols else int(c.n_symbols)
+        width = len(str(max(0, n - 1)))
+        self.symbols: List[str] = list(symbols) if symbols else [f"{c.prefix}{i:0{width}d}" for i in range(n)]
+        self.rng = np.random.default_rng(c.seed)
+        self._logp = np.log(c.start_price) + c.price_spread * self.rng.standard_normal(n)
+        p0 = np.exp(self._logp)
+        self._fast = p0.copy()
+        self._slow = p0.copy()
+        self.ts = float(time.time() if start_ts is None else start_ts)
+        self.ticks = 0
+
+    # ---------- 배치 생성 ----------
+    def next_batch(self, ticks: Optional[int] = None) -> SyntheticBatch:
+        c = self.cfg
+        T = int(ticks or c.batch_ticks)
+        n = len(self.symbols)
+        rng = self.rng
+        sq_dt = np.sqrt(c.dt)
+        z = np.sqrt(c.rho) * rng.standard_normal((T, 1)) + np.sqrt(1.0 - c.rho) * rng.standard_normal((T, n))
+        ret = (c.mu - 0.5 * c.sigma ** 2) * c.dt + c.sigma * sq_dt * z
+        if c.jump_rate > 0:
+            hit = rng.random((T, n)) < c.jump_rate
+            k = int(hit.sum())
+            if k:
+                ret[hit] += rng.normal(c.jump_mu, c.jump_sigma, k)
+        logp = self._logp + np.cumsum(ret, axis=0)
+        self._logp = logp[-1].copy()
+        price = np.exp(logp)
+        if c.tick_size > 0:
+            price = np.maximum(c.tick_size, np.round(price / c.tick_size) * c.tick_size)
+
+        # 거래량: 움직임이 클수록 증가, 매수 비중은 수익률 부호로 기울임
+        intensity = 1.0 + np.abs(ret) / (c.sigma * sq_dt)
+        volume = np.floor(c.base_volume * rng.lognormal(0.0, c.volume_sigma, (T, n)) * intensity) + 1.0
+        buy_share = np.clip(0.5 + 0.5 * np.tanh(ret / (c.sigma * sq_dt)), 0.05, 0.95)
+        buy_vol = np.floor(volume * buy_share)
+        sell_vol = volume - buy_vol
+
+        fast = np.empty_like(price)
+        slow = np.empty_like(price)
+        af, as_ = 2.0 / (c.fast_span + 1), 2.0 / (c.slow_span + 1)
+        f, s = self._fast, self._slow
+        for t in range(T):  # EMA 는 시간 방향 재귀 → 틱 루프(심볼 축은 벡터)
+            f = f + af * (price[t] - f)
+            s = s + as_ * (price[t] - s)
+            fast[t] = f
+            slow[t] = s
+        self._fast, self._slow = f, s
+
+        ts = self.ts + np.arange(1, T + 1, dtype=float)
+        self.ts = float(ts[-1])
+        self.ticks += T
+        return SyntheticBatch(ts, price, volume, buy_vol, sell_vol, fast, slow)
+
+    # ---------- snapshot ----------
+    def snapshots(self, ticks: int) -> Iterator[Dict[str, Dict[str, float]]]:
+        """ticks 개의 Hub snapshot {sym: {"price","volume","buy_vol","sell_vol","fast","slow"}}"""
+        left = int(ticks)
+        syms = self.symbols
+        while left > 0:
+            b = self.next_batch(min(left, self.cfg.batch_ticks))
+            for t in range(len(b)):
+                yield {s: {"price": p, "volume": v, "buy_vol": bv, "sell_vol": sv, "fast": f, "slow": sl}
+                       for s, p, v, bv, sv, f, sl in zip(
+                           syms, b.price[t].tolist(), b.volume[t].tolist(), b.buy_vol[t].tolist(),
+                           b.sell_vol[t].tolist(), b.fast[t].tolist(), b.slow[t].tolist())}
+            left -= len(b)
+
+    def stream(self, ticks: int, rate: float = 0.0) -> Iterator[Dict[str, Dict[str, float]]]:
+        """
+        rate>0: 초당 rate 틱 페이스로 방출 (밀리면 따라잡기 위해 sleep 생략)
+        rate=0: sleep 없이 최대 속도
+        """
+        if rate <= 0:
+            yield from self.snapshots(ticks)
+            return
+        period = 1.0 / rate
+        due = time.perf_counter()
+        for snap in self.snapshots(ticks):
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(due - now)
+            yield snap
+            due += period
+
+    def stream_ts(self, ticks: int) -> Iterator[tuple]:
+        """(ts, snapshot) — hub/replay.ReplayEngine 입력 형태 (시뮬레이션 시계 = 1틱 1초)"""
+        t0 = self.ts
+        for i, snap in enumerate(self.snapshots(ticks), 1):
+            yield t0 + i, snap
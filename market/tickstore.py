@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+market/tickstore.py — 고정폭 바이너리 틱 저장소 (일자/심볼별 컬럼 파일) + mmap 리더
+
+디렉터리 구조:
+  {root}/{YYYYMMDD}/index.json          심볼별 행 수 / 첫·마지막 ts (flush 때 원자적 교체)
+  {root}/{YYYYMMDD}/{symbol}.ts         int64  epoch ns
+  {root}/{YYYYMMDD}/{symbol}.px         float64 체결가
+  {root}/{YYYYMMDD}/{symbol}.vol        int32  틱 거래량
+  {root}/{YYYYMMDD}/{symbol}.side       int8   +1 매수체결 / -1 매도체결 / 0 미상
+  (리틀엔디언 원시 배열, 헤더 없음 → 행 i 의 오프셋 = i * itemsize)
+
+- TickRecorder: 라이브 피드 snapshot 을 심볼별 array 버퍼에 쌓고 flush_rows 마다 컬럼 파일에 append
+  (심볼 수만큼 파일 핸들을 열어 두지 않음 — flush 시 열고 닫음)
+- TickStore: 컬럼을 mmap 으로 열어 복사 없이 조회 (NumPy 있으면 np.memmap, 없으면 memoryview.cast)
+  크래시로 컬럼 길이가 어긋나면 가장 짧은 컬럼 길이까지만 유효
+- TickStore.iter_snapshots(day): 심볼 스트림을 ts 로 병합 → (ts, snapshot) — hub/replay 입력과 같은 형태
+  심볼마다 mmap 컬럼을 chunk 행씩 잘라 파이썬 값으로 변환 → 메모리는 심볼 수 × chunk 로 제한
+"""
+from __future__ import annotations
+import heapq
+import json
+import mmap
+import os
+from array import array
+from itertools import repeat
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 memoryview 폴백
+    np = None  # type: ignore
+
+__all__ = ["COLUMNS", "TickColumns", "TickRecorder", "TickStore"]
+
+# (확장자, array typecode, numpy dtype)
+COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("ts", "q", "<i8"),
+    ("px", "d", "<f8"),
+    ("vol", "i", "<i4"),
+    ("side", "b", "i1"),
+)
+_INDEX = "index.json"
+_NS = 1_000_000_000
+_CHUNK = 65536   # iter_snapshots 가 한 번에 파이썬 값으로 바꾸는 심볼당 행 수
+_I32_MAX = 2**31 - 1
+
+
+def _field(val: Any, key: str) -> Any:
+    if isinstance(val, dict):
+        return val.get(key)
+    return getattr(val, key, None)
+
+
+def _day_of(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y%m%d")
+
+
+def _side_of(val: Any) -> int:
+    s = _field(val, "side")
+    if isinstance(s, str):
+        s = s.upper()
+        return 1 if s in ("BUY", "B", "+") else -1 if s in ("SELL", "S", "-") else 0
+    if isinstance(s, (int, float)):
+        return (s > 0) - (s < 0)
+    b, sv = _field(val, "buy_vol"), _field(val, "sell_vol")
+    if b is not None and sv is not None:
+        return (b > sv) - (b < sv)
+    return 0
+
+
+class _SymBuf:
+    __slots__ = ("ts", "px", "vol", "side")
+
+    def __init__(self) -> None:
+        self.ts = array("q")
+        self.px = array("d")
+        self.vol = array("i")
+        self.side = array("b")
+
+
+class TickRecorder:
+    def __init__(self, root: str, flush_rows: int = 65536) -> None:
+        self.root = root
+        self.flush_rows = max(1, int(flush_rows))
+        self._bufs: Dict[Tuple[str, str], _SymBuf] = {}   # (day, symbol) → 버퍼
+        self._pending = 0
+        self._index: Dict[str, Dict[str, Dict[str, int]]] = {}  # day → sym → {rows, first_ts, last_ts}
+        self._day_cache: Tuple[int, str] = (-1, "")        # (epoch 초, day) — 같은 초면 날짜 변환 생략
+        self.rows = 0
+        self.flushes = 0
+
+    # ---------- 기록 ----------
+    def record(self, symbol: str, ts: float, price: float, volume: float = 0.0, side: int = 0) -> None:
+        sec = int(ts)
+        if sec != self._day_cache[0]:
+            self._day_cache = (sec, _day_of(ts))
+        key = (self._day_cache[1], symbol)
+        b = self._bufs.get(key)
+        if b is None:
+            b = self._bufs[key] = _SymBuf()
+        b.ts.append(int(round(ts * _NS)))
+        b.px.append(float(price))
+        b.vol.append(min(_I32_MAX, max(0, int(volume or 0))))
+        b.side.append(side)
+        self._pending += 1
+        self.rows += 1
+        if self._pending >= self.flush_rows:
+            self.flush()
+
+    def record_snapshot(self, ts: float, snapshot: Dict[str, Any]) -> int:
+        """Hub snapshot {sym: price | {"price", "volume", ...} | Tick} 기록. 반환: 기록한 행 수"""
+        n = 0
+        for sym, val in snapshot.items():
+            if isinstance(val, (int, float)):
+                self.record(sym, ts, float(val))
+            else:
+                p = _field(val, "price")
+                if p is None:
+                    continue
+                vol = _field(val, "volume")
+                if vol is None:
+                    vol = _field(val, "curr_vol")
+                self.record(sym, ts, float(p), vol or 0, _side_of(val))
+            n += 1
+        return n
+
+    def record_tick(self, tick: Any) -> None:
+        """PriceFeedMock 류 Tick 객체(.symbol/.price/.ts/.volume)"""
+        self.record(tick.symbol, float(getattr(tick, "ts", 0.0)), float(tick.price),
+                    getattr(tick, "volume", 0) or 0, _side_of(tick))
+
+    # ---------- 디스크 ----------
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        touched = set()
+        for (day, sym), b in self._bufs.items():
+            n = len(b.ts)
+            if not n:
+                continue
+            d = os.path.join(self.root, day)
+            os.makedirs(d, exist_ok=True)
+            idx = self._day_index(day).setdefault(sym, {"rows": 0, "first_ts": b.ts[0], "last_ts": 0})
+            idx["rows"] += n
+            idx["last_ts"] = b.ts[-1]
+            # ts 를 마지막에 씀 → 중간 크래시 때 리더는 가장 짧은 컬럼(ts) 길이까지만 읽음
+            for ext, _, _ in reversed(COLUMNS):
+                col = getattr(b, ext)
+                with open(os.path.join(d, f"{sym}.{ext}"), "ab") as fh:
+                    col.tofile(fh)
+                del col[:]
+            touched.add(day)
+        self._bufs.clear()
+        self._pending = 0
+        self.flushes += 1
+        for day in touched:
+            self._write_index(day)
+
+    def _day_index(self, day: str) -> Dict[str, Dict[str, int]]:
+        ix = self._index.get(day)
+        if ix is None:
+            ix = self._index[day] = _read_index(os.path.join(self.root, day)).get("symbols", {})
+        return ix
+
+    def _write_index(self, day: str) -> None:
+        d = os.path.join(self.root, day)
+        tmp = os.path.join(d, _INDEX + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": 1, "columns": {e: dt for e, _, dt in COLUMNS},
+                       "symbols": self._index[day]}, fh, ensure_ascii=False)
+        os.replace(tmp, os.path.join(d, _INDEX))
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "TickRecorder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _read_index(d: str) -> Dict[str, Any]:
+    p = os.path.join(d, _INDEX)
+    if not os.path.exists(p):
+        return {}
+    with open(p, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+@dataclass
+class TickColumns:
+    """심볼 하루치 컬럼 (NumPy 있으면 np.memmap 뷰, 없으면 memoryview) — 파일을 복사하지 않음"""
+    symbol: str
+    ts: Any       # int64 epoch ns
+    price: Any    # float64
+    volume: Any   # int32
+    side: Any     # int8
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+class TickStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._maps: List[mmap.mmap] = []   # 폴백 경로의 열린 mmap (close 에서 해제)
+
+    def days(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.exists(os.path.join(self.root, d, _INDEX)))
+
+    def index(self, day: str) -> Dict[str, Dict[str, int]]:
+        return _read_index(os.path.join(self.root, day)).get("symbols", {})
+
+    def symbols(self, day: str) -> List[str]:
+        return sorted(self.index(day))
+
+    def _map(self, path: str, code: str, dtype: str, n: int) -> Any:
+        if n == 0:
+            return np.empty(0, dtype=dtype) if np is not None else memoryview(array(code))
+        if np is not None:
+            return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+        with open(path, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mm)
+        return memoryview(mm)[:n * array(code).itemsize].cast(code)
+
+    def columns(self, day: str, symbol: str) -> TickColumns:
+        d = os.path.join(self.root, day)
+        paths = {ext: os.path.join(d, f"{symbol}.{ext}") for ext, _, _ in COLUMNS}
+        if not os.path.exists(paths["ts"]):
+            raise RuntimeError(f"틱 데이터가 없습니다: {day}/{symbol}")
+        # 컬럼 길이가 어긋나면(기록 중 크래시) 가장 짧은 컬럼까지만 유효
+        n = min(os.path.getsize(paths[ext]) // array(code).itemsize
+                if os.path.exists(paths[ext]) else 0 for ext, code, _ in COLUMNS)
+        cols = [self._map(paths[ext], code, dt, n) for ext, code, dt in COLUMNS]
+        return TickColumns(symbol, *cols)
+
+    def iter_snapshots(self, day: str, symbols: Optional[Sequence[str]] = None, chunk: int = _CHUNK
+                       ) -> Iterator[Tuple[float, Dict[str, Dict[str, Any]]]]:
+        """심볼 스트림을 ts 순으로 병합 → (ts 초, {sym: {"price","volume","side"}})
+        각 심볼은 chunk 행 단위로만 tolist (하루치 전체를 미리 파이썬 리스트로 만들지 않음)"""
+        cols = [self.columns(day, s) for s in (symbols or self.symbols(day))]
+        step = max(1, int(chunk))
+
+        def _stream(c: TickColumns) -> Iterator[Tuple[int, str, float, int, int]]:
+            for i in range(0, len(c), step):
+                j = i + step
+                yield from zip(c.ts[i:j].tolist(), repeat(c.symbol), c.price[i:j].tolist(),
+                               c.volume[i:j].tolist(), c.side[i:j].tolist())
+
+        cur: Optional[int] = None
+        snap: Dict[str, Dict[str, Any]] = {}
+        for t, sym, px, vol, side in heapq.merge(*map(_stream, cols), key=lambda r: r[0]):
+            if t != cur:
+                if snap:
+                    yield cur / _NS, snap
+                cur, snap = t, {}
+            snap[sym] = {"price": px, "volume": float(vol), "side": side}
+        if snap:
+            yield cur / _NS, snap
+
+    def close(self) -> None:
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:  # 아직 살아 있는 memoryview 가 있으면 GC 때 해제
+                pass
+        self._maps.clear()
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+market/volume_baseline.py — 심볼별 롤링 거래량 기준선 (volume_surge 의 avg_vol 자체 산출)
+
+- 장중 시간대 버킷(bucket_sec, 기본 5분) × 심볼 곡선: 일자별 버킷 평균 틱 거래량의 일간 EWMA (day_alpha)
+- 장중 EWMA: 심볼별 틱 거래량 지수평균 (span 틱) — 곡선을 아직 학습하지 못한 버킷/심볼의 기준선
+- baseline(sym, ts) = 그 버킷 곡선값 (학습 일수 > 0) 아니면 장중 EWMA → 현재 틱 반영 전 값 (자기 자신 미포함)
+- 저장: 심볼 id 인턴 + 심볼 우선 평면 array 컬럼 (curve float32 / days uint16 / 당일 합 float64 / 당일 건수 uint32)
+  틱당 갱신·조회 O(1), 일자가 바뀌면 당일 누적을 곡선에 접어 넣음(roll_day, NumPy 있으면 벡터 연산)
+- save/load: 헤더 + 심볼 JSON + 원시 컬럼 + crc32 단일 파일 (tmp → fsync → os.replace), 다음 날 이어서 사용
+- enrich(snapshot, ts): 거래량이 있는 심볼에 avg_vol 을 붙인 새 snapshot (상위의 avg_vol/volume_avg 는 유지)
+
+사용:
+    vb = VolumeBaseline.load("logs/volume_baseline.vbl") or VolumeBaseline()
+    hub.on_tick(vb.enrich(snapshot, time.time()))
+    vb.save("logs/volume_baseline.vbl")
+"""
+from __future__ import annotations
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 roll_day 는 순수 파이썬 루프
+    np = None  # type: ignore
+
+__all__ = ["VolumeBaselineConfig", "VolumeBaseline"]
+
+MAGIC = b"VBSL"
+VERSION = 1
+_HDR = struct.Struct("<4sHHII")   # magic, version, flags, 심볼 수, 블롭 수
+_U32 = struct.Struct("<I")
+# (컬럼명, typecode) — 심볼 우선 평면 배열, 버킷 컬럼은 심볼당 n_buckets 칸
+_BUCKET_COLS = (("curve", "f"), ("days", "H"), ("today_sum", "d"), ("today_cnt", "I"))
+_SYMBOL_COLS = (("ewma", "d"), ("ticks", "I"))
+
+
+@dataclass
+class VolumeBaselineConfig:
+    bucket_sec: int = 300
+    open_sec: int = 9 * 3600           # 장 시작 (자정 기준 초, 현지 시각)
+    close_sec: int = 15 * 3600 + 1800  # 장 종료
+    day_alpha: float = 0.3             # 일간 곡선 EWMA 가중 (새 날)
+    span: int = 100                    # 장중 틱 EWMA 기간
+
+    @property
+    def n_buckets(self) -> int:
+        return max(1, -(-(self.close_sec - self.open_sec) // self.bucket_sec))
+
+
+def _volume_of(val: Any) -> Optional[float]:
+    if isinstance(val, dict):
+        v = val.get("curr_vol")
+        if v is None:
+            v = val.get("volume")
+    elif isinstance(val, (int, float)):
+        return None
+    else:
+        v = getattr(val, "curr_vol", None)
+        if v is None:
+            v = getattr(val, "volume", None)
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class VolumeBaseline:
+    def __init__(self, config: Optional[VolumeBaselineConfig] = None) -> None:
+        self.cfg = c = config or VolumeBaselineConfig()
+        if c.bucket_sec <= 0 or c.close_sec <= c.open_sec or not 0.0 < c.day_alpha <= 1.0 or c.span < 1:
+            raise RuntimeError(f"거래량 기준선 설정이 잘못되었습니다: {c}")
+        self.n_buckets = c.n_buckets
+        self._alpha = 2.0 / (c.span + 1)
+        self._ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        for name, code in _BUCKET_COLS + _SYMBOL_COLS:
+            setattr(self, name, array(code))
+        self.day = ""                      # 당일 누적이 속한 일자 (YYYYMMDD)
+        self._day_start = 0.0              # 당일 자정 epoch (같은 날이면 날짜 변환 생략)
+        self.rolls = 0
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    # ---------- 인턴 ----------
+    def intern(self, symbol: str) -> int:
+        i = self._ids.get(symbol)
+        if i is None:
+            i = len(self.symbols)
+            self._ids[symbol] = i
+            self.symbols.append(symbol)
+            for name, code in _BUCKET_COLS:
+                getattr(self, name).extend(array(code, [0]) * self.n_buckets)
+            self.ewma.append(0.0)
+            self.ticks.append(0)
+        return i
+
+    # ---------- 시각 → 버킷 ----------
+    def _bucket(self, ts: float) -> int:
+        """ts 의 장중 버킷 (장 전/후는 첫/마지막 버킷). 일자가 바뀌면 roll_day"""
+        off = ts - self._day_start
+        if not 0.0 <= off < 86400.0:
+            lt = time.localtime(ts)
+            day = time.strftime("%Y%m%d", lt)
+            self._day_start = ts - (lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec) - (ts % 1.0)
+            if day != self.day:
+                if self.day:
+                    self.roll_day()
+                self.day = day
+            off = ts - self._day_start
+        b = int((off - self.cfg.open_sec) // self.cfg.bucket_sec)
+        return 0 if b < 0 else b if b < self.n_buckets else self.n_buckets - 1
+
+    # ---------- 조회/갱신 ----------
+    def baseline(self, symbol: str, ts: float) -> float:
+        """현재 기준 평균 틱 거래량 (모르면 0.0 → volume_surge 0)"""
+        i = self._ids.get(symbol)
+        if i is None:
+            return 0.0
+        k = i * self.n_buckets + self._bucket(ts)
+        return float(self.curve[k]) if self.days[k] else self.ewma[i]
+
+    def update(self, symbol: str, ts: float, volume: float) -> float:
+        """틱 거래량 반영. 반환: 반영 전 기준선 (현재 틱의 surge 분모)"""
+        i = self.intern(symbol)
+        k = i * self.n_buckets + self._bucket(ts)
+        base = float(self.curve[k]) if self.days[k] else self.ewma[i]
+        v = volume if volume > 0 else 0.0
+        self.today_sum[k] += v
+        self.today_cnt[k] += 1
+        if self.ticks[i]:
+            self.ewma[i] += self._alpha * (v - self.ewma[i])
+        else:
+            self.ewma[i] = v
+        if self.ticks[i] < 0xFFFFFFFF:
+            self.ticks[i] += 1
+        return base
+
+    def enrich(self, snapshot: Dict[str, Any], ts: float) -> Dict[str, Any]:
+        """거래량이 있는 심볼에 avg_vol(반영 전 기준선) 을 붙인 새 snapshot (입력 dict 는 수정하지 않음)"""
+        out: Dict[str, Any] = {}
+        for sym, val in snapshot.items():
+            vol = _volume_of(val)
+            if vol is None:
+                out[sym] = val
+                continue
+            base = self.update(sym, ts, vol)
+            if base <= 0 or (isinstance(val, dict) and (val.get("avg_vol") or val.get("volume_avg"))):
+                out[sym] = val
+                continue
+            if isinstance(val, dict):
+                tick = dict(val)
+            else:
+                tick = {k: getattr(val, k) for k in ("price", "volume", "curr_vol", "buy_vol", "sell_vol",
+                                                     "fast", "slow") if getattr(val, k, None) is not None}
+            tick["avg_vol"] = base
+            out[sym] = tick
+        return out
+
+    # ---------- 일자 경계 ----------
+    def roll_day(self) -> None:
+        """당일 버킷 평균을 곡선에 EWMA 로 접어 넣고 당일 누적 초기화 (거래가 없던 버킷은 곡선 유지)"""
+        a = self.cfg.day_alpha
+        if np is not None and len(self.curve):
+            curve = np.frombuffer(self.curve, dtype=np.float32)
+            days = np.frombuffer(self.days, dtype=np.uint16)
+            tsum = np.frombuffer(self.today_sum, dtype=np.float64)
+            tcnt = np.frombuffer(self.today_cnt, dtype=np.uint32)
+            seen = tcnt > 0
+            mean = np.where(seen, tsum / np.maximum(tcnt, 1), 0.0)
+            curve[:] = np.where(seen, np.where(days > 0, (1.0 - a) * curve + a * mean, mean), curve)
+            days[:] = np.where(seen & (days < 0xFFFF), days + 1, days)
+            tsum[:] = 0.0
+            tcnt[:] = 0
+        else:
+            for k in range(len(self.curve)):
+                n = self.today_cnt[k]
+                if n:
+                    mean = self.today_sum[k] / n
+                    self.curve[k] = (1.0 - a) * self.curve[k] + a * mean if self.days[k] else mean
+                    self.days[k] = min(0xFFFF, self.days[k] + 1)
+                    self.today_sum[k] = 0.0
+                    self.today_cnt[k] = 0
+        self.rolls += 1
+
+    # ---------- 저장/복원 ----------
+    def encode(self) -> bytes:
+        meta = json.dumps({"config": asdict(self.cfg), "day": self.day, "symbols": self.symbols},
+                          ensure_ascii=False).encode("utf-8")
+        cols = _BUCKET_COLS + _SYMBOL_COLS
+        out = bytearray(_HDR.pack(MAGIC, VERSION, 0, len(self.symbols), 1 + len(cols)))
+        for blob in [meta] + [getattr(self, name).tobytes() for name, _ in cols]:
+            out += _U32.pack(len(blob))
+            out += blob
+        out += _U32.pack(zlib.crc32(out))
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "VolumeBaseline":
+        if len(data) < _HDR.size + _U32.size or zlib.crc32(data[:-_U32.size]) != _U32.unpack_from(data, len(data) - _U32.size)[0]:
+            raise RuntimeError("거래량 기준선 파일이 손상되었습니다 (crc 불일치)")
+        magic, ver, _flags, n, nblob = _HDR.unpack_from(data, 0)
+        if magic != MAGIC or ver != VERSION:
+            raise RuntimeError(f"거래량 기준선 형식이 다릅니다: magic={magic!r} version={ver}")
+        off, blobs = _HDR.size, []
+        for _ in range(nblob):
+            (size,) = _U32.unpack_from(data, off)
+            off += _U32.size
+            blobs.append(data[off:off + size])
+            off += size
+        meta = json.loads(blobs[0].decode("utf-8"))
+        vb = cls(VolumeBaselineConfig(**meta["config"]))
+        vb.symbols = list(meta["symbols"])
+        vb._ids = {s: i for i, s in enumerate(vb.symbols)}
+        vb.day = meta["day"]
+        for (name, code), blob in zip(_BUCKET_COLS + _SYMBOL_COLS, blobs[1:]):
+            col = getattr(vb, name)
+            col.frombytes(blob)
+            want = n * (vb.n_buckets if (name, code) in _BUCKET_COLS else 1)
+            if len(col) != want:
+                raise RuntimeError(f"거래량 기준선 컬럼 길이 불일치: {name} {len(col)} != {want}")
+        return vb
+
+    def save(self, path: str) -> int:
+        data = self.encode()
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        return len(data)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["VolumeBaseline"]:
+        """없으면 None, 손상/버전 불일치는 RuntimeError. 저장 일자의 당일 누적은 다음 틱의 일자 전환 때 곡선에 반영"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as fh:
+            return cls.decode(fh.read())
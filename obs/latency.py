@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# obs/latency.py
+"""
+단계별 지연 시간 히스토그램 (log-linear 고정 버킷)
+
+- LatencyHistogram: ns 정수 기록. 2의 거듭제곱 구간마다 32개 선형 하위 버킷(상대오차 ≈3%)
+  버킷 수 고정(1216) → 기록 O(1), 메모리 고정, p50/p99/max 조회는 요약 시 1회 스캔
+- StageLatency: Hub 단계(context/exit/score/risk/route/tick)별 히스토그램 묶음
+  enabled=False 면 Hub 쪽은 `if lat is not None` 분기 하나만 남음 (타이머 호출 없음)
+"""
+from __future__ import annotations
+from array import array
+from time import perf_counter_ns
+from typing import Dict, Iterable, Optional
+
+__all__ = ["LatencyHistogram", "StageLatency", "HUB_STAGES", "perf_counter_ns"]
+
+_SUB_BITS = 6
+_SUB = 1 << _SUB_BITS          # 0~63 ns 는 1ns 단위
+_HALF = _SUB >> 1              # 이후 구간마다 32개 버킷
+_MAX_EXP = 36                  # 2^42 ns(≈73분)까지, 초과분은 마지막 버킷
+_N_BUCKETS = _SUB + _MAX_EXP * _HALF
+
+HUB_STAGES = ("context", "exit", "score", "risk", "route", "tick")
+
+
+def _index(v: int) -> int:
+    if v < _SUB:
+        return v if v > 0 else 0
+    e = v.bit_length() - _SUB_BITS
+    if e > _MAX_EXP:
+        return _N_BUCKETS - 1
+    return _SUB + (e - 1) * _HALF + ((v >> e) - _HALF)
+
+
+def _bucket_mid(i: int) -> float:
+    """버킷 대표값(구간 중앙)"""
+    if i < _SUB:
+        return float(i)
+    e = (i - _SUB) // _HALF + 1
+    lo = ((i - _SUB) % _HALF + _HALF) << e
+    return lo + ((1 << e) - 1) / 2.0
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "max", "min")
+
+    def __init__(self) -> None:
+        self.counts = array("q", bytes(8 * _N_BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.min = 0
+
+    def record(self, ns: int) -> None:
+        self.counts[_index(ns)] += 1
+        if self.count == 0 or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def percentile(self, q: float) -> float:
+        """q(0~100) 백분위수 [ns]. 버킷 중앙값이며 관측 max를 넘지 않음."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(self.count * q / 100.0)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    return min(max(_bucket_mid(i), float(self.min)), float(self.max))
+        return float(self.max)
+
+    def summary_dict(self) -> Dict[str, float]:
+        """µs 단위 요약"""
+        n = self.count
+        return {
+            "count": n,
+            "p50_us": round(self.percentile(50) / 1e3, 3),
+            "p99_us": round(self.percentile(99) / 1e3, 3),
+            "max_us": round(self.max / 1e3, 3),
+            "mean_us": round(self.total / n / 1e3, 3) if n else 0.0,
+        }
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """다른 히스토그램 누적 (버킷 구성이 같으므로 카운트 합산)"""
+        if not other.count:
+            return
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self) -> None:
+        for i in range(_N_BUCKETS):
+            self.counts[i] = 0
+        self.count = self.total = self.max = self.min = 0
+
+
+class StageLatency:
+    """
+    단계별 히스토그램 묶음.
+    사용 (호출부):
+        lat = self.latency.active()          # 비활성이면 None
+        if lat is not None: t0 = perf_counter_ns()
+        ...
+        if lat is not None: lat.record("exit", perf_counter_ns() - t0)
+    """
+
+    def __init__(self, stages: Iterable[str] = HUB_STAGES, enabled: bool = False) -> None:
+        self.enabled = bool(enabled)
+        self.stages: Dict[str, LatencyHistogram] = {s: LatencyHistogram() for s in stages}
+
+    def active(self) -> Optional["StageLatency"]:
+        return self if self.enabled else None
+
+    def record(self, stage: str, ns: int) -> None:
+        h = self.stages.get(stage)
+        if h is None:
+            h = self.stages[stage] = LatencyHistogram()
+        h.record(ns)
+
+    def percentiles(self, stage: str) -> Dict[str, float]:
+        h = self.stages.get(stage)
+        return h.summary_dict() if h is not None else LatencyHistogram().summary_dict()
+
+    def summary_dict(self) -> Dict[str, Dict[str, float]]:
+        """기록이 있는 단계만 {stage: {count, p50_us, p99_us, max_us, mean_us}}"""
+        return {s: h.summary_dict() for s, h in self.stages.items() if h.count}
+
+    def reset(self) -> None:
+        for h in self.stages.values():
+            h.reset()
@@ -5,6 +5,7 @@ KiwoomAdapter v1 (order/adapters/kiwoom.py)
 - 우선 DRY_RUN(모의) 완전 동작
 - REAL 모드는 OpenAPI 연동 TODO로 남김(로그/스켈레톤 제공)
 - router.set_mode() → set_dry_run()/set_budget() 통해 모드/예산 동기화
+- 레이트리밋: 토큰 버킷(주문/취소/조회 분리), sleep 없이 RATE_LIMITED + raw["retry_after"] 반환
 """
 from __future__ import annotations
 import time
@@ -13,6 +14,8 @@ import threading
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 
+from order.ratelimit import RateLimiter, TokenBucket, ORDER, CANCEL, QUERY
+
 # ===== 공통 타입 =====
 @dataclass
 class OrderResult:
@@ -34,12 +37,18 @@ class KiwoomAdapter:
     - dry_run=False : Kiwoom OpenAPI+ 연동 (TODO: QAxWidget 이벤트/조회/주문)
     """
 
-    def __init__(self, account_no: str, dry_run: bool = True, logger=None, rate_limit_ms: int = 120):
+    def __init__(self, account_no: str, dry_run: bool = True, logger=None, rate_limit_ms: int = 120,
+                 limiter: Optional[RateLimiter] = None):
         self.account_no = account_no
         self.dry_run = bool(dry_run)
         self.logger = logger or self._get_default_logger()
         self.rate_limit_ms = int(rate_limit_ms)
-        self._rl_lock = threading.Lock()
+        # limiter 미지정: rate_limit_ms 간격(버스트 1)과 같은 속도의 토큰 버킷
+        if limiter is None:
+            rate = 1000.0 / max(1, self.rate_limit_ms)
+            limiter = RateLimiter({k: TokenBucket(rate, 1.0) for k in (ORDER, CANCEL, QUERY)})
+        self.limiter = limiter
+        self._acct_lock = threading.Lock()  # 현금/포지션 갱신 (라우터가 심볼별로 병렬 호출)
 
         # 내부 상태 (DRY_RUN용)
         self._connected = False
@@ -60,10 +69,16 @@ class KiwoomAdapter:
             def debug(self, *a, **k): print("[DEBUG]", *a)
         return _L()
 
-    def _rate_limit(self):
-        """간단한 주문/조회 레이트리미트 (쓰로틀링)."""
-        with self._rl_lock:
-            time.sleep(self.rate_limit_ms / 1000.0)
+    def _rate_limit(self, kind: str = ORDER) -> float:
+        """용도별 토큰 차감. 0.0=통과, 양수=토큰 부족(재시도까지 남은 초). sleep 하지 않음"""
+        return self.limiter.acquire(kind)
+
+    def _rate_limited(self, wait: float) -> OrderResult:
+        return OrderResult(False, None, "RATE_LIMITED", raw={"retry_after": wait})
+
+    def set_rate_limiter(self, limiter: RateLimiter) -> None:
+        """OrderRouter 가 설정 기반 리미터(키움 TR 제한)를 주입"""
+        self.limiter = limiter
 
     # ===== 모드/예산 동기화 (OrderRouter.set_mode에서 호출) =====
     def set_dry_run(self, v: bool) -> None:
@@ -111,7 +126,7 @@ class KiwoomAdapter:
         self.ensure_ready()
         if self.dry_run:
             return int(self._cash)
-        # TODO: Kiwoom 계좌조회 TR (ex: opw00001) 처리 후 반환
+        # TODO: Kiwoom 계좌조회 TR (ex: opw00001) 처리 후 반환 (전송 전 self._rate_limit(QUERY) 확인)
         self.logger.info("[KiwoomAdapter] REAL get_cash TODO")
         return 0
 
@@ -144,14 +159,17 @@ class KiwoomAdapter:
         if qty <= 0:
             return OrderResult(False, None, "qty must be > 0")
 
-        self._rate_limit()
+        wait = self._rate_limit(ORDER)
+        if wait > 0:
+            return self._rate_limited(wait)
 
         if self.dry_run:
             oid = self._gen_order_id()
             fill_price = self._simulate_fill_price(symbol, price, order_type)
             # 체결/현금/포지션 반영
             try:
-                self._apply_fill(symbol, side, qty, fill_price)
+                with self._acct_lock:
+                    self._apply_fill(symbol, side, qty, fill_price)
             except Exception as e:
                 return OrderResult(False, None, str(e))
             od = {
@@ -174,7 +192,9 @@ class KiwoomAdapter:
 
     def cancel_order(self, order_id: str) -> OrderResult:
         self.ensure_ready()
-        self._rate_limit()
+        wait = self._rate_limit(CANCEL)
+        if wait > 0:
+            return self._rate_limited(wait)
         if self.dry_run:
             od = self._orders.get(order_id)
             if not od:
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+LobAdapter (order/adapters/lob.py) — 로컬 LOB 매칭 엔진 기반 DRY_RUN 브로커
+
+- KiwoomAdapter 와 같은 인터페이스 (connect/place_order/cancel_order/get_cash/get_positions ...)
+- 체결가/체결량은 order/matching.MatchingEngine 이 테이프(on_market 으로 받은 틱)로 결정
+  → KiwoomAdapter DRY_RUN 의 고정 체결가(10.0) 대신 실제 호가/거래량 기반
+- OrderRouter.market_feed 로 Hub 와 같은 snapshot 을 받는다 (Hub.on_tick 시작 시 전달)
+- 지정가 대기 주문의 이후 체결은 poll_fills() 로 조회
+- 레이트리밋 없음 (리플레이 속도 제한 방지) — set_rate_limiter 미지원
+"""
+from __future__ import annotations
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from order.adapters.kiwoom import OrderResult, Position
+from order.matching import Fill, MatchingEngine
+
+
+class LobAdapter:
+    def __init__(self, account_no: str = "", dry_run: bool = True, logger=None,
+                 market_ioc: bool = True, cash: float = 100_000_000, **_ignored: Any):
+        self.account_no = account_no
+        self.dry_run = True  # 항상 시뮬레이션
+        self.logger = logger
+        self.engine = MatchingEngine(market_ioc=market_ioc)
+        self._lock = threading.Lock()
+        self._connected = False
+        self._cash = float(cash)
+        self._positions: Dict[str, Position] = {}
+        self._fills: List[Fill] = []   # 접수 이후(대기 주문) 체결 — poll_fills 로 꺼냄
+
+    def _log(self, msg: str) -> None:
+        if self.logger:
+            self.logger.info(msg)
+
+    # ===== 모드/예산 =====
+    def set_dry_run(self, v: bool) -> None:
+        if not v:
+            self._log("[LobAdapter] REAL 모드 미지원 — 시뮬레이션 유지")
+
+    def set_budget(self, budget: float) -> None:
+        try:
+            b = float(budget)
+        except Exception:
+            b = 0.0
+        if b > 0:
+            self._cash = b
+
+    # ===== 라이프사이클 =====
+    def connect(self) -> bool:
+        self._connected = True
+        return True
+
+    def ensure_ready(self) -> None:
+        if not self._connected:
+            raise RuntimeError("LobAdapter not connected")
+
+    def close(self) -> None:
+        self._connected = False
+
+    # ===== 계좌/포지션 =====
+    def get_cash(self) -> int:
+        return int(self._cash)
+
+    def get_positions(self) -> List[Position]:
+        return list(self._positions.values())
+
+    # ===== 테이프 =====
+    def on_market(self, snapshot: Dict[str, Any]) -> List[Fill]:
+        """Hub 와 같은 틱 snapshot 입력 → 대기 주문 체결 반영"""
+        with self._lock:
+            fills = self.engine.on_snapshot(snapshot)
+            if fills:
+                for f in fills:
+                    self._apply_fill(f)
+                self._fills.extend(fills)
+        return fills
+
+    def poll_fills(self) -> List[Fill]:
+        with self._lock:
+            out, self._fills = self._fills, []
+        return out
+
+    # ===== 주문 =====
+    def place_order(self, symbol: str, side: str, qty: int, price: Optional[float] = None,
+                    order_type: str = "MKT", user_tag: Optional[str] = None) -> OrderResult:
+        self.ensure_ready()
+        side = side.upper()
+        if side not in ("BUY", "SELL"):
+            return OrderResult(False, None, f"invalid side: {side}")
+        if qty <= 0:
+            return OrderResult(False, None, "qty must be > 0")
+        ot = (order_type or "MKT").upper()
+        if ot != "MKT" and price is None:
+            return OrderResult(False, None, "LMT order requires price")
+        with self._lock:
+            bid, ask, last = self.engine.quote(symbol)
+            if side == "BUY":
+                ref = price if ot != "MKT" else (ask if ask is not None else last)
+                if ref is not None and ref * qty > self._cash:
+                    return OrderResult(False, None, "not enough cash")
+            else:
+                pos = self._positions.get(symbol)
+                if pos is None or pos.qty < qty:
+                    return OrderResult(False, None, "not enough position to sell")
+            oid = uuid.uuid4().hex[:16]
+            o, fills = self.engine.submit(oid, symbol, side, qty, price, ot, user_tag)
+            for f in fills:
+                self._apply_fill(f)
+        raw = {"symbol": symbol, "side": side, "qty": o.filled, "price": o.avg_price,
+               "order_qty": o.qty, "remaining": o.remaining, "status": o.status, "user_tag": user_tag}
+        if o.status == "CANCELED":  # IOC 시장가인데 유동성 없음
+            return OrderResult(False, oid, "NO_LIQUIDITY", raw=raw)
+        return OrderResult(True, oid, o.status, raw=raw)
+
+    def cancel_order(self, order_id: str) -> OrderResult:
+        self.ensure_ready()
+        with self._lock:
+            o = self.engine.cancel(order_id)
+        if o is None:
+            return OrderResult(False, None, f"not cancelable: {order_id}")
+        return OrderResult(True, order_id, o.status,
+                           raw={"symbol": o.symbol, "qty": o.filled, "remaining": o.remaining})
+
+    # ===== 내부 =====
+    def _apply_fill(self, f: Fill) -> None:
+        pos = self._positions.get(f.symbol)
+        if f.side == "BUY":
+            self._cash -= f.qty * f.price
+            if pos:
+                n = pos.qty + f.qty
+                pos.avg_price = (pos.avg_price * pos.qty + f.price * f.qty) / n
+                pos.qty = n
+            else:
+                self._positions[f.symbol] = Position(f.symbol, f.qty, f.price)
+        else:
+            self._cash += f.qty * f.price
+            if pos:
+                pos.qty -= f.qty
+                if pos.qty <= 0:
+                    del self._positions[f.symbol]
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+order/journal.py — 주문/체결 WAL(write-ahead log) 저널 + 그룹 커밋 fsync + 복구 리더
+
+파일 형식 (리틀엔디언):
+  헤더 : b"OJNL" + u16 version
+  레코드: u16 길이(=_REC.size) + 고정 크기 payload + u32 crc32(payload)   → 모든 레코드 같은 크기
+  payload: kind(u8) seq(u64) ts(f64) intent_id(u64) side(u8) qty(i64) price(f64) symbol(16s) order_id(24s)
+
+- append(): 메모리 버퍼에 pack 만 하고 반환 (syscall 없음)
+- 그룹 커밋: flush_records 건이 쌓이면 즉시, 아니면 flusher 스레드가 flush_interval_ms 마다 write+fsync
+- read_journal(): 잘린 꼬리(크래시 중 부분 기록)는 길이/crc 로 감지해 거기서 멈춤
+- recover(): FILL 레코드로 포지션(수량/평단) 재구성 + 종결되지 않은 의도 목록
+            (after_seq 지정 시 체크포인트 이후 레코드만 재적용)
+"""
+from __future__ import annotations
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+__all__ = ["INTENT", "ACK", "FILL", "REJECT", "CANCEL",
+           "JournalRecord", "OrderJournal", "read_journal", "recover", "Recovery"]
+
+MAGIC = b"OJNL"
+VERSION = 1
+_HDR = struct.Struct("<4sH")
+_REC = struct.Struct("<BQdQBqd16s24s")
+_LEN = struct.Struct("<H")
+_CRC = struct.Struct("<I")
+FRAME = _LEN.size + _REC.size + _CRC.size
+
+INTENT, ACK, FILL, REJECT, CANCEL = 1, 2, 3, 4, 5
+KIND_NAMES = {INTENT: "INTENT", ACK: "ACK", FILL: "FILL", REJECT: "REJECT", CANCEL: "CANCEL"}
+_SIDES = {"": 0, "BUY": 1, "SELL": 2}
+_SIDE_NAMES = {v: k for k, v in _SIDES.items()}
+
+
+@dataclass
+class JournalRecord:
+    kind: int
+    seq: int
+    ts: float
+    intent_id: int
+    side: str
+    qty: int
+    price: float
+    symbol: str
+    order_id: str
+
+
+class OrderJournal:
+    def __init__(self, path: str, flush_interval_ms: float = 5.0, flush_records: int = 64,
+                 fsync: bool = True) -> None:
+        self.path = path
+        self.flush_interval = max(0.0, float(flush_interval_ms)) / 1000.0
+        self.flush_records = max(1, int(flush_records))
+        self.fsync = bool(fsync)
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        # 기존 파일이면 유효 구간 끝으로 잘라 이어쓰기 (잘린 꼬리 제거)
+        valid_end, self.seq, self.last_intent_id = _scan_tail(path)
+        self._fh = open(path, "r+b" if valid_end else "wb")
+        if valid_end:
+            self._fh.truncate(valid_end)
+            self._fh.seek(valid_end)
+        else:
+            self._fh.write(_HDR.pack(MAGIC, VERSION))
+            self._fh.flush()
+        self._buf = bytearray()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._cv = threading.Condition(self._lock)
+        self._closed = False
+        # ---- 메트릭
+        self.records = 0
+        self.commits = 0      # write+fsync 횟수 (레코드 수 / commits = 평균 그룹 크기)
+        self._flusher: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._flusher = threading.Thread(target=self._run, name="journal-flush", daemon=True)
+            self._flusher.start()
+
+    # ---------- 기록 ----------
+    def append(self, kind: int, symbol: str, side: str = "", qty: int = 0, price: float = 0.0,
+               intent_id: int = 0, order_id: Optional[str] = None, ts: Optional[float] = None) -> int:
+        """레코드 1건 버퍼링. 반환: seq"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"닫힌 저널에 기록할 수 없습니다: {self.path}")
+            self.seq += 1
+            payload = _REC.pack(kind, self.seq, time.time() if ts is None else ts, intent_id,
+                                _SIDES.get(side, 0), int(qty), float(price or 0.0),
+                                symbol.encode("utf-8")[:16], (order_id or "").encode("utf-8")[:24])
+            self._buf += _LEN.pack(_REC.size)
+            self._buf += payload
+            self._buf += _CRC.pack(zlib.crc32(payload))
+            self._pending += 1
+            self.records += 1
+            if kind == INTENT and intent_id > self.last_intent_id:
+                self.last_intent_id = intent_id
+            if self._pending >= self.flush_records or self.flush_interval == 0:
+                self._commit()
+            elif self._pending == 1:
+                self._cv.notify()
+            return self.seq
+
+    def _commit(self) -> None:
+        """락 보유 상태에서 호출: 버퍼 write + fsync (그룹 커밋 1회)"""
+        if not self._buf:
+            return
+        self._fh.write(self._buf)
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        self._buf.clear()
+        self._pending = 0
+        self.commits += 1
+
+    def sync(self) -> None:
+        """버퍼에 남은 레코드를 즉시 커밋"""
+        with self._lock:
+            if not self._closed:
+                self._commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._commit()
+            self._closed = True
+            self._cv.notify_all()
+        if self._flusher is not None:
+            self._flusher.join(1.0)
+        self._fh.close()
+
+    def _run(self) -> None:
+        with self._lock:
+            while not self._closed:
+                if not self._pending:
+                    self._cv.wait()
+                    continue
+                # 첫 레코드 후 flush_interval 동안 더 모아서 한 번에 fsync
+                self._cv.wait(self.flush_interval)
+                if not self._closed:
+                    self._commit()
+
+    def summary_dict(self) -> Dict[str, float]:
+        return {"records": self.records, "commits": self.commits,
+                "records_per_commit": round(self.records / self.commits, 2) if self.commits else 0.0}
+
+
+# ========== 복구 ==========
+def _scan_tail(path: str) -> Tuple[int, int, int]:
+    """(유효 구간 끝 오프셋, 마지막 seq, 마지막 intent_id). 파일 없음/빈 파일이면 (0, 0, 0)"""
+    if not os.path.exists(path) or os.path.getsize(path) < _HDR.size:
+        return 0, 0, 0
+    end = _HDR.size
+    seq = iid = 0
+    for rec, off in _iter_frames(path):
+        end = off
+        seq = rec.seq
+        if rec.kind == INTENT and rec.intent_id > iid:
+            iid = rec.intent_id
+    return end, seq, iid
+
+
+def _iter_frames(path: str) -> Iterator[Tuple[JournalRecord, int]]:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    magic, ver = _HDR.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise RuntimeError(f"주문 저널 형식이 아닙니다: {path}")
+    if ver != VERSION:
+        raise RuntimeError(f"지원하지 않는 저널 버전입니다: {ver} ({path})")
+    mv = memoryview(data)
+    off, n = _HDR.size, len(data)
+    unpack, crc_of, size = _REC.unpack_from, zlib.crc32, _REC.size
+    while off + FRAME <= n:
+        if _LEN.unpack_from(data, off)[0] != size:
+            break
+        p0 = off + _LEN.size
+        if crc_of(mv[p0:p0 + size]) != _CRC.unpack_from(data, p0 + size)[0]:
+            break
+        kind, seq, ts, iid, side, qty, price, sym, oid = unpack(data, p0)
+        off += FRAME
+        yield (JournalRecord(kind, seq, ts, iid, _SIDE_NAMES.get(side, ""), qty, price,
+                             sym.rstrip(b"\0").decode("utf-8", "ignore"),
+                             oid.rstrip(b"\0").decode("utf-8", "ignore")), off)
+
+
+def read_journal(path: str) -> Iterator[JournalRecord]:
+    """유효 레코드 순회 (잘린/손상된 꼬리에서 멈춤)"""
+    for rec, _ in _iter_frames(path):
+        yield rec
+
+
+@dataclass
+class Recovery:
+    positions: Dict[str, Tuple[int, float, float]]  # sym -> (qty, avg_price, 최초 매수 ts)
+    open_intents: List[JournalRecord]               # FILL/REJECT/CANCEL 로 끝나지 않은 의도
+    records: int
+    last_seq: int
+
+
+def recover(path: str, after_seq: int = 0,
+            base: Optional[Dict[str, Tuple[int, float, float]]] = None) -> Recovery:
+    """
+    저널 → 포지션/미종결 의도 재구성 (FILL 만 포지션에 반영)
+    after_seq/base: 체크포인트 복원 시 — 체크포인트 포지션(base)에 seq > after_seq 레코드만 덧씌움
+    """
+    pos: Dict[str, List[float]] = {s: [q, a, t] for s, (q, a, t) in (base or {}).items() if q > 0}
+    intents: Dict[int, JournalRecord] = {}
+    filled: Dict[int, int] = {}
+    n = 0
+    last = after_seq
+    if os.path.exists(path) and os.path.getsize(path) >= _HDR.size:
+        for r in read_journal(path):
+            if r.seq <= after_seq:
+                continue
+            n += 1
+            last = r.seq
+            k = r.kind
+            if k == INTENT:
+                intents[r.intent_id] = r
+            elif k == FILL:
+                p = pos.get(r.symbol)
+                if r.side == "BUY":
+                    if p is None or p[0] <= 0:
+                        pos[r.symbol] = [r.qty, r.price, r.ts]
+                    else:
+                        q = p[0] + r.qty
+                        p[1] = (p[1] * p[0] + r.price * r.qty) / q
+                        p[0] = q
+                elif p is not None:
+                    p[0] -= r.qty
+                    if p[0] <= 0:
+                        del pos[r.symbol]
+                filled[r.intent_id] = filled.get(r.intent_id, 0) + r.qty
+                it = intents.get(r.intent_id)
+                if it is not None and filled[r.intent_id] >= it.qty:
+                    del intents[r.intent_id]
+            elif k in (REJECT, CANCEL):
+                intents.pop(r.intent_id, None)
+    return Recovery({s: (int(p[0]), p[1], p[2]) for s, p in pos.items()},
+                    list(intents.values()), n, last)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+order/matching.py — 심볼별 지정가 호가창(LOB) 매칭 엔진 (DRY_RUN / 리플레이용)
+
+- 우리 주문만 호가창에 올리고, 체결 여부는 테이프(틱: 가격/거래량/호가)로 판정
+- 가격 레벨 힙: 매수 (-price), 매도 (price) 최소 힙 + 레벨별 FIFO deque (취소는 지연 삭제)
+- MKT: 직전 틱의 매도/매수 호가에서 즉시 체결, 틱 거래량(가용 유동성)을 넘는 잔량은
+       market_ioc=True 면 취소(IOC), False 면 다음 틱에 이어서 체결
+- LMT: 시장성 있으면 즉시 체결, 나머지는 레벨에 대기. 같은 가격 외부 대기물량(queue_ahead)이
+       먼저 소진돼야 체결 (가격이 레벨을 관통하면 대기열 무관하게 체결)
+- 틱 하나의 거래량은 그 틱에서 체결 가능한 총량 — volume 이 없으면 무제한
+
+틱 처리는 대기 주문이 없는 심볼이면 필드 몇 개 갱신으로 끝남 → 리플레이 1M ticks/min 이상 목표.
+"""
+from __future__ import annotations
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+__all__ = ["RestingOrder", "Fill", "MatchingEngine"]
+
+_INF = float("inf")
+
+
+@dataclass
+class RestingOrder:
+    oid: str
+    symbol: str
+    side: str                    # "BUY" | "SELL"
+    qty: int
+    price: Optional[float]       # None = 시장가
+    order_type: str = "LMT"
+    filled: int = 0
+    notional: float = 0.0        # 체결 금액 합 (평균 체결가 계산용)
+    queue_ahead: float = 0.0     # 같은 가격에서 우리보다 앞선 외부 대기물량
+    status: str = "NEW"          # NEW | PARTIAL | FILLED | CANCELED | PARTIAL_CANCELED
+    user_tag: Optional[str] = None
+
+    @property
+    def remaining(self) -> int:
+        return self.qty - self.filled
+
+    @property
+    def avg_price(self) -> float:
+        return self.notional / self.filled if self.filled else 0.0
+
+
+@dataclass
+class Fill:
+    oid: str
+    symbol: str
+    side: str
+    qty: int
+    price: float
+
+
+@dataclass
+class _Book:
+    last: Optional[float] = None
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_size: float = 0.0              # 최우선 호가 잔량 (새 지정가의 queue_ahead 추정)
+    ask_size: float = 0.0
+    avail: float = 0.0                 # 직전 틱에서 아직 소진되지 않은 거래량
+    bids: List[float] = field(default_factory=list)   # -price 힙
+    asks: List[float] = field(default_factory=list)   # price 힙
+    levels: Dict[Tuple[str, float], Deque[RestingOrder]] = field(default_factory=dict)
+    markets: Deque[RestingOrder] = field(default_factory=deque)  # IOC 아닐 때 미체결 시장가
+    resting: int = 0                   # 대기 중 주문 수 (0이면 틱 처리 fast path)
+
+
+def _field(val: Any, key: str) -> Any:
+    if isinstance(val, dict):
+        return val.get(key)
+    return getattr(val, key, None)
+
+
+class MatchingEngine:
+    def __init__(self, market_ioc: bool = True) -> None:
+        self.market_ioc = bool(market_ioc)
+        self._books: Dict[str, _Book] = {}
+        self.orders: Dict[str, RestingOrder] = {}
+        self.ticks = 0
+
+    def _book(self, symbol: str) -> _Book:
+        b = self._books.get(symbol)
+        if b is None:
+            b = self._books[symbol] = _Book()
+        return b
+
+    def quote(self, symbol: str) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """(bid, ask, last)"""
+        b = self._books.get(symbol)
+        return (b.bid, b.ask, b.last) if b is not None else (None, None, None)
+
+    # ---------- 테이프 입력 ----------
+    def on_snapshot(self, snapshot: Dict[str, Any]) -> List[Fill]:
+        """Hub 와 같은 snapshot {sym: price | {"price","volume","bid","ask",...}} 을 입력"""
+        fills: List[Fill] = []
+        for sym, val in snapshot.items():
+            if isinstance(val, (int, float)):
+                out = self.on_trade(sym, float(val))
+            else:
+                p = _field(val, "price")
+                if p is None:
+                    continue
+                out = self.on_trade(sym, float(p), _field(val, "volume"), _field(val, "bid"), _field(val, "ask"),
+                                    _field(val, "bid_size"), _field(val, "ask_size"))
+            if out:
+                fills.extend(out)
+        return fills
+
+    def on_trade(self, symbol: str, price: float, volume: Optional[float] = None,
+                 bid: Optional[float] = None, ask: Optional[float] = None,
+                 bid_size: Optional[float] = None, ask_size: Optional[float] = None) -> List[Fill]:
+        """체결 틱 1건 반영 → 대기 주문 체결 목록"""
+        self.ticks += 1
+        b = self._books.get(symbol)
+        if b is None:
+            b = self._books[symbol] = _Book()
+        b.last = price
+        b.bid = bid if bid is not None else price
+        b.ask = ask if ask is not None else price
+        b.bid_size = bid_size or 0.0
+        b.ask_size = ask_size or 0.0
+        b.avail = _INF if volume is None else float(volume)
+        if not b.resting:
+            return []
+        fills: List[Fill] = []
+        if b.markets:
+            self._fill_markets(b, fills)
+        if b.bids and -b.bids[0] >= price:
+            self._match_side(b, "BUY", price, fills)
+        if b.asks and b.asks[0] <= price:
+            self._match_side(b, "SELL", price, fills)
+        return fills
+
+    # ---------- 주문 ----------
+    def submit(self, oid: str, symbol: str, side: str, qty: int, price: Optional[float] = None,
+               order_type: str = "MKT", user_tag: Optional[str] = None,
+               queue_ahead: Optional[float] = None) -> Tuple[RestingOrder, List[Fill]]:
+        """주문 접수 → (주문 상태, 즉시 체결 목록)"""
+        b = self._book(symbol)
+        ot = (order_type or "MKT").upper()
+        o = RestingOrder(oid, symbol, side, int(qty), None if ot == "MKT" else float(price), ot, user_tag=user_tag)
+        self.orders[oid] = o
+        fills: List[Fill] = []
+        touch = b.ask if side == "BUY" else b.bid
+        if touch is not None and b.avail > 0:
+            if o.price is None or (o.price >= touch if side == "BUY" else o.price <= touch):
+                self._take(b, o, touch, fills)
+        if o.remaining > 0:
+            if o.price is None:
+                if self.market_ioc:
+                    o.status = "CANCELED" if o.filled == 0 else "PARTIAL_CANCELED"
+                else:
+                    b.markets.append(o)
+                    b.resting += 1
+            else:
+                if queue_ahead is None:
+                    # 최우선 호가에 붙으면 그 잔량 뒤에 줄 선다 (그 밖의 가격은 우리가 선두)
+                    if side == "BUY":
+                        queue_ahead = b.bid_size if o.price == b.bid else 0.0
+                    else:
+                        queue_ahead = b.ask_size if o.price == b.ask else 0.0
+                o.queue_ahead = float(queue_ahead)
+                self._rest(b, o)
+        return o, fills
+
+    def cancel(self, oid: str) -> Optional[RestingOrder]:
+        """대기 주문 취소 (지연 삭제: 레벨 deque 에서 제거, 빈 레벨 가격은 다음 매칭 때 힙에서 정리)"""
+        o = self.orders.get(oid)
+        if o is None or o.remaining == 0 or o.status in ("CANCELED", "PARTIAL_CANCELED"):
+            return None
+        b = self._books[o.symbol]
+        if o.price is None:
+            b.markets.remove(o)
+        else:
+            b.levels[(o.side, o.price)].remove(o)
+        b.resting -= 1
+        o.status = "CANCELED" if o.filled == 0 else "PARTIAL_CANCELED"
+        return o
+
+    # ---------- 내부 ----------
+    def _rest(self, b: _Book, o: RestingOrder) -> None:
+        key = (o.side, o.price)
+        q = b.levels.get(key)
+        if not q:
+            q = b.levels[key] = deque()
+            heapq.heappush(b.bids if o.side == "BUY" else b.asks, -o.price if o.side == "BUY" else o.price)
+        q.append(o)
+        b.resting += 1
+
+    def _take(self, b: _Book, o: RestingOrder, px: float, fills: List[Fill]) -> None:
+        """가용 유동성(avail)에서 px 로 체결"""
+        q = int(min(o.remaining, b.avail))
+        if q <= 0:
+            return
+        b.avail -= q
+        self._apply(o, q, px, fills)
+
+    def _apply(self, o: RestingOrder, q: int, px: float, fills: List[Fill]) -> None:
+        o.filled += q
+        o.notional += q * px
+        o.status = "FILLED" if o.remaining == 0 else "PARTIAL"
+        fills.append(Fill(o.oid, o.symbol, o.side, q, px))
+
+    def _fill_markets(self, b: _Book, fills: List[Fill]) -> None:
+        mk = b.markets
+        while mk and b.avail > 0:
+            o = mk[0]
+            self._take(b, o, b.ask if o.side == "BUY" else b.bid, fills)
+            if o.remaining:
+                break
+            mk.popleft()
+            b.resting -= 1
+
+    def _match_side(self, b: _Book, side: str, price: float, fills: List[Fill]) -> None:
+        heap = b.bids if side == "BUY" else b.asks
+        sign = -1.0 if side == "BUY" else 1.0
+        levels = b.levels
+        while heap and b.avail > 0:
+            lvl = heap[0] * sign
+            if (lvl < price) if side == "BUY" else (lvl > price):
+                break
+            q = levels.get((side, lvl))
+            if not q:                     # 취소로 비어버린 레벨
+                heapq.heappop(heap)
+                levels.pop((side, lvl), None)
+                continue
+            if lvl == price:
+                # 같은 가격: 외부 대기물량이 먼저 소진
+                eat = min(q[0].queue_ahead, b.avail)
+                if eat > 0:
+                    b.avail -= eat
+                    for o in q:
+                        o.queue_ahead = max(0.0, o.queue_ahead - eat)
+                    if q[0].queue_ahead > 0:
+                        break
+            while q and b.avail > 0:
+                o = q[0]
+                self._take(b, o, lvl, fills)
+                if o.remaining:
+                    break
+                q.popleft()
+                b.resting -= 1
+            if q:
+                break
+            heapq.heappop(heap)
+            del levels[(side, lvl)]
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+order/pipeline.py — 비동기 주문 파이프라인 (OrderIntent 큐 → 디스패처 → FillEvent)
+
+- submit(): 주문 의도(OrderIntent)를 큐에 넣고 즉시 반환 → Hub 틱 루프가 브로커 페이싱(rate limit)에 묶이지 않음
+- 디스패처: 큐를 순서대로 비우며 router.buy/sell 호출 (브로커 레이트리밋은 라우터/어댑터가 적용)
+- 결과는 FillEvent 로 이벤트 큐에 적재 → Hub가 poll_fills() 로 꺼내 포지션 반영
+- threaded=False: 디스패처 스레드 없이 submit 시 즉시 실행(기존 동기 동작/테스트·리플레이용)
+- 라우터가 RATE_LIMITED(raw["retry_after"]) 를 돌려주면 그 시간만큼 기다렸다 재시도 (디스패처 안에서만)
+  OrderRouter 의 자체 대기(block)는 끄고(block=False 로 호출) 재시도/메트릭을 파이프라인이 맡음
+- coalesce=True: 디스패처가 큐에 쌓인 의도를 한 번에 꺼내 OrderBatcher 로 심볼별 병합/상계 후 순수량만 전송
+  (hold()/release() 사이에 제출된 의도는 한 묶음으로 처리 — Hub 는 틱 단위로 묶음)
+  Hub 는 심볼당 미체결 의도가 최대 1건이라 한 묶음 안에 같은 심볼 leg 가 둘 이상 생기지 않음
+  → 병합/상계 효과는 파이프라인을 직접 쓰는 호출자에게만 (Hub 경로에서는 묶음 전송·워커 분배만)
+- workers>1: 꺼낸 묶음을 심볼별로 나눠 워커 풀에서 병렬 전송 (같은 심볼은 한 워커가 순서대로)
+  → OrderRouter 의 심볼 스트라이프 락 덕분에 서로 다른 심볼은 서로 막지 않음
+- journal=OrderJournal: 의도(INTENT)는 제출 시, 결과(ACK/FILL/REJECT/CANCEL)는 이벤트 적재 시 WAL 기록
+
+라우터 호출 형태(buy(symbol, qty, price=, order_type=, user_tag=) / 레거시 buy(symbol, qty, price, reason))와
+결과 형태(OrderResult / (ok, qty, price) 튜플)는 생성 시·타입별로 1회 결정한다.
+"""
+from __future__ import annotations
+import inspect
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from order.router import NetOrder, OrderBatcher, allocate_fills, retry_after as _retry_after
+from order.journal import ACK, CANCEL, FILL, INTENT, REJECT, OrderJournal
+
+__all__ = ["OrderIntent", "FillEvent", "OrderPipeline"]
+
+
+@dataclass
+class OrderIntent:
+    symbol: str
+    side: str                      # "BUY" | "SELL"
+    qty: int
+    price: Optional[float] = None
+    reason: str = ""
+    order_type: str = "MKT"
+    intent_id: int = 0
+    ts: float = 0.0
+    meta: Dict[str, Any] = field(default_factory=dict)  # 호출자 보관용 (예: 청산 전 평단)
+
+
+@dataclass
+class FillEvent:
+    intent: OrderIntent
+    ok: bool
+    qty: int = 0
+    price: float = 0.0
+    order_id: Optional[str] = None
+    message: str = ""
+    ts: float = 0.0
+
+    @property
+    def symbol(self) -> str:
+        return self.intent.symbol
+
+    @property
+    def side(self) -> str:
+        return self.intent.side
+
+
+# ========== 라우터 호출 바인딩 ==========
+def _bind_side(router: Any, meth: str) -> Callable[[OrderIntent], Any]:
+    fn = getattr(router, meth, None)
+    if not callable(fn):
+        raise RuntimeError(f"라우터에 {meth}() 가 없습니다: {type(router).__name__}")
+    try:
+        sig = inspect.signature(fn)
+    except ValueError:  # 시그니처 불명(C 구현 등) → 표준 형태
+        return lambda it: fn(it.symbol, it.qty, price=it.price, order_type=it.order_type, user_tag=it.reason)
+    if "block" in sig.parameters:  # OrderRouter: 레이트리밋 대기는 디스패처가 담당
+        return lambda it: fn(it.symbol, it.qty, price=it.price, order_type=it.order_type, user_tag=it.reason,
+                             block=False)
+    try:
+        sig.bind("S", 1, price=1.0, order_type="MKT", user_tag="r")
+        return lambda it: fn(it.symbol, it.qty, price=it.price, order_type=it.order_type, user_tag=it.reason)
+    except TypeError:
+        return lambda it: fn(it.symbol, it.qty, it.price, it.reason)
+
+
+def _to_fill(res: Any, it: OrderIntent) -> FillEvent:
+    """라우터 결과 → FillEvent (OrderResult / (ok, qty, price) / bool)"""
+    now = time.time()
+    if isinstance(res, (tuple, list)):
+        ok = bool(res[0]) if res else False
+        qty = int(res[1] or 0) if len(res) > 1 else (it.qty if ok else 0)
+        px = float(res[2] or 0.0) if len(res) > 2 and res[2] is not None else float(it.price or 0.0)
+        return FillEvent(it, ok and qty > 0, qty, px, ts=now)
+    if hasattr(res, "ok"):
+        raw = getattr(res, "raw", None) or {}
+        ok = bool(res.ok)
+        qty = int(raw["qty"] or 0) if "qty" in raw else (it.qty if ok else 0)
+        px = float(raw.get("price") or it.price or 0.0)
+        return FillEvent(it, ok and qty > 0, qty, px, getattr(res, "order_id", None),
+                         str(getattr(res, "message", "") or ""), now)
+    ok = bool(res)
+    return FillEvent(it, ok, it.qty if ok else 0, float(it.price or 0.0), ts=now)
+
+
+# ========== 파이프라인 ==========
+class OrderPipeline:
+    def __init__(self, router: Any, threaded: bool = True, logger: Any = None,
+                 max_rate_retries: int = 20, coalesce: bool = False, coalesce_window: float = 0.0,
+                 workers: int = 1, journal: Optional[OrderJournal] = None) -> None:
+        self.router = router
+        self.journal = journal
+        self.threaded = bool(threaded)
+        self.logger = logger
+        self.max_rate_retries = int(max_rate_retries)
+        # 병합/상계는 디스패처 스레드에서만 (동기 모드는 제출 즉시 체결이 필요)
+        self.batcher: Optional[OrderBatcher] = OrderBatcher(coalesce_window) if coalesce and self.threaded else None
+        self._hold = 0
+        self.workers = max(1, int(workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._mlock = threading.Lock()   # 메트릭 (워커 병렬 갱신)
+        self._send = {"BUY": _bind_side(router, "buy"), "SELL": _bind_side(router, "sell")}
+        # 저널이 있으면 재시작 후에도 intent_id 가 겹치지 않게 이어서 발급
+        self._ids = itertools.count((journal.last_intent_id if journal is not None else 0) + 1)
+        self._queue: Deque[OrderIntent] = deque()
+        self._fills: Deque[FillEvent] = deque()
+        self._cv = threading.Condition()
+        self._busy = 0          # 디스패처가 처리 중인 건수
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        # ---- 메트릭
+        self.submitted = 0
+        self.dispatched = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.rate_waits = 0         # 레이트리밋 거절 후 재시도 횟수
+        self.rate_wait_s = 0.0      # 그 대기 시간 합계
+        if self.threaded:
+            self.start()
+
+    # ---------- 라이프사이클 ----------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = False
+        if self.workers > 1 and self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="order-worker")
+        self._thread = threading.Thread(target=self._run, name="order-dispatch", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 의도를 처리한 뒤 디스패처 종료"""
+        self.flush(timeout)
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    # ---------- 생산자 (Hub) ----------
+    def submit(self, intent: OrderIntent) -> int:
+        """큐 적재 후 즉시 반환 (threaded=False 면 그 자리에서 실행)"""
+        intent.intent_id = next(self._ids)
+        intent.ts = intent.ts or time.time()
+        self.submitted += 1
+        if self.journal is not None:
+            self.journal.append(INTENT, intent.symbol, intent.side, intent.qty, intent.price or 0.0,
+                                intent.intent_id, ts=intent.ts)
+        if not self.threaded:
+            self._emit(self._dispatch(intent))
+            return intent.intent_id
+        if self._thread is None:   # close() 후 재사용 시 디스패처 재기동
+            self.start()
+        with self._cv:
+            self._queue.append(intent)
+            if len(self._queue) > self.max_depth:
+                self.max_depth = len(self._queue)
+            self._cv.notify()
+        return intent.intent_id
+
+    def cancel(self, order_id: str, symbol: str = "") -> Any:
+        """브로커 주문 취소 (성공 시 CANCEL 기록)"""
+        res = self.router.cancel(order_id)
+        if self.journal is not None and getattr(res, "ok", False):
+            self.journal.append(CANCEL, symbol, order_id=order_id)
+        return res
+
+    def _emit(self, ev: FillEvent) -> None:
+        """체결 이벤트 적재 (+ 저널: ACK → FILL, 잔량은 CANCEL / 실패는 REJECT)"""
+        j = self.journal
+        if j is not None:
+            it = ev.intent
+            if ev.order_id:
+                j.append(ACK, it.symbol, it.side, it.qty, it.price or 0.0, it.intent_id, ev.order_id)
+            if ev.ok:
+                j.append(FILL, it.symbol, it.side, ev.qty, ev.price, it.intent_id, ev.order_id)
+                if ev.qty < it.qty:
+                    j.append(CANCEL, it.symbol, it.side, it.qty - ev.qty, 0.0, it.intent_id, ev.order_id)
+            else:
+                j.append(REJECT, it.symbol, it.side, it.qty, 0.0, it.intent_id, ev.order_id)
+        self._fills.append(ev)
+
+    def hold(self) -> None:
+        """release() 전까지 디스패처가 새 의도를 꺼내지 않음 (한 틱의 의도를 한 묶음으로)"""
+        with self._cv:
+            self._hold += 1
+
+    def release(self) -> None:
+        with self._cv:
+            self._hold = max(0, self._hold - 1)
+            self._cv.notify_all()
+
+    @contextmanager
+    def batch(self) -> Iterator["OrderPipeline"]:
+        self.hold()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def poll_fills(self) -> List[FillEvent]:
+        """도착한 체결 이벤트를 모두 꺼냄 (논블로킹)"""
+        out: List[FillEvent] = []
+        fills = self._fills
+        while fills:
+            out.append(fills.popleft())
+        return out
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐가 비고 처리 중인 주문이 없을 때까지 대기. 시간 초과 시 False"""
+        if not self.threaded:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._cv:
+            while self._queue or self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def pending(self) -> int:
+        return len(self._queue) + self._busy
+
+    # ---------- 디스패처 ----------
+    def _dispatch(self, it: OrderIntent) -> FillEvent:
+        send = self._send[it.side]
+        try:
+            res = send(it)
+            for _ in range(self.max_rate_retries):
+                wait = _retry_after(res)
+                if wait is None:
+                    break
+                with self._mlock:
+                    self.rate_waits += 1
+                    self.rate_wait_s += wait
+                time.sleep(wait)
+                res = send(it)
+            ev = _to_fill(res, it)
+        except Exception as e:
+            ev = FillEvent(it, False, message=f"error:{e}", ts=time.time())
+        with self._mlock:
+            self.dispatched += 1
+            if not ev.ok:
+                self.failed += 1
+        return ev
+
+    def _dispatch_group(self, items: List[OrderIntent]) -> List[FillEvent]:
+        """같은 심볼 의도들을 순서대로 전송 (워커 1개가 담당)"""
+        return [self._dispatch(it) for it in items]
+
+    def _dispatch_net(self, net: NetOrder) -> List[FillEvent]:
+        """순수량 1건 전송 후 원래 의도(leg)별 FillEvent 로 분배"""
+        ev: Optional[FillEvent] = None
+        if net.qty > 0:
+            ev = self._dispatch(OrderIntent(net.symbol, net.side, net.qty, net.price, net.user_tag, net.order_type))
+        fill_qty = ev.qty if ev is not None and ev.ok else 0
+        now = time.time()
+        out: List[FillEvent] = []
+        for leg, q, px in allocate_fills(net, fill_qty, ev.price if ev is not None else 0.0):
+            if q > 0:
+                out.append(FillEvent(leg, True, q, px, ev.order_id if ev is not None else None,
+                                     "NETTED" if ev is None else ev.message, now))
+            else:
+                out.append(FillEvent(leg, False, message=ev.message if ev is not None else "", ts=now))
+        return out
+
+    def _run(self) -> None:
+        cv = self._cv
+        batcher = self.batcher
+        while True:
+            with cv:
+                while (not self._queue or self._hold) and not self._stop:
+                    cv.wait()
+                if batcher is not None and batcher.window_s > 0 and not self._stop:
+                    # 병합 구간: 첫 의도 도착 후 window_s 동안 더 모음
+                    deadline = time.monotonic() + batcher.window_s
+                    left = batcher.window_s
+                    while not self._stop and left > 0:
+                        cv.wait(left)
+                        left = deadline - time.monotonic()
+                if not self._queue:
+                    if self._stop:
+                        return
+                    continue
+                if batcher is None and self._pool is None:
+                    items = [self._queue.popleft()]
+                else:
+                    items = list(self._queue)
+                    self._queue.clear()
+                self._busy += len(items)
+            # 브로커 호출(레이트리밋 대기 포함)은 락 밖에서
+            pool = self._pool
+            if batcher is not None:
+                for it in items:
+                    batcher.add(it)
+                nets = batcher.drain()
+                for evs in (pool.map(self._dispatch_net, nets) if pool is not None else map(self._dispatch_net, nets)):
+                    for ev in evs:
+                        self._emit(ev)
+            elif pool is not None:
+                groups: Dict[str, List[OrderIntent]] = {}
+                for it in items:
+                    groups.setdefault(it.symbol, []).append(it)
+                for evs in pool.map(self._dispatch_group, groups.values()):
+                    for ev in evs:
+                        self._emit(ev)
+            else:
+                self._emit(self._dispatch(items[0]))
+            with cv:
+                self._busy -= len(items)
+                cv.notify_all()
+
+    def summary_dict(self) -> Dict[str, int]:
+        return {"submitted": self.submitted, "dispatched": self.dispatched,
+                "failed": self.failed, "max_depth": self.max_depth, "pending": self.pending(),
+                "rate_waits": self.rate_waits,
+                "coalesced": (self.batcher.intents_in - self.batcher.orders_out) if self.batcher is not None else 0}
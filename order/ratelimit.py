@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+order/ratelimit.py — 논슬립(non-sleeping) 토큰 버킷 레이트리미터
+
+- TokenBucket: 초당 rate 개 보충, capacity 까지 버스트 허용
+- acquire() 는 절대 sleep 하지 않음 → 0.0(통과) 또는 다음 토큰까지 남은 초(wait hint) 반환
+- RateLimiter: 용도별 버킷 묶음 ("order" / "cancel" / "query") — 키움 TR 초당 제한에 맞춰 분리
+  (SendOrder 1초 5회, 조회 TR 1초 5회 기준이 기본값)
+
+호출자(어댑터/라우터/주문 파이프라인)가 wait hint 를 받아 재시도 시점을 스스로 정한다.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+__all__ = ["TokenBucket", "RateLimiter", "ORDER", "CANCEL", "QUERY"]
+
+ORDER = "order"
+CANCEL = "cancel"
+QUERY = "query"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise RuntimeError(f"토큰 보충 속도는 0보다 커야 합니다: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._ts = clock()
+        self._lock = threading.Lock()
+        # ---- 메트릭
+        self.granted = 0
+        self.limited = 0
+
+    def _refill(self, now: float) -> None:
+        dt = now - self._ts
+        if dt > 0:
+            self._tokens = min(self.capacity, self._tokens + dt * self.rate)
+            self._ts = now
+
+    def acquire(self, n: float = 1.0, now: Optional[float] = None) -> float:
+        """토큰 n개 차감 시도. 성공 0.0, 부족하면 차감 없이 필요한 대기 시간(초)"""
+        with self._lock:
+            t = self._clock() if now is None else now
+            self._refill(t)
+            if self._tokens >= n:
+                self._tokens -= n
+                self.granted += 1
+                return 0.0
+            self.limited += 1
+            return (n - self._tokens) / self.rate
+
+    def wait_hint(self, n: float = 1.0, now: Optional[float] = None) -> float:
+        """차감 없이 n개를 얻기까지 남은 시간(초)"""
+        with self._lock:
+            t = self._clock() if now is None else now
+            self._refill(t)
+            return 0.0 if self._tokens >= n else (n - self._tokens) / self.rate
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+class RateLimiter:
+    """용도별 TokenBucket 묶음. 등록되지 않은 용도는 제한 없음(항상 0.0)"""
+
+    def __init__(self, buckets: Optional[Dict[str, TokenBucket]] = None) -> None:
+        self.buckets: Dict[str, TokenBucket] = dict(buckets or {})
+
+    @classmethod
+    def kiwoom(cls, order_rate: float = 5.0, cancel_rate: float = 5.0, query_rate: float = 5.0,
+               burst: Optional[float] = None,
+               clock: Callable[[], float] = time.monotonic) -> "RateLimiter":
+        """키움 기본: 주문/취소/조회 각각 초당 5회, 버스트는 기본적으로 1초치"""
+        return cls({
+            ORDER: TokenBucket(order_rate, burst if burst is not None else order_rate, clock),
+            CANCEL: TokenBucket(cancel_rate, burst if burst is not None else cancel_rate, clock),
+            QUERY: TokenBucket(query_rate, burst if burst is not None else query_rate, clock),
+        })
+
+    def acquire(self, kind: str, n: float = 1.0, now: Optional[float] = None) -> float:
+        b = self.buckets.get(kind)
+        return b.acquire(n, now) if b is not None else 0.0
+
+    def wait_hint(self, kind: str, n: float = 1.0, now: Optional[float] = None) -> float:
+        b = self.buckets.get(kind)
+        return b.wait_hint(n, now) if b is not None else 0.0
+
+    def summary_dict(self) -> Dict[str, Dict[str, float]]:
+        return {k: {"rate": b.rate, "capacity": b.capacity, "granted": b.granted, "limited": b.limited}
+                for k, b in self.buckets.items()}
@@ -1,25 +1,68 @@
 ﻿from __future__ import annotations
 import threading
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 from common import config
+from order.ratelimit import RateLimiter, ORDER
+from common.locks import LockStripes, TimedLock
 
 if config.BROKER.upper() == "KIWOOM":
     from order.adapters.kiwoom import KiwoomAdapter as Adapter
     _adapter_kwargs = {
         "account_no": config.ACCOUNT_NO,
         "dry_run": config.DRY_RUN,
-        "rate_limit_ms": getattr(config, "ORDER_RATE_LIMIT_MS", 120),
     }
+elif config.BROKER.upper() == "LOB":
+    # 로컬 호가창 매칭 엔진 (DRY_RUN 전용, 틱은 market_feed 로 공급)
+    from order.adapters.lob import LobAdapter as Adapter
+    _adapter_kwargs = {"account_no": config.ACCOUNT_NO}
 else:
     from order.adapters.mock import MockAdapter as Adapter
     _adapter_kwargs = {}
 
 
+def _order_rate() -> float:
+    """ORDER_RATE_PER_SEC (없고 구 ORDER_RATE_LIMIT_MS 만 있으면 1000/ms 로 환산, 둘 다 없으면 5)"""
+    rate = getattr(config, "ORDER_RATE_PER_SEC", None)
+    if rate is not None:
+        return float(rate)
+    ms = getattr(config, "ORDER_RATE_LIMIT_MS", None)
+    return 1000.0 / max(1, int(ms)) if ms is not None else 5.0
+
+
+def retry_after(res: Any) -> Optional[float]:
+    """토큰 버킷 거절(OrderResult ok=False, raw["retry_after"]) 이면 대기 초, 아니면 None"""
+    raw = getattr(res, "raw", None)
+    if isinstance(raw, dict) and "retry_after" in raw and not getattr(res, "ok", False):
+        return float(raw["retry_after"])
+    return None
+
+
 class OrderRouter:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, adapter=None, lock_stripes: int = 16, block: Optional[bool] = None,
+                 max_rate_retries: int = 20):
         self.logger = logger
-        self._lock = threading.RLock()
-        self._adapter = Adapter(logger=logger, **_adapter_kwargs)
+        self._lock = threading.RLock()          # 연결/종료/모드 전환 (라이프사이클)
+        # 주문 경로는 심볼별 스트라이프 락, 계좌 조회는 별도 경량 락 → 서로 다른 심볼끼리 막지 않음
+        self._stripes = LockStripes(lock_stripes)
+        self._acct_lock = TimedLock()
+        self._oid_symbol: Dict[str, str] = {}   # 취소 시 원주문 심볼의 스트라이프 선택
+        self._adapter = adapter if adapter is not None else Adapter(logger=logger, **_adapter_kwargs)
+        # 토큰 버킷 리미터: 어댑터가 주문/취소 전에 차감, 부족하면 sleep 없이 RATE_LIMITED(retry_after) 반환
+        # block=True(기본): 라우터가 retry_after 만큼 기다렸다 재시도 → 직접 호출자는 예전처럼 페이싱됨
+        # block=False: RATE_LIMITED 를 그대로 반환 (OrderPipeline 처럼 호출자가 재시도 시점을 정할 때)
+        self.block = bool(getattr(config, "ORDER_BLOCK_ON_LIMIT", True) if block is None else block)
+        self.max_rate_retries = int(max_rate_retries)
+        self.rate_waits = 0
+        self.limiter = RateLimiter.kiwoom(
+            order_rate=_order_rate(),
+            cancel_rate=getattr(config, "CANCEL_RATE_PER_SEC", 5),
+            query_rate=getattr(config, "QUERY_RATE_PER_SEC", 5),
+            burst=getattr(config, "ORDER_BURST", None),
+        )
+        if hasattr(self._adapter, "set_rate_limiter"):
+            self._adapter.set_rate_limiter(self.limiter)
         # ⚠️ self.dry_run 속성 추가 (모드 전환에 필요)
         self.dry_run = getattr(config, "DRY_RUN", True)
 
@@ -45,6 +88,15 @@ class OrderRouter:
             self.logger.info(f"[OrderRouter] mode={mode}, dry_run={self.dry_run}, budget={budget}")
     # ==========================================================
 
+    @property
+    def market_feed(self):
+        """틱 snapshot 을 받아 체결을 시뮬레이션하는 어댑터(LOB)면 그 입력 함수, 아니면 None"""
+        return getattr(self._adapter, "on_market", None)
+
+    def wait_hint(self, kind: str = ORDER) -> float:
+        """다음 주문(kind: order/cancel/query)까지 남은 대기 시간(초). 토큰은 차감하지 않음"""
+        return self.limiter.wait_hint(kind)
+
     def connect(self) -> bool:
         with self._lock:
             ok = self._adapter.connect()
@@ -57,26 +109,54 @@ class OrderRouter:
             self._adapter.close()
 
     def get_cash(self) -> int:
-        with self._lock:
+        with self._acct_lock:
             return self._adapter.get_cash()
 
     def get_positions(self):
-        with self._lock:
+        with self._acct_lock:
             return self._adapter.get_positions()
 
-    def buy(self, symbol: str, qty: int, price: Optional[float]=None, order_type: str="MKT", user_tag: Optional[str]=None):
-        with self._lock:
-            return self._adapter.place_order(symbol, "BUY", qty, price=price, order_type=order_type, user_tag=user_tag)
+    def _paced(self, key: str, send, block: Optional[bool]):
+        """send() 결과가 RATE_LIMITED 면 (block 일 때) 락 밖에서 retry_after 만큼 기다렸다 재시도"""
+        with self._stripes.for_key(key):
+            res = send()
+        if not (self.block if block is None else block):
+            return res
+        for _ in range(self.max_rate_retries):
+            wait = retry_after(res)
+            if wait is None:
+                break
+            self.rate_waits += 1
+            time.sleep(wait)
+            with self._stripes.for_key(key):
+                res = send()
+        return res
 
-    def sell(self, symbol: str, qty: int, price: Optional[float]=None, order_type: str="MKT", user_tag: Optional[str]=None):
-        with self._lock:
-            return self._adapter.place_order(symbol, "SELL", qty, price=price, order_type=order_type, user_tag=user_tag)
+    def _place(self, symbol: str, side: str, qty: int, price, order_type, user_tag, block: Optional[bool] = None):
+        res = self._paced(symbol, lambda: self._adapter.place_order(
+            symbol, side, qty, price=price, order_type=order_type, user_tag=user_tag), block)
+        oid = getattr(res, "order_id", None)
+        if oid:
+            self._oid_symbol[oid] = symbol
+        return res
 
-    def cancel(self, order_id: str):
-        with self._lock:
-            return self._adapter.cancel_order(order_id)
+    def buy(self, symbol: str, qty: int, price: Optional[float]=None, order_type: str="MKT", user_tag: Optional[str]=None,
+            block: Optional[bool] = None):
+        return self._place(symbol, "BUY", qty, price, order_type, user_tag, block)
+
+    def sell(self, symbol: str, qty: int, price: Optional[float]=None, order_type: str="MKT", user_tag: Optional[str]=None,
+             block: Optional[bool] = None):
+        return self._place(symbol, "SELL", qty, price, order_type, user_tag, block)
 
-    def route(self, decision: dict):
+    def cancel(self, order_id: str, block: Optional[bool] = None):
+        return self._paced(self._oid_symbol.get(order_id, order_id),
+                           lambda: self._adapter.cancel_order(order_id), block)
+
+    def lock_stats(self) -> Dict[str, Any]:
+        """락 경합 지표: 주문 스트라이프 합산 / 계좌 조회 락 (acquire 당 대기 시간 포함)"""
+        return {"orders": self._stripes.summary_dict(), "account": self._acct_lock.summary_dict()}
+
+    def route(self, decision: dict, block: Optional[bool] = None):
         action = (decision.get("action") or "HOLD").upper()
         symbol = decision.get("symbol")
         qty    = int(decision.get("qty", 0) or 0)
@@ -90,11 +170,97 @@ class OrderRouter:
             return None
 
         if action == "BUY":
-            return self.buy(symbol, qty, price=price, order_type=order_type, user_tag=tag)
+            return self.buy(symbol, qty, price=price, order_type=order_type, user_tag=tag, block=block)
         if action == "SELL":
-            return self.sell(symbol, qty, price=price, order_type=order_type, user_tag=tag)
+            return self.sell(symbol, qty, price=price, order_type=order_type, user_tag=tag, block=block)
 
         if self.logger:
             self.logger.warning("[OrderRouter] unknown action: %s", action)
         return None
 
+
+# ==========================================================
+# 주문 의도 병합/상계 (OrderBatcher)
+# ----------------------------------------------------------
+# 짧은 구간(한 틱 또는 window_s) 안에 쌓인 의도를 심볼별로 모아
+#  - 같은 방향 수량은 합치고
+#  - 반대 방향은 서로 상계(내부 교차)해
+# 브로커에는 순수량(net)만 1건씩 보낸다. 원래 의도(leg)별 체결은 allocate_fills 로 나눈다.
+# 지정가(LMT)는 같은 가격끼리만 묶는다. leg 는 symbol/side/qty/price/order_type/reason 속성을 가진 객체.
+# Hub 는 심볼당 미체결 의도를 1건으로 막으므로 Hub 경로에서는 상계가 발생하지 않는다 (직접 사용자 전용).
+# ==========================================================
+@dataclass
+class NetOrder:
+    symbol: str
+    side: str                 # 순수량 방향 ("BUY" | "SELL"), 완전 상계면 매수/매도 중 먼저 온 방향
+    qty: int                  # 브로커로 보낼 수량 (0 이면 전량 내부 상계 → 전송 없음)
+    price: Optional[float]
+    order_type: str
+    user_tag: str
+    legs: List[Any] = field(default_factory=list)
+
+
+class OrderBatcher:
+    def __init__(self, window_s: float = 0.0) -> None:
+        self.window_s = float(window_s)
+        self._groups: Dict[Tuple[str, str, Optional[float]], List[Any]] = {}
+        self._first_ts: Optional[float] = None
+        # ---- 메트릭
+        self.intents_in = 0
+        self.orders_out = 0
+        self.netted_qty = 0   # 상계로 브로커에 보내지 않은 수량(매수·매도 양쪽 합)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._groups.values())
+
+    def add(self, leg: Any) -> None:
+        ot = (getattr(leg, "order_type", None) or "MKT").upper()
+        key = (leg.symbol, ot, None if ot == "MKT" else leg.price)
+        self._groups.setdefault(key, []).append(leg)
+        self.intents_in += 1
+        if self._first_ts is None:
+            self._first_ts = time.monotonic()
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """가장 오래된 의도가 window_s 를 넘겼으면 True"""
+        if self._first_ts is None:
+            return False
+        return ((time.monotonic() if now is None else now) - self._first_ts) >= self.window_s
+
+    def drain(self) -> List[NetOrder]:
+        """쌓인 의도를 순수량 주문 목록으로 변환하고 비움 (도착 순서 유지)"""
+        out: List[NetOrder] = []
+        for (sym, ot, px), legs in self._groups.items():
+            buy = sum(l.qty for l in legs if l.side == "BUY")
+            sell = sum(l.qty for l in legs if l.side == "SELL")
+            net = buy - sell
+            side = "BUY" if net > 0 else "SELL" if net < 0 else legs[0].side
+            price = px if ot != "MKT" else next((l.price for l in reversed(legs) if l.side == side), None)
+            tag = "|".join(dict.fromkeys(str(getattr(l, "reason", "") or "") for l in legs if getattr(l, "reason", None)))
+            out.append(NetOrder(sym, side, abs(net), price, ot, tag, list(legs)))
+            self.netted_qty += 2 * min(buy, sell)
+            if net:
+                self.orders_out += 1
+        self._groups.clear()
+        self._first_ts = None
+        return out
+
+
+def allocate_fills(net: NetOrder, fill_qty: int, fill_price: float) -> List[Tuple[Any, int, float]]:
+    """
+    NetOrder 체결 결과 → leg 별 (leg, 체결수량, 가격).
+    반대 방향 leg 는 같은 방향 leg 와 내부 교차로 전량 체결, 같은 방향 leg 는
+    (상계분 + 브로커 체결분)을 도착 순서대로 나눠 가진다. 교차 가격은 브로커 체결가(없으면 첫 leg 가격).
+    """
+    crossed = sum(l.qty for l in net.legs if l.side != net.side)
+    avail = crossed + max(0, int(fill_qty))
+    px = float(fill_price) if fill_qty > 0 else float(next((l.price for l in net.legs if l.price), 0.0))
+    res: List[Tuple[Any, int, float]] = []
+    for leg in net.legs:
+        if leg.side != net.side:
+            res.append((leg, leg.qty, px))
+            continue
+        q = min(leg.qty, avail)
+        avail -= q
+        res.append((leg, q, px))
+    return res
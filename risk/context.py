@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+risk/context.py — 리스크 컨텍스트
+
+RiskContext (Hub 소유, 영속)
+- 포지션 저장소는 common.position_book.PositionBook (Hub/ExitRules 와 같은 북 공유)
+- 체결(set_position)/평가금(set_equity)/예산·섹터맵 변경 시에만 갱신
+- 변경마다 version 단조 증가 → 소비자는 version 비교로 변경 감지
+- Mapping 인터페이스: 정책은 ctx.get("equity") 등 기존 키로 '참조' 읽기 (틱마다 dict 복사 없음)
+- exposure / exposure_ctx / risk_ctx 블록은 자기 자신(alias)
+
+PolicyContext (평가 1건, 읽기 전용)
+- 심볼별 필드(symbol/price/score/planned_qty/...) + 기반 컨텍스트 참조
+- __slots__ + 쓰기 금지 → RiskGate.evaluate/check 가 정책 체인에 명시적으로 전달
+- 정책 인스턴스에 ctx를 주입하지 않으므로 정책을 동시에 평가해도 서로의 ctx를 오염시키지 않음
+"""
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from common.cooldown import CooldownService
+from common.position_book import PositionBook
+
+__all__ = ["RiskContext", "PolicyContext"]
+
+_MISSING = object()
+
+
+class RiskContext(Mapping):
+    """
+    제공 키(기존 Hub safe_ctx 호환):
+      budget, equity, equity_now, cash, account{equity},
+      portfolio/positions PositionBook {sym: {"qty", "avg_price", "last_high"}},
+      sector_map, sector_exposure {sector: value}, sector_of(sym),
+      cooldowns (CooldownService; 키=(symbol, reason)),
+      exposure/exposure_ctx/risk_ctx (self), version
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.0,
+        sector_map: Optional[Dict[str, str]] = None,
+        sector_of: Optional[Callable[[str], Optional[str]]] = None,
+        book: Optional[PositionBook] = None,
+        cooldowns: Optional[CooldownService] = None,
+    ) -> None:
+        self.version: int = 0
+        self.book: PositionBook = book if book is not None else PositionBook()
+        self.portfolio: PositionBook = self.book
+        self.cooldowns: CooldownService = cooldowns if cooldowns is not None else CooldownService()
+        self.sector_exposure: Dict[str, float] = {}
+        self.account: Dict[str, float] = {"equity": float(budget)}
+        self.sector_map: Dict[str, str] = sector_map if sector_map is not None else {}
+        self.sector_of: Callable[[str], Optional[str]] = sector_of or self.sector_map.get
+        self._data: Dict[str, Any] = {
+            "portfolio": self.portfolio,
+            "positions": self.portfolio,          # alias
+            "account": self.account,
+            "sector_map": self.sector_map,
+            "sector_exposure": self.sector_exposure,
+            "sector_of": self.sector_of,
+            "cooldowns": self.cooldowns,
+            "exposure": self,
+            "exposure_ctx": self,
+            "risk_ctx": self,
+        }
+        self._set_scalars(float(budget), float(budget))
+
+    # ---------- Mapping ----------
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __repr__(self) -> str:
+        return (f"RiskContext(v{self.version}, equity={self._data['equity']:.0f}, "
+                f"positions={len(self.portfolio)})")
+
+    # ---------- 내부 ----------
+    def _set_scalars(self, budget: float, equity: float) -> None:
+        d = self._data
+        d["budget"] = budget
+        d["cash"] = budget                        # alias (기존 Hub 호환)
+        d["equity"] = equity
+        d["equity_now"] = equity
+        d["version"] = self.version
+        self.account["equity"] = equity
+
+    def _bump(self) -> None:
+        self.version += 1
+        self._data["version"] = self.version
+
+    def _position_value(self, symbol: str) -> float:
+        return self.book.symbol_value(symbol)
+
+    # ---------- 갱신 API (변경 시에만 version 증가) ----------
+    def set_budget(self, budget: float) -> bool:
+        budget = float(budget or 0.0)
+        if budget == self._data["budget"]:
+            return False
+        self._set_scalars(budget, self._data["equity"])
+        self._bump()
+        return True
+
+    def set_equity(self, equity: float) -> bool:
+        equity = float(equity or 0.0)
+        if equity == self._data["equity"]:
+            return False
+        self._set_scalars(self._data["budget"], equity)
+        self._bump()
+        return True
+
+    def set_position(
+        self,
+        symbol: str,
+        qty: float,
+        avg_price: float,
+        entry_ts: Optional[float] = None,
+        reason: Optional[str] = None,
+    ) -> None:
+        """
+        체결 반영: qty<=0 이면 청산(reason 기록). 섹터 노출도 증분 갱신.
+        entry_ts 가 주어지면 신규 진입으로 보고 고점/보유틱을 초기화.
+        """
+        sector = self.sector_of(symbol)
+        if sector is not None:
+            self.sector_exposure[sector] = (
+                self.sector_exposure.get(sector, 0.0) - self._position_value(symbol)
+            )
+        if qty <= 0:
+            self.book.close(symbol, reason)
+        elif entry_ts is not None:
+            self.book.open(symbol, int(qty), avg_price, entry_ts)
+        else:
+            self.book.set(symbol, int(qty), avg_price)
+        if sector is not None:
+            val = self.sector_exposure[sector] + self._position_value(symbol)
+            if val > 1e-9:
+                self.sector_exposure[sector] = val
+            else:
+                del self.sector_exposure[sector]
+        self._bump()
+
+    def set_sector_map(self, sector_map: Dict[str, str]) -> None:
+        """섹터맵 교체(제자리 갱신) 후 섹터 노출 재집계"""
+        self.sector_map.clear()
+        self.sector_map.update(sector_map or {})
+        self.sector_exposure.clear()
+        self.sector_exposure.update(self.book.sector_values(self.sector_of, default=None))
+        self._bump()
+
+
+class PolicyContext(Mapping):
+    """
+    정책 평가용 읽기 전용 컨텍스트.
+    조회 순서: 심볼별 필드 → 기반 컨텍스트(base; RiskContext/호출자 ctx)
+    """
+    __slots__ = ("_own", "_base")
+
+    def __init__(self, base: Optional[Mapping[str, Any]] = None, **fields: Any) -> None:
+        object.__setattr__(self, "_own", fields)
+        object.__setattr__(self, "_base", base if base is not None else {})
+
+    @classmethod
+    def of(cls, ctx: Optional[Mapping[str, Any]], **fields: Any) -> "PolicyContext":
+        """ctx 위에 필드를 얹은 새 컨텍스트. ctx가 PolicyContext면 한 겹으로 평탄화."""
+        if isinstance(ctx, PolicyContext):
+            own = dict(ctx._own)
+            own.update(fields)
+            return cls(ctx._base, **own)
+        return cls(ctx, **fields)
+
+    # ---------- 읽기 전용 ----------
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PolicyContext is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("PolicyContext is read-only")
+
+    # ---------- Mapping ----------
+    def __getitem__(self, key: str) -> Any:
+        v = self._own.get(key, _MISSING)
+        if v is _MISSING:
+            return self._base[key]
+        return v
+
+    def get(self, key: str, default: Any = None) -> Any:
+        v = self._own.get(key, _MISSING)
+        if v is _MISSING:
+            return self._base.get(key, default)
+        return v
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._own or key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._own
+        for k in self._base:
+            if k not in self._own:
+                yield k
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"PolicyContext({self._own!r}, base={type(self._base).__name__})"
@@ -5,11 +5,13 @@ risk/core.py — RiskGate (policies orchestrator)
 - evaluate(): 각 정책 결과 병합 (allow/scale/force_flatten/reason)
 - allow_entry()/size_for(): 구 정책 어댑터
 - check(): Hub 호환 (allow, reason, size_hint) 반환
+- check_batch(): 순위 후보 일괄 점검 (앞 후보 배정분을 반영한 greedy 노출 배분)
 - on_fill_realized(): 체결 손익을 정책에 전달(record_fill)
 - apply(): 레거시 호환
+- 컨텍스트는 읽기 전용 PolicyContext 로 정책 체인에 명시 전달 (정책 인스턴스에 ctx 주입 없음)
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 # ---------- logger fallback ----------
@@ -25,6 +27,8 @@ except Exception:
 
 log = get_logger("risk")
 
+from .context import PolicyContext
+
 # ---------- 정책 import ----------
 try:
     from .policies.base import BasePolicy as Policy, PolicyResult  # type: ignore
@@ -93,7 +97,7 @@ class RiskGate:
     """
     정책 병합 게이트웨이
     - evaluate(context) -> {allow, scale, force_flatten, reason}
-    - allow_entry(), size_for(), check() 제공
+    - allow_entry(), size_for(), check(), check_batch() 제공
     """
 
     def __init__(self, policies: Optional[List[Policy]] = None, budget: Optional[float] = None) -> None:
@@ -135,11 +139,20 @@ class RiskGate:
 
     # ---------- 컨텍스트 병합 ----------
     @staticmethod
-    def _merge_ctx(ctx: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        return dict(ctx or {})
+    def _merge_ctx(ctx: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+        """호출자 ctx(RiskContext 등)를 복사하지 않고 참조로 사용"""
+        return ctx if ctx is not None else {}
+
+    @staticmethod
+    def _entry_ctx(cx: Mapping[str, Any], symbol: str, price: float,
+                   portfolio: Mapping[str, dict]) -> PolicyContext:
+        """진입 평가용 읽기 전용 컨텍스트: 심볼별 필드만 얹음 (기반 ctx 복사 없음)"""
+        return PolicyContext.of(cx, is_entry=True, symbol=symbol, price=price, portfolio=portfolio)
 
     # ---------- evaluate ----------
-    def evaluate(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def evaluate(self, context: Mapping[str, Any]) -> Dict[str, Any]:
+        if not isinstance(context, PolicyContext):
+            context = PolicyContext(context)
         agg_allow = True
         agg_scale = 1.0
         agg_force = False
@@ -192,12 +205,12 @@ class RiskGate:
     def allow_entry(self, symbol: str, price: float, portfolio: Dict[str, dict],
                     ctx: Optional[Dict[str, Any]] = None) -> bool:
         cx = self._merge_ctx(ctx)
-        ev = self.evaluate({**cx, "is_entry": True, "symbol": symbol, "price": price, "portfolio": portfolio})
+        ev = self.evaluate(self._entry_ctx(cx, symbol, price, portfolio))
         return bool(ev.get("allow", True))
 
     def size_for(self, symbol: str, price: float, portfolio: Dict[str, dict],
                  ctx: Optional[Dict[str, Any]] = None) -> int:
-        cx = self._merge_ctx(ctx)
+        cx = self._entry_ctx(self._merge_ctx(ctx), symbol, price, portfolio)
         hints: List[int] = []
         for p in self.policies:
             if hasattr(p, "size_hint"):
@@ -212,7 +225,7 @@ class RiskGate:
             log.info(f"[RiskGate] SIZE hints={hints} -> qty={qty}")
             return qty
 
-        ev = self.evaluate({**cx, "is_entry": True, "symbol": symbol, "price": price, "portfolio": portfolio})
+        ev = self.evaluate(cx)
         scale = float(ev.get("scale", 1.0))
         base_qty = 1
         qty = int(max(0, round(base_qty * scale)))
@@ -222,8 +235,8 @@ class RiskGate:
     # ---------- Hub 호환 ----------
     def check(self, symbol: str, price: float, portfolio: Dict[str, dict],
               ctx: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, Optional[int]]:
-        cx = self._merge_ctx(ctx)
-        ev = self.evaluate({**cx, "is_entry": True, "symbol": symbol, "price": price, "portfolio": portfolio})
+        cx = self._entry_ctx(self._merge_ctx(ctx), symbol, price, portfolio)
+        ev = self.evaluate(cx)
         allow = bool(ev.get("allow", True))
         reason = str(ev.get("reason") or "ok")
 
@@ -245,6 +258,49 @@ class RiskGate:
 
         return allow, reason, size_hint
 
+    def check_batch(
+        self,
+        candidates: Sequence[Tuple[str, float, int, float]],
+        portfolio: Mapping[str, dict],
+        ctx: Optional[Mapping[str, Any]] = None,
+        budget_left: Optional[float] = None,
+    ) -> List[Tuple[bool, str, Optional[int]]]:
+        """
+        순위대로 정렬된 후보 [(symbol, price, planned_qty, score)]를 한 번에 점검 (greedy 배분).
+        - 앞선 후보에 배정된 금액을 pending_value / pending_sector / sector_exposure 로 얹어
+          뒤 후보가 남은 노출 한도만 보도록 함 (포트폴리오/컨텍스트 복사 없음)
+        - budget_left(가용 현금)가 주어지면 1주도 못 사는 후보는 정책 평가 없이 탈락
+        반환: 후보별 (allow, reason, size_hint) — check() 와 동일 형식, qty 배정은 max(1, hint)
+        """
+        base = self._merge_ctx(ctx)
+        sector_of = base.get("sector_of")
+        sector_exp = base.get("sector_exposure") or {}
+        pending = 0.0
+        pending_sector: Dict[str, float] = {}
+        out: List[Tuple[bool, str, Optional[int]]] = []
+
+        for symbol, price, planned_qty, score in candidates:
+            if budget_left is not None and price > budget_left - pending:
+                out.append((False, "batch:no_fit", 0))
+                continue
+            fields: Dict[str, Any] = {"planned_qty": planned_qty, "score": score}
+            if pending:
+                fields["pending_value"] = pending
+                fields["pending_sector"] = pending_sector
+                merged = dict(sector_exp)
+                for sec, v in pending_sector.items():
+                    merged[sec] = merged.get(sec, 0.0) + v
+                fields["sector_exposure"] = merged
+            allow, reason, hint = self.check(symbol, price, portfolio, PolicyContext.of(base, **fields))
+            out.append((allow, reason, hint))
+            if allow:
+                value = max(1, int(hint or 0)) * float(price)
+                pending += value
+                sector = sector_of(symbol) if callable(sector_of) else None
+                if sector is not None:
+                    pending_sector[sector] = pending_sector.get(sector, 0.0) + value
+        return out
+
     # ---------- 레거시 ----------
     def apply(self, score: float, snapshot: Dict[str, Any]) -> Dict[str, Any]:
         sym = str(snapshot.get("symbol", "NA"))
@@ -8,8 +8,11 @@ from dataclasses import dataclass
 from typing import Dict, Any, Optional
 import time
 
+from common.cooldown import CooldownService
 from .base import BasePolicy, PolicyResult
 
+_DD_KEY = ("*", "daydd")  # 하드컷 쿨다운 키 (벽시계 휠)
+
 
 @dataclass
 class DayDDParams:
@@ -34,6 +37,8 @@ class DayDrawdownPolicy(BasePolicy):
         # use_unrealized는 본 정책에선 미사용이지만 에러 방지를 위해 받아만 둠
         self._ignore_use_unrealized = kwargs.get("use_unrealized", None)
         self.p = p
+        # 하드컷 쿨다운 — ctx(읽기 전용)에 쓰지 않음. ctx["cooldowns"](Hub 공유)가 없으면 자체 휠 사용
+        self._cooldowns = CooldownService(tick_slots=1, clock_slots=64, clock_resolution=60.0)
 
     # ---- 내부 유틸 ----
     def _now(self, ctx: Dict[str, Any]) -> float:
@@ -73,13 +78,16 @@ class DayDrawdownPolicy(BasePolicy):
         p   = self.p
         pnl = float(self._pnl_pct(ctx))
         now = self._now(ctx)
-        block_until = float(ctx.get("dd_block_until_ts") or 0.0)
+        clock = (ctx.get("cooldowns") or self._cooldowns).clock
+        block_until = max(float(ctx.get("dd_block_until_ts") or 0.0), clock.until(_DD_KEY, now))
 
         # ① 하드 차단
         if pnl <= p.limit_pct:
             until = now + p.cool_minutes * 60
             if until > block_until:
-                ctx["dd_block_until_ts"] = until
+                clock.arm(_DD_KEY, until, now)
+                if isinstance(ctx, dict):  # 레거시: 호출자 소유 dict에는 기록 유지
+                    ctx["dd_block_until_ts"] = until
             return PolicyResult(False, f"daydd_hard({pnl:.3f}%)")
 
         # ② 쿨다운 유지
@@ -4,8 +4,11 @@ from dataclasses import dataclass
 from typing import Dict, Any, Optional
 import time
 
+from common.cooldown import CooldownService
 from .base import BasePolicy, PolicyResult
 
+_DD_KEY = ("*", "daydd")  # 하드컷 쿨다운 키 (벽시계 휠)
+
 @dataclass
 class DayDDParams:
     limit_pct: float = -2.0
@@ -16,6 +19,8 @@ class DayDDParams:
 class DayDrawdownPolicy(BasePolicy):
     def __init__(self, params: Optional[DayDDParams] = None):
         self.p = params or DayDDParams()
+        # 하드컷 쿨다운 — ctx(읽기 전용)에 쓰지 않음. ctx["cooldowns"](Hub 공유)가 없으면 자체 휠 사용
+        self._cooldowns = CooldownService(tick_slots=1, clock_slots=64, clock_resolution=60.0)
 
     def _now(self, ctx: Dict[str, Any]) -> float:
         try:
@@ -48,11 +53,15 @@ class DayDrawdownPolicy(BasePolicy):
         p = self.p
         pnl = float(self._pnl_pct(ctx))
         now = self._now(ctx)
-        block_until = float(ctx.get("dd_block_until_ts") or 0.0)
+        clock = (ctx.get("cooldowns") or self._cooldowns).clock
+        block_until = max(float(ctx.get("dd_block_until_ts") or 0.0), clock.until(_DD_KEY, now))
 
         if pnl <= p.limit_pct:
             until = now + p.cool_minutes * 60
-            ctx["dd_block_until_ts"] = until
+            if until > clock.until(_DD_KEY, now):
+                clock.arm(_DD_KEY, until, now)
+            if isinstance(ctx, dict):  # 레거시: 호출자 소유 dict에는 기록 유지
+                ctx["dd_block_until_ts"] = until
             return PolicyResult(False, f"daydd_hard({pnl:.3f}%)")
 
         if now < block_until:
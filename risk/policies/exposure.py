@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Mapping, Optional, Callable
 import math
 
+from common.position_book import PositionBook
 from .base import BasePolicy, PolicyResult
 
 __all__ = ["ExposureConfig", "ExposurePolicy"]
@@ -36,20 +37,17 @@ class ExposurePolicy(BasePolicy):
       - account: {"equity": float}
       - equity / equity_now / cash (top-level)
       - exposure: { ... 동일 키 ... }
+      - pending_value / pending_sector (선택): 배치 점검 시 앞 후보 배정액
     """
 
     def __init__(self, cfg: Optional[ExposureConfig] = None):
         self.cfg = cfg or ExposureConfig()
-        # RiskGate / Hub가 set_ctx 또는 속성 주입해 주는 경우 대응
-        self.ctx: Dict[str, Any] = {}
 
     # ---- helpers ---------------------------------------------------------
-    def _merge_ctx(self, ctx: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        """인자로 들어온 ctx가 비거나 누락되면 self.ctx를 폴백으로 사용."""
-        base = dict(self.ctx or {})
-        if isinstance(ctx, dict):
-            base.update(ctx)
-        return base
+    @staticmethod
+    def _merge_ctx(ctx: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+        """RiskGate가 넘겨준 (읽기 전용) ctx를 그대로 사용. 인스턴스 상태에 의존하지 않음."""
+        return ctx if ctx is not None else {}
 
     def _equity(self, ctx: Dict[str, Any]) -> Optional[float]:
         """
@@ -101,9 +99,13 @@ class ExposurePolicy(BasePolicy):
         return max(0.0, qty * px)
 
     def _portfolio_value(self, pf: Dict[str, dict]) -> float:
+        if isinstance(pf, PositionBook):
+            return pf.exposure()  # 컬럼 내적 (평단 기준)
         return sum(self._position_value(pos) for pos in (pf or {}).values())
 
     def _symbol_value(self, pf: Dict[str, dict], sym: str, live_px: float) -> float:
+        if isinstance(pf, PositionBook):
+            return pf.symbol_value(sym)
         return self._position_value((pf or {}).get(sym), live_px)
 
     def _sector_values(
@@ -111,6 +113,8 @@ class ExposurePolicy(BasePolicy):
         pf: Dict[str, dict],
         sector_of: Callable[[str], Optional[str]],
     ) -> Dict[str, float]:
+        if isinstance(pf, PositionBook):
+            return pf.sector_values(sector_of)
         by_sector: Dict[str, float] = {}
         for sym, pos in (pf or {}).items():
             sector = sector_of(sym) or "UNKNOWN"
@@ -132,7 +136,8 @@ class ExposurePolicy(BasePolicy):
         total_cap = eq * self.cfg.max_total_exposure_pct
         symbol_cap = eq * self.cfg.max_symbol_exposure_pct
 
-        tot_val = self._portfolio_value(portfolio)
+        # pending_value: 같은 틱 배치(RiskGate.check_batch)에서 앞 후보에 이미 배정된 금액
+        tot_val = self._portfolio_value(portfolio) + float(c.get("pending_value") or 0.0)
         sym_val = self._symbol_value(portfolio, symbol, float(price))
 
         rem_total = max(0.0, total_cap - tot_val)
@@ -145,6 +150,7 @@ class ExposurePolicy(BasePolicy):
             by_sector = self._sector_values(portfolio, sector_of)
             sector_cap = eq * float(self.cfg.max_sector_exposure_pct)
             sector_now = float(by_sector.get(sector, 0.0))
+            sector_now += float((c.get("pending_sector") or {}).get(sector, 0.0))
             rem_sector = max(0.0, sector_cap - sector_now)
 
         return {"total": rem_total, "symbol": rem_symbol, "sector": rem_sector}
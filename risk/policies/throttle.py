@@ -2,22 +2,39 @@
 # risk/policies/throttle.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from .base import BasePolicy, PolicyResult
 
 @dataclass
 class ThrottleParams:
     cool_ticks: int = 3  # 심볼별 쿨다운 틱 수(허브에서 관리해도 되지만 예시로 제공)
+    reasons: Tuple[str, ...] = ("reentry", "exit", "throttle")  # 진입을 막는 쿨다운 사유
 
 class ThrottlePolicy(BasePolicy):
     """
-    ctx 필요 키:
-      - "symbol_cool": Dict[str, int]  # 남은 쿨다운 틱
+    ctx 키 (둘 중 하나):
+      - "cooldowns": CooldownService  # Hub 공유 타이밍 휠, (symbol, reason) 중 하나라도 활성이면 차단
+      - "symbol_cool": Dict[str, int] # (레거시) 남은 쿨다운 틱
+    틱 기준 시각은 ctx["tick_idx"] (Hub PolicyContext 필드).
     """
     def __init__(self, params: Optional[ThrottleParams] = None):
         self.p = params or ThrottleParams()
 
+    def arm(self, ctx: Dict[str, Any], symbol: str) -> None:
+        """진입 직후 호출 시 cool_ticks 동안 같은 심볼 재진입 차단 (공유 휠에 기록)"""
+        cd = ctx.get("cooldowns")
+        if cd is not None:
+            now = int(ctx.get("tick_idx") or 0)
+            cd.ticks.arm((symbol, "throttle"), now + self.p.cool_ticks, now)
+
     def check_entry(self, symbol: str, price: float, portfolio: Dict[str, dict], ctx: Dict[str, Any]) -> PolicyResult:
+        cd = ctx.get("cooldowns")
+        if cd is not None:
+            now = int(ctx.get("tick_idx") or 0)
+            ticks = cd.ticks
+            for reason in self.p.reasons:
+                if ticks.active((symbol, reason), now):
+                    return PolicyResult(False, f"cooldown:{reason}")
         cool = (ctx.get("symbol_cool") or {}).get(symbol, 0)
         if int(cool) > 0:
             return PolicyResult(False, "cooldown")
@@ -128,19 +128,25 @@ def write_session_report(
     fee_bps_buy: float = 0.0,
     fee_bps_sell: float = 0.0,
     tax_bps_sell: float = 0.0,
+    out_path: Optional[str] = None,
 ) -> str:
     """
     BUY/SELL를 FIFO로 매칭하여 실현손익을 계산하고 CSV로 저장.
     - bps 단위 수수료/세금 반영 (1 bps = 0.01%)
     - BUY 수수료는 원가에 포함, SELL 시 분배 차감
     - SELL 수수료/거래세는 체결가치 기준 차감
+    - 결정에 "ts"(epoch) 가 있으면 그 시각을 time 열에 기록 (리플레이: 테이프 시각)
     """
     try:
         b2 = 1.0 / 10000.0  # bps → 비율
-        date_str = datetime.now().strftime("%Y%m%d")
-        out_dir = Path(BASE_DIR) / "logs" / "reports"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"daytrade_{date_str}_report.csv"
+        if out_path is None:
+            date_str = datetime.now().strftime("%Y%m%d")
+            out_dir = Path(BASE_DIR) / "logs" / "reports"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            out_path = out_dir / f"daytrade_{date_str}_report.csv"
+        else:
+            out_path = Path(out_path)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
 
         cols = ["time","symbol","action","qty","price","reason","pnl_gross","fee_value","tax_value","pnl_net"]
         now_ts = datetime.now().strftime("%H:%M:%S")
@@ -156,13 +162,14 @@ def write_session_report(
                 if act not in ("BUY", "SELL"):
                     continue
 
+                row_ts = datetime.fromtimestamp(d["ts"]).strftime("%H:%M:%S") if d.get("ts") else now_ts
                 sym = str(d.get("symbol"))
                 qty = int(d.get("qty") or 0)
                 px  = float(d.get("price") or 0.0)
                 reason = d.get("reason")
 
                 if qty <= 0 or px <= 0:
-                    wr.writerow({"time": now_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
+                    wr.writerow({"time": row_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
                                  "pnl_gross": "", "fee_value": "", "tax_value": "", "pnl_net": ""})
                     continue
 
@@ -170,7 +177,7 @@ def write_session_report(
                     buy_val = qty * px
                     buy_fee = buy_val * (fee_bps_buy * b2)
                     inv.setdefault(sym, []).append({"qty": qty, "price": px, "buy_fee": buy_fee})
-                    wr.writerow({"time": now_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
+                    wr.writerow({"time": row_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
                                  "pnl_gross": "", "fee_value": round(buy_fee,2), "tax_value": "", "pnl_net": ""})
                     continue
 
@@ -206,7 +213,7 @@ def write_session_report(
                 tax_value = sell_tax
                 pnl_net = pnl_gross - fee_value - tax_value
 
-                wr.writerow({"time": now_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
+                wr.writerow({"time": row_ts,"symbol": sym,"action": act,"qty": qty,"price": px,"reason": reason,
                              "pnl_gross": round(pnl_gross,2), "fee_value": round(fee_value,2),
                              "tax_value": round(tax_value,2), "pnl_net": round(pnl_net,2)})
 
@@ -270,6 +277,19 @@ class HubAdapter:
                 result = self.hub.run_session(feed, max_ticks)  # type: ignore
         return {"result": str(result), "decisions": []}
 
+    def close(self) -> None:
+        """Hub 종료 (저널/체크포인트/거래량 기준선 — run_session 이 이미 닫았으면 재호출해도 무해)"""
+        inner = getattr(self.hub, "hub", None)
+        if inner is not None and callable(getattr(inner, "close", None)):
+            inner.close()
+
+    def latency_summary(self) -> Dict[str, dict]:
+        """Hub 단계별 지연 p50/p99/max (비활성/미지원이면 빈 dict)"""
+        lat = getattr(getattr(self.hub, "hub", None), "latency", None)
+        if lat is None or not getattr(lat, "enabled", False):
+            return {}
+        return lat.summary_dict()
+
 
 # === ⑦ CLI ===
 def parse_args() -> argparse.Namespace:
@@ -289,6 +309,27 @@ def parse_args() -> argparse.Namespace:
     p.add_argument('--fee-bps-buy', type=float, default=0.0, help='매수 수수료(bps, 기본 0)')
     p.add_argument('--fee-bps-sell', type=float, default=0.0, help='매도 수수료(bps, 기본 0)')
     p.add_argument('--tax-bps-sell', type=float, default=0.0, help='매도 거래세(bps, 기본 0)')
+    # Observability
+    p.add_argument('--no-latency', action='store_true', help='단계별 지연 히스토그램 비활성화')
+    p.add_argument('--sync-orders', action='store_true', help='주문을 틱 루프에서 동기 실행 (비동기 파이프라인 끔)')
+    # Journal (REAL 모드는 기본 logs/orders_YYYYMMDD.ojnl, 재시작 시 포지션 복구)
+    p.add_argument('--journal', type=str, default=None, help='주문/체결 WAL 저널 경로')
+    p.add_argument('--no-journal', action='store_true', help='주문 저널 비활성화')
+    # Checkpoint (REAL 모드는 기본 logs/hub_YYYYMMDD.ckpt, 재시작 시 저널 전체 재생 대신 스냅샷 복원)
+    p.add_argument('--checkpoint', type=str, default=None, help='Hub 상태 체크포인트 경로')
+    p.add_argument('--checkpoint-every', type=int, default=100, help='체크포인트 주기(틱)')
+    p.add_argument('--no-checkpoint', action='store_true', help='체크포인트 비활성화')
+    # Replay (기록된 틱 파일을 LOB 시뮬레이션 브로커로 최대 속도 재생 → FIFO 리포트)
+    p.add_argument('--replay', type=str, default=None,
+                   help='틱 파일(CSV/JSONL) 또는 틱 저장소 디렉터리 리플레이 백테스트 (끝까지 재생)')
+    p.add_argument('--record-ticks', type=str, default=None, help='입력 틱을 바이너리 저장소에 기록할 디렉터리')
+    # Indicators (fast/slow 등을 스코어 전에 증분 계산 — 피드에 이평이 없으면 TA 피처가 0)
+    p.add_argument('--no-indicators', action='store_true', help='증분 기술지표 계산 비활성화')
+    p.add_argument('--indicator-warmup', type=str, default=None,
+                   help='지표 warm-up 용 틱 저장소 디렉터리 (기본: --record-ticks)')
+    # Volume baseline (avg_vol 을 시간대 거래량 곡선으로 자체 산출, 기본 logs/volume_baseline.vbl 에 일자 간 유지)
+    p.add_argument('--volume-baseline', type=str, default=None, help='거래량 기준선 파일 경로')
+    p.add_argument('--no-volume-baseline', action='store_true', help='거래량 기준선 비활성화')
     return p.parse_args()
 
 
@@ -322,13 +363,41 @@ def main():
         cfg.real_mode = True
     if args.budget is not None:
         cfg.budget = args.budget
+    if args.replay:
+        cfg.real_mode = False  # 리플레이는 항상 시뮬레이션 브로커
 
     # ✅ HubTrade로 넘길 실제 실행 설정(예산/모드/메모)
     hub_config = {
         "budget": cfg.budget,
         "real_mode": cfg.real_mode,
         "note": args.note or "",
+        "latency_stats": not args.no_latency,
+        "async_orders": not args.sync_orders,
     }
+    journal_path = args.journal or (os.path.join(BASE_DIR, 'logs', f'orders_{today}.ojnl') if cfg.real_mode else None)
+    if journal_path and not args.no_journal:
+        hub_config["journal_path"] = journal_path
+    ckpt_path = args.checkpoint or (os.path.join(BASE_DIR, 'logs', f'hub_{today}.ckpt') if cfg.real_mode else None)
+    if ckpt_path and not args.no_checkpoint:
+        hub_config["checkpoint_path"] = ckpt_path
+        hub_config["checkpoint_every"] = args.checkpoint_every
+    if args.record_ticks:
+        hub_config["tick_record_dir"] = args.record_ticks
+    if not args.no_volume_baseline:
+        hub_config["volume_baseline"] = True
+        # 리플레이는 운영 기준선을 오염시키지 않도록 메모리에서만 (경로를 직접 준 경우 제외)
+        vb_path = args.volume_baseline or (None if args.replay else os.path.join(BASE_DIR, 'logs', 'volume_baseline.vbl'))
+        if vb_path:
+            hub_config["volume_baseline_path"] = vb_path
+    if not args.no_indicators:
+        hub_config["indicators"] = True
+        if args.indicator_warmup:
+            hub_config["indicator_warmup_dir"] = args.indicator_warmup
+    replay_router = None
+    if args.replay:
+        from hub.replay import REPLAY_CONFIG, make_replay_router
+        hub_config.update(REPLAY_CONFIG)
+        replay_router = make_replay_router(float(cfg.budget or 0.0))
 
     logger.info("=== DAYTRADE RUN START ===")
     logger.info("symbols=%s, max_ticks=%s, real_mode=%s, budget=%s, note=%s",
@@ -340,7 +409,7 @@ def main():
         symbols=args.symbols,           # HubTrade 생성자 인자
         exit_rules=exit_rules,
         # 아래는 HubTrade가 사용한다면 전달; 아니면 무시됨
-        scorer=None, risk=None, router=None,
+        scorer=None, risk=None, router=replay_router,
         config=hub_config,
     )
 
@@ -369,11 +438,17 @@ def main():
     # 실행
     session_result: dict = {}
     try:
-        session_result = hub.run(symbols=args.symbols, max_ticks=args.max_ticks, ctx=sector_ctx)
+        if args.replay:
+            from hub.replay import ReplayEngine, read_tick_source
+            session_result = ReplayEngine(hub.hub).run(read_tick_source(args.replay), ctx=sector_ctx).as_dict()
+        else:
+            session_result = hub.run(symbols=args.symbols, max_ticks=args.max_ticks, ctx=sector_ctx)
     except KeyboardInterrupt:
         logger.warning("사용자 중단(KeyboardInterrupt)")
     except Exception as e:
         logger.exception("허브 실행 중 예외: %s", e)
+    finally:
+        hub.close()
 
     # 요약 저장
     summary = {
@@ -395,6 +470,7 @@ def main():
             "sector_exposure_keys": list((sector_ctx.get("sector_exposure") or {}).keys()),
         },
         "result": session_result,
+        "latency": hub.latency_summary(),
         "ended_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
     summary_path = os.path.join(BASE_DIR, 'logs', f'daytrade_{today}.summary.json')
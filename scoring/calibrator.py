@@ -3,21 +3,39 @@
 scoring/calibrator.py - 온라인 가중치 보정기(v0)
 - 최근 성과(PnL%)를 누적해 작은 학습률로 feature 가중치를 미세 조정
 - 안전장치: 1회 변경폭 클리핑, 음수 방지, 총합=1 정규화
+- 피처 기여도: record_pnl(pnl, features=진입 시점 피처 값) → attribution() = 피처별 평균(pnl × 피처)
 """
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Optional, Sequence
 from collections import deque
 
+# ScoreEngine FeatureVector.values() 순서
+_FEATURES = ("volume", "tickflow", "ta", "news")
+
 class Calibrator:
     def __init__(self, lr: float = 0.02, hist: int = 100, clip: float = 0.05):
         self.lr = lr
         self.hist = hist
         self.clip = clip
         self._pnl = deque(maxlen=hist)
+        self._attr = deque(maxlen=hist)   # (pnl, 피처 값 튜플)
 
     # 전략이 실현 손익(%)을 알게 되는 시점마다 호출
-    def record_pnl(self, pnl_pct: float) -> None:
+    def record_pnl(self, pnl_pct: float, features: Optional[Sequence[float]] = None) -> None:
         self._pnl.append(pnl_pct)
+        if features is not None:
+            self._attr.append((pnl_pct, tuple(features)))
+
+    def attribution(self) -> Dict[str, float]:
+        """피처별 평균(pnl × 피처 값): 양수면 그 피처가 높을 때 진입한 거래가 수익 (기록 없으면 빈 dict)"""
+        if not self._attr:
+            return {}
+        acc = [0.0] * len(_FEATURES)
+        for pnl, vals in self._attr:
+            for i, v in enumerate(vals[:len(_FEATURES)]):
+                acc[i] += pnl * v
+        n = len(self._attr)
+        return {k: a / n for k, a in zip(_FEATURES, acc)}
 
     def _signal(self) -> float:
         if not self._pnl:
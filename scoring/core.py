@@ -1,11 +1,22 @@
 ﻿# -*- coding: utf-8 -*-
 """
 scoring/core.py — v2 + Calibrator 연결 (feature engine + robust compatibility)
+- evaluate_many: 스냅샷 배치 → N×F 피처 행렬(벡터 커널) → 가중합/클리핑 (evaluate 와 비트 단위 동일)
+- 가중치는 FEATURES 순서 float 튜플로 컴파일해 두고 변경 시에만 재컴파일 (weights_version 증가)
+  변경 경로: weights 대입 / maybe_adjust_weights(Calibrator) / reload_weights(설정 재적재·외부 수정)
+- features(snapshot) → FeatureVector: 피처/폴백/뉴스를 한 번만 계산 (상태 있는 폴백도 한 번만 전진)
+  begin_tick(tick) 이후에는 (symbol, tick) 으로 메모 → evaluate/score_with_detail/lookup 이 같은 결과 공유
 """
 from __future__ import annotations
-from typing import Dict, Any, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Mapping, Sequence, Tuple, Optional
 import os
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 evaluate_many 는 evaluate 반복
+    np = None  # type: ignore
+
 # 뉴스 감정 스코어 (없으면 0.0 폴백)
 try:
     from scoring.features.news_sentiment import score as news_senti_score
@@ -19,7 +30,7 @@ try:
 except Exception:
     Calibrator = None  # type: ignore
 
-__all__ = ["ScoreEngine"]
+__all__ = ["ScoreEngine", "FeatureVector", "FEATURES"]
 
 # ===== 안전 임포트 (실제 모듈 없을 때 폴백 스텁) =====
 try:
@@ -35,17 +46,22 @@ except Exception:  # 폴백 Weights
             return {"volume": self.volume, "tickflow": self.tickflow, "ta": self.ta, "news": self.news}
 
 # 피처 함수: 각 모듈이 없으면 기본 0.0 반환으로 안전 대체
+# (_NATIVE_FEATURES: 세 모듈 모두 로드됐을 때만 evaluate_many 가 각 모듈의 배열 커널 사용 —
+#  스칼라 함수와 배열 커널은 같은 모듈에 함께 정의되어 있음)
+_NATIVE_FEATURES = True
 try:
-    from .features.volume import volume_surge  # type: ignore
+    from .features.volume import surge_many, volume_surge  # type: ignore
 except Exception:
+    _NATIVE_FEATURES = False
     def volume_surge(snapshot: Dict[str, Any]) -> float:  # type: ignore
         vol = _get(snapshot, "volume", 0.0)
         base = 500.0
         return max(-1.0, min(1.0, (float(vol) - base) / base)) if vol is not None else 0.0
 
 try:
-    from .features.tickflow import tick_flow  # type: ignore
+    from .features.tickflow import flow_many, tick_flow  # type: ignore
 except Exception:
+    _NATIVE_FEATURES = False
     _last_price_glob: Dict[str, float] = {}
     def tick_flow(snapshot: Dict[str, Any]) -> float:  # type: ignore
         sym = str(_get(snapshot, "symbol", "NA"))
@@ -58,8 +74,9 @@ except Exception:
         return max(-1.0, min(1.0, mom * 50.0))
 
 try:
-    from .features.ta import ma_cross  # type: ignore
+    from .features.ta import cross_many, ma_cross  # type: ignore
 except Exception:
+    _NATIVE_FEATURES = False
     def ma_cross(snapshot: Dict[str, Any]) -> float:  # type: ignore
         # 모멘텀 부호 기반 간단 대체
         sym = str(_get(snapshot, "symbol", "NA"))
@@ -134,27 +151,191 @@ def _resolve_weight(wsrc: Any, key: str, default: float) -> float:
         return _coerce_float(getattr(wsrc, key), default)
     return float(default)
 
+# ===== 배치 피처 입력 (피처 커널은 scoring/features 각 모듈) =====
+# 피처 행렬 열 순서 (evaluate 의 가중합 순서와 같음)
+FEATURES = ("volume", "tickflow", "ta", "news")
+# 가중치 원천에 키가 없을 때 기본값 (FEATURES 순서)
+_DEFAULT_WEIGHTS = (0.45, 0.35, 0.20, 0.10)
+
+
+def _compile_weights(wsrc: Any) -> Tuple[float, float, float, float]:
+    """가중치 원천(Weights/dict/객체) → FEATURES 순서 float 튜플 (to_dict 는 1회만 호출)"""
+    if wsrc is not None and not isinstance(wsrc, dict) and hasattr(wsrc, "to_dict"):
+        try:
+            wsrc = dict(wsrc.to_dict() or {})
+        except Exception:
+            wsrc = {}
+    wv, wf, wa, wn = (_resolve_weight(wsrc, k, d) for k, d in zip(FEATURES, _DEFAULT_WEIGHTS))
+    return wv, wf, wa, wn
+
+
+_NUM = (int, float)
+
+
+def _batch_inputs(snaps: Sequence[Any]):
+    """
+    스냅샷 행 → 피처 입력 열 (행 단위 파이썬은 필드 추출뿐).
+    숫자가 아닌 입력(문자열/prints 목록 등)은 그 행만 스칼라 피처 함수로 계산해 override 에 둠.
+    """
+    n = len(snaps)
+    syms: List[str] = [""] * n
+    price = [0.0] * n
+    curr = [0.0] * n
+    avg = [0.0] * n
+    buy = [0.0] * n
+    sell = [0.0] * n
+    fast = [0.0] * n
+    slow = [0.0] * n
+    ta_ok = [False] * n
+    flow_over: Dict[int, float] = {}
+    for i, s in enumerate(snaps):
+        syms[i] = str(_get(s, "symbol", "NA"))
+        price[i] = float(_get(s, "price", 0.0) or 0.0)
+        if not isinstance(s, dict):
+            continue  # 피처 함수는 dict 만 지원 → evaluate 에서도 예외 → 0.0
+        g = s.get
+        try:
+            c = float(g("curr_vol") or g("volume") or 0.0)
+            a = float(g("avg_vol") or g("volume_avg") or 0.0)
+            curr[i], avg[i] = c, a
+        except Exception:
+            pass  # avg=0 → 0.0
+        b, sv = g("buy_vol"), g("sell_vol")
+        if isinstance(b, _NUM) and isinstance(sv, _NUM):
+            buy[i], sell[i] = b, sv
+        else:
+            try:
+                flow_over[i] = float(tick_flow(s))
+            except Exception:
+                flow_over[i] = 0.0
+        f, sl = g("fast"), g("slow")
+        if f is not None and sl is not None:
+            try:
+                fast[i], slow[i] = float(f), float(sl)
+                ta_ok[i] = True
+            except (TypeError, ValueError):
+                pass
+    return syms, price, curr, avg, buy, sell, fast, slow, ta_ok, flow_over
+
+
+def _columns_inputs(cols: Mapping[str, Any]):
+    """컬럼형 배치 {"symbol": [...], "price": [...], "volume": [...], ...} → 피처 입력 열"""
+    syms = [str(x) for x in cols["symbol"]]
+    n = len(syms)
+    zero = np.zeros(n)
+
+    def col(name: str):
+        v = cols.get(name)
+        return zero if v is None else np.asarray(v, dtype=float)
+
+    def first(a, b):  # `a or b` (0 이면 다음 후보)
+        return np.where(a != 0, a, b)
+
+    # buy/sell 열이 없으면 0 → 합<=0 → 0.0 (prints 폴백과 같은 결과)
+    has_ta = cols.get("fast") is not None and cols.get("slow") is not None
+    return (syms, col("price"), first(col("curr_vol"), col("volume")), first(col("avg_vol"), col("volume_avg")),
+            col("buy_vol"), col("sell_vol"), col("fast"), col("slow"), np.full(n, has_ta), {})
+
+
+@dataclass
+class FeatureVector:
+    """심볼 한 틱의 피처 평가 결과 (틱당 1회 계산, ScoreEngine 메모에 공유)"""
+    symbol: str
+    tick: Any                      # begin_tick 값 (메모 미사용이면 None)
+    volume: float
+    tickflow: float
+    ta: float
+    news: float
+    fallback: Tuple[float, ...]    # 모든 피처가 0일 때 적용한 폴백 가산 (모멘텀, 임계값 순)
+    score: float = 0.0
+    weights_version: int = 0       # score 를 계산한 가중치 버전
+
+    def values(self) -> Tuple[float, float, float, float]:
+        """FEATURES 순서 피처 값"""
+        return self.volume, self.tickflow, self.ta, self.news
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"volume": self.volume, "tickflow": self.tickflow, "ta": self.ta, "news": self.news,
+                "score": self.score}
+
+
+def _fallback_adjust(sym: str, price: float, buy_max: float, sell_min: float) -> Tuple[float, ...]:
+    """모든 피처가 0인 스냅샷의 임계값 폴백 가산값 (_state_prev_price 를 1회 전진)"""
+    adj: Tuple[float, ...] = ()
+    prev = _state_prev_price.get(sym)
+    if prev is not None and prev > 0:
+        mom = (price / prev - 1.0)
+        adj = (max(-1.0, min(1.0, mom * 50.0)) * 0.2,)
+    _state_prev_price[sym] = price
+    if price <= buy_max:
+        adj += (0.5,)
+    elif price >= sell_min:
+        adj += (-0.5,)
+    return adj
+
+
 # ===== 본체 =====
 class ScoreEngine:
     def __init__(self,
                  weights: Weights | Dict[str, Any] | None = None,
                  calibrator: Optional['Calibrator'] = None,
                  logger=None):
-        self.weights = weights or Weights()
+        self.weights_version = 0
+        self.weights = weights or Weights()   # setter 가 가중치 벡터 컴파일
         self.calibrator = calibrator
         self.log = logger
+        # 뉴스 감정은 벽시계/최신 파일을 읽음 → 리플레이처럼 결정성이 필요하면 False
+        self.use_news = True
 
         # 임계값 폴백(피처가 모두 0일 때 대비)
         self.BUY_MAX = float(os.getenv("SCORE_BUY_MAX", 10.15))
         self.SELL_MIN = float(os.getenv("SCORE_SELL_MIN", 10.35))
 
+        # (symbol, tick) 메모: 현재 틱의 FeatureVector + 직전 evaluate_many 결과(조회 시 지연 생성)
+        self._tick: Any = None
+        self._memo: Dict[str, FeatureVector] = {}
+        self._batch_memo: Optional[Tuple[Dict[str, int], Any, List[float], Dict[int, Tuple[float, ...]], int]] = None
+
+    # ====== 가중치 ======
+    @property
+    def weights(self) -> Any:
+        return self._weights
+
+    @weights.setter
+    def weights(self, value: Any) -> None:
+        self._weights = value
+        self._compile()
+
+    def _compile(self) -> None:
+        self._wvec = _compile_weights(self._weights)
+        self.weights_version += 1
+
+    @property
+    def weight_vector(self) -> Tuple[float, float, float, float]:
+        """컴파일된 가중치 (FEATURES 순서)"""
+        return self._wvec
+
+    def reload_weights(self, weights: Any = None) -> int:
+        """
+        설정 재적재 훅: weights 를 주면 교체, 없으면 현재 원천을 다시 컴파일
+        (Weights 필드를 엔진 밖에서 직접 바꾼 경우 호출). 반환: weights_version
+        """
+        if weights is not None:
+            self.weights = weights
+        else:
+            self._compile()
+        return self.weights_version
+
     # ====== 보정기 훅 ======
-    def on_realized_pnl(self, pnl_pct: float) -> None:
-        """체결/청산 등으로 확정된 실현 손익(%)을 보정기에 전달."""
+    def on_realized_pnl(self, pnl_pct: float, features: Optional[FeatureVector] = None) -> None:
+        """체결/청산 등으로 확정된 실현 손익(%)을 보정기에 전달 (features: 진입 시점 FeatureVector)."""
         if not self.calibrator:
             return
         try:
-            self.calibrator.record_pnl(float(pnl_pct))
+            if features is None:
+                self.calibrator.record_pnl(float(pnl_pct))
+            else:
+                self.calibrator.record_pnl(float(pnl_pct), features=features.values())
         except Exception as e:
             if self.log:
                 self.log.warning(f"[Calibrator] record_pnl error: {e}")
@@ -171,14 +352,11 @@ class ScoreEngine:
                 wdict = dict(self.weights)
             else:
                 # 객체 속성 접근 시도
-                wdict = {
-                    "volume": _resolve_weight(self.weights, "volume", 0.45),
-                    "tickflow": _resolve_weight(self.weights, "tickflow", 0.35),
-                    "ta": _resolve_weight(self.weights, "ta", 0.20),
-                    "news": _resolve_weight(self.weights, "news", 0.10),
-                }
+                wdict = dict(zip(FEATURES, self._wvec))
 
             new_w = self.calibrator.adjust(wdict)
+            if new_w == wdict:
+                return  # 변화 없음 → 재컴파일 생략
 
             # self.weights가 객체(Weights)면 필드에 반영, dict면 교체
             if hasattr(self.weights, "to_dict"):
@@ -192,6 +370,8 @@ class ScoreEngine:
                 for k, v in new_w.items():
                     if hasattr(self.weights, k):
                         setattr(self.weights, k, float(v))
+            if self.weights is not new_w:   # dict 교체는 setter 가 이미 재컴파일
+                self._compile()
 
             if self.log:
                 self.log.info(f"[Calibrator] weights adjusted -> {new_w}")
@@ -199,12 +379,37 @@ class ScoreEngine:
             if self.log:
                 self.log.warning(f"[Calibrator] adjust error: {e}")
 
-    # ====== 스코어링 ======
-    def evaluate(self, snapshot: Any) -> float:
-        """피처*가중치 합 + (뉴스 감정) / 예외 시 폴백.
+    # ====== 피처 메모 ======
+    def begin_tick(self, tick: Any) -> None:
+        """새 틱 시작: 이후 features() 결과를 (symbol, tick) 으로 메모 (이전 틱 메모는 폐기)"""
+        if tick != self._tick:
+            self._tick = tick
+            self._memo.clear()
+            self._batch_memo = None
+
+    def lookup(self, symbol: str) -> Optional[FeatureVector]:
+        """현재 틱에 이미 계산된 FeatureVector (없으면 None, 계산하지 않음)"""
+        fv = self._memo.get(symbol)
+        if fv is None and self._batch_memo is not None:
+            index, X, out, fb, ver = self._batch_memo
+            i = index.get(symbol)
+            if i is not None:
+                fv = FeatureVector(symbol, self._tick, *X[i].tolist(), fallback=fb.get(i, ()),
+                                   score=out[i], weights_version=ver)
+                self._memo[symbol] = fv
+        if fv is not None and fv.weights_version != self.weights_version:
+            self._combine(fv)   # 틱 중간 가중치 변경 → 피처 재계산 없이 점수만 갱신
+        return fv
+
+    def features(self, snapshot: Any) -> FeatureVector:
+        """피처 3종 + 폴백 + 뉴스 감정을 1회 계산한 FeatureVector (begin_tick 이후엔 메모 재사용)
         snapshot은 dict/obj/tuple(심볼,가격) 모두 허용.
         """
         sym = str(_get(snapshot, "symbol", "NA"))
+        if self._tick is not None:
+            fv = self.lookup(sym)
+            if fv is not None:
+                return fv
         price = float(_get(snapshot, "price", 0.0) or 0.0)
 
         # --- 피처 산출 (예외 독립 처리)
@@ -221,40 +426,128 @@ class ScoreEngine:
         except Exception:
             f_ta = 0.0
 
-        # --- 가중치
-        wv = _resolve_weight(self.weights, "volume", 0.45)
-        wf = _resolve_weight(self.weights, "tickflow", 0.35)
-        wa = _resolve_weight(self.weights, "ta", 0.20)
-        wn = _resolve_weight(self.weights, "news", 0.10)  # 새로 추가
-
-        # --- 기본 점수
-        score = wv * f_vol + wf * f_flow + wa * f_ta
-
         # --- 모든 피처가 0이면 임계값 폴백
+        fb: Tuple[float, ...] = ()
         if (f_vol, f_flow, f_ta) == (0.0, 0.0, 0.0):
-            prev = _state_prev_price.get(sym)
-            if prev is not None and prev > 0:
-                mom = (price / prev - 1.0)
-                score += max(-1.0, min(1.0, mom * 50.0)) * 0.2
-            _state_prev_price[sym] = price
-            if price <= self.BUY_MAX:
-                score += 0.5
-            elif price >= self.SELL_MIN:
-                score -= 0.5
-
-        # --- 뉴스 감정 합산 (예외 안전)
+            fb = _fallback_adjust(sym, price, self.BUY_MAX, self.SELL_MIN)
+
+        # --- 뉴스 감정 (예외 안전)
+        news_s = self._news(sym)
+
+        fv = FeatureVector(sym, self._tick, f_vol, f_flow, f_ta, news_s, fb)
+        self._combine(fv)
+        if self._tick is not None:
+            self._memo[sym] = fv
+        return fv
+
+    def _news(self, sym: str) -> float:
+        if not self.use_news:
+            return 0.0
         try:
-            news_s = float(news_senti_score(sym))
+            return float(news_senti_score(sym))
         except Exception:
-            news_s = 0.0
-        score += wn * news_s
+            return 0.0
+
+    def reset_state(self) -> None:
+        """피처 메모 + 모듈 전역 폴백 상태(_state_prev_price, 틱플로우 폴백 직전가) 초기화 — 리플레이 시작 시"""
+        _state_prev_price.clear()
+        glob = globals().get("_last_price_glob")
+        if glob is not None:
+            glob.clear()
+        self._tick = None
+        self._memo.clear()
+        self._batch_memo = None
 
+    def _combine(self, fv: FeatureVector) -> None:
+        """컴파일된 가중치로 점수 합성 (evaluate 의 기존 가산 순서 그대로)"""
+        wv, wf, wa, wn = self._wvec
+        score = wv * fv.volume + wf * fv.tickflow + wa * fv.ta
+        for adj in fv.fallback:
+            score += adj
+        score += wn * fv.news
         # --- 정규화
         if score > 1.0:
             score = 1.0
         if score < -1.0:
             score = -1.0
-        return float(score)
+        fv.score = float(score)
+        fv.weights_version = self.weights_version
+
+    # ====== 스코어링 ======
+    def evaluate(self, snapshot: Any) -> float:
+        """피처*가중치 합 + (뉴스 감정) / 예외 시 폴백.
+        snapshot은 dict/obj/tuple(심볼,가격) 모두 허용.
+        """
+        return self.features(snapshot).score
+
+    def evaluate_many(self, snapshots: Any, return_features: bool = False) -> Any:
+        """
+        배치 평가: 스냅샷 목록(dict/obj/tuple) 또는 컬럼형 {"symbol": [...], "price": [...], ...}.
+        N×F 피처 행렬 X(열: FEATURES)를 벡터 커널로 만들고 가중치 벡터와 곱해 클리핑.
+        - 가중합은 열 순서대로 누적 (BLAS 내적은 합산 순서가 달라 마지막 비트가 evaluate 와 어긋남)
+        - 모든 피처가 0인 행의 임계값 폴백(_state_prev_price)은 행 순서대로 순차 적용
+          (begin_tick 이후 이미 메모된 심볼은 폴백을 다시 전진시키지 않고 메모 값 사용)
+        - begin_tick 이후면 결과를 메모 → lookup/features 가 행별 FeatureVector 를 지연 생성
+        - 뉴스 감정은 배치 안 심볼별 1회 조회
+        반환: 점수 list (return_features=True 면 (점수 list, X))
+        """
+        columnar = isinstance(snapshots, Mapping) and "symbol" in snapshots
+        if np is None or not _NATIVE_FEATURES:
+            rows = snapshots if not columnar else [
+                dict(zip(snapshots.keys(), vals)) for vals in zip(*snapshots.values())]
+            scores = [self.evaluate(r) for r in rows]
+            return (scores, None) if return_features else scores
+
+        syms, price, curr, avg, buy, sell, fast, slow, ta_ok, flow_over = (
+            _columns_inputs(snapshots) if columnar else _batch_inputs(snapshots))
+        n = len(syms)
+        X = np.zeros((n, len(FEATURES)))
+        if n == 0:
+            return ([], X) if return_features else []
+
+        # --- 피처 열: 스칼라 피처 함수와 같은 모듈의 배열 커널
+        X[:, 0] = surge_many(np.asarray(curr, dtype=float), np.asarray(avg, dtype=float))
+        X[:, 1] = flow_many(np.asarray(buy, dtype=float), np.asarray(sell, dtype=float))
+        for i, v in flow_over.items():
+            X[i, 1] = v
+        X[:, 2] = cross_many(np.asarray(fast, dtype=float), np.asarray(slow, dtype=float), np.asarray(ta_ok))
+
+        wv, wf, wa, wn = self._wvec
+
+        score = wv * X[:, 0]
+        score = score + wf * X[:, 1]
+        score = score + wa * X[:, 2]
+
+        # --- 모든 피처가 0인 행: 임계값 폴백 (심볼 상태가 있어 행 순서대로)
+        zero_rows = np.flatnonzero((X[:, 0] == 0.0) & (X[:, 1] == 0.0) & (X[:, 2] == 0.0))
+        fbs: Dict[int, Tuple[float, ...]] = {}
+        if len(zero_rows):
+            px = price if isinstance(price, list) else price.tolist()
+            memo = self._tick is not None
+            for i in zero_rows.tolist():
+                hit = self.lookup(syms[i]) if memo else None
+                adj = hit.fallback if hit is not None else _fallback_adjust(
+                    syms[i], float(px[i]), self.BUY_MAX, self.SELL_MIN)
+                sc = float(score[i])
+                for a in adj:
+                    sc += a
+                score[i] = sc
+                fbs[i] = adj
+
+        # --- 뉴스 감정: 심볼별 1회
+        senti: Dict[str, float] = {}
+        for sym in syms:
+            if sym not in senti:
+                senti[sym] = self._news(sym)
+        X[:, 3] = [senti[sym] for sym in syms]
+        score = score + wn * X[:, 3]
+
+        out = np.clip(score, -1.0, 1.0).tolist()
+        if self._tick is not None:
+            self._batch_memo = ({sym: i for i, sym in enumerate(syms)}, X, out, fbs, self.weights_version)
+            for sym in syms:
+                self._memo.pop(sym, None)   # 이번 배치 결과가 최신
+        return (out, X) if return_features else out
 
     # ===== 호환 메서드 =====
     def score(self, tick: Any) -> float:
@@ -270,18 +563,6 @@ class ScoreEngine:
             snap = {"symbol": _get(tick, "symbol", "NA"), "price": _get(tick, "price", 0.0)}
         else:
             snap = tick
-        # 상세 피처 계산(예외 안전)
-        try:
-            f_vol = float(volume_surge(snap))
-        except Exception:
-            f_vol = 0.0
-        try:
-            f_flow = float(tick_flow(snap))
-        except Exception:
-            f_flow = 0.0
-        try:
-            f_ta = float(ma_cross(snap))
-        except Exception:
-            f_ta = 0.0
-        s = self.evaluate(snap)
-        return s, {"volume": f_vol, "tickflow": f_flow, "ta": f_ta}  # news는 전체 점수에 합산됨
+        # evaluate 와 같은 FeatureVector 1회 계산 (상태 있는 폴백을 두 번 전진시키지 않음)
+        fv = self.features(snap)
+        return fv.score, {"volume": fv.volume, "tickflow": fv.tickflow, "ta": fv.ta, "news": fv.news}
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+scoring/features/_array.py — 피처 배열 커널(*_many) 공용: 선택 의존 NumPy + 클리핑
+NumPy 가 없으면 np=None — 배열 커널은 scoring.core.evaluate_many 에서만 쓰이고, 그 경우 evaluate 반복으로 대체됨
+"""
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+
+def clip_many(x, lo: float = -1.0, hi: float = 1.0):
+    """max(lo, min(hi, x)) 의 배열판 — NaN 은 min(hi, nan)=hi 규칙대로 hi"""
+    return np.where(np.isnan(x), hi, np.clip(x, lo, hi))
@@ -5,9 +5,11 @@
         심볼(코드/별칭)과 매칭되는 문장의 감정을 -1.0 ~ +1.0로 산출.
 - 의존: 외부 라이브러리 없음 (키워드 기반 간단 감정 사전)
 - 없으면 0.0(중립) 반환 → 안전한 기본값
+- 파일 내용은 모듈 캐시: REFRESH_SEC 마다 (인덱스/최신 뉴스/별칭) 파일 mtime 만 확인해 바뀌었을 때 재적재,
+  키워드 점수는 심볼별 메모 (심볼 수천 개를 매 틱 평가해도 파일 I/O 는 주기당 stat 몇 번)
 """
 from __future__ import annotations
-import json, re
+import json, re, time
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -15,6 +17,7 @@ ROOT = Path(__file__).resolve().parents[2]   # project root
 NEWS_DIR = ROOT / "news_logs"
 SENTI_FILE = NEWS_DIR / "sentiment_index.json"   # 선택 사항(있으면 최우선)
 ALIASES_FILE = NEWS_DIR / "aliases.json"         # 선택 사항(티커-명칭 매핑)
+REFRESH_SEC = 5.0                                 # 파일 변경 확인 주기 (monotonic 초)
 
 # --- 간단 감정 사전 (초기 버전: 필요시 자유 추가/수정) ---
 POS = {"호재","반등","상향","증익","상승","강세","수주","최대","신고가","확대","돌파","개선","好"}
@@ -34,15 +37,19 @@ def _load_aliases() -> dict:
         pass
     return {}
 
-def _latest_news_text() -> str:
-    """news_logs 폴더에서 가장 최근 텍스트 파일 내용을 통으로 읽음."""
+def _latest_news_file() -> Path | None:
     if not NEWS_DIR.exists():
-        return ""
+        return None
     txts = sorted(NEWS_DIR.glob("*.txt"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not txts:
+    return txts[0] if txts else None
+
+def _latest_news_text() -> str:
+    """news_logs 폴더에서 가장 최근 텍스트 파일 내용을 통으로 읽음."""
+    latest = _latest_news_file()
+    if latest is None:
         return ""
     try:
-        return txts[0].read_text(encoding="utf-8", errors="ignore")
+        return latest.read_text(encoding="utf-8", errors="ignore")
     except Exception:
         return ""
 
@@ -62,7 +69,10 @@ def _from_sentiment_index(symbol: str, now: datetime) -> float:
         data = json.loads(SENTI_FILE.read_text(encoding="utf-8"))
     except Exception:
         return 0.0
-    items = data.get(symbol) or []
+    return _index_score(data.get(symbol) or [], now)
+
+def _index_score(items: list, now: datetime) -> float:
+    """인덱스 항목 [{"ts","score"}, ...] → 시간감쇠 가중 평균"""
     if not items:
         return 0.0
 
@@ -90,17 +100,20 @@ def _kw_sentiment_for_symbol(symbol: str, text: str, aliases: set[str]) -> float
     """
     if not text:
         return 0.0
+    return _kw_from_sentences(symbol, _split_sentences(text), aliases)
 
-    # 간단 문장 분리 (마침표/개행 기준)
-    sentences = re.split(r"[.\n\r]+", text)
-    target_sents = []
-    for s in sentences:
+def _split_sentences(text: str) -> list[str]:
+    """간단 문장 분리 (마침표/개행 기준) + 공백 정규화, 빈 문장 제외"""
+    out = []
+    for s in re.split(r"[.\n\r]+", text):
         s2 = _WHITESPACE.sub(" ", s).strip()
-        if not s2:
-            continue
-        # 심볼 코드 또는 별칭이 포함된 문장만 취합
-        if symbol in s2 or any(alias in s2 for alias in aliases):
-            target_sents.append(s2)
+        if s2:
+            out.append(s2)
+    return out
+
+def _kw_from_sentences(symbol: str, sentences: list[str], aliases: set[str]) -> float:
+    # 심볼 코드 또는 별칭이 포함된 문장만 취합
+    target_sents = [s for s in sentences if symbol in s or any(alias in s for alias in aliases)]
 
     if not target_sents:
         return 0.0
@@ -123,23 +136,58 @@ def _kw_sentiment_for_symbol(symbol: str, text: str, aliases: set[str]) -> float
     # 범위 클램프
     return max(-1.0, min(1.0, score))
 
+# --- 파일 캐시 ---
+_cache: dict = {"checked": None, "key": None, "index": {}, "sentences": [], "aliases": {}, "kw": {}}
+
+def _mtime(p: Path | None) -> float | None:
+    try:
+        return p.stat().st_mtime if p is not None else None
+    except OSError:
+        return None
+
+def _refresh(force: bool = False) -> dict:
+    """REFRESH_SEC 가 지났으면 파일 mtime 확인 → 바뀌었으면 인덱스/문장/별칭 재적재 + 키워드 메모 폐기"""
+    c = _cache
+    t = time.monotonic()
+    if not force and c["checked"] is not None and t - c["checked"] < REFRESH_SEC:
+        return c
+    c["checked"] = t
+    latest = _latest_news_file()
+    key = (_mtime(SENTI_FILE), latest, _mtime(latest), _mtime(ALIASES_FILE))
+    if key == c["key"]:
+        return c
+    c["key"] = key
+    try:
+        c["index"] = json.loads(SENTI_FILE.read_text(encoding="utf-8")) if key[0] is not None else {}
+    except Exception:
+        c["index"] = {}
+    c["sentences"] = _split_sentences(_latest_news_text())
+    c["aliases"] = _load_aliases()
+    c["kw"] = {}
+    return c
+
 # === 공개 API ===
 def score(symbol: str, now: datetime | None = None) -> float:
     """
     공개 스코어 함수: -1.0(매우 부정) ~ +1.0(매우 긍정)
     우선순위: sentiment_index.json → 최신 뉴스 텍스트 키워드 매칭
+    (파일은 _refresh 캐시 — 변경 반영까지 최대 REFRESH_SEC 지연)
     """
-    now = now or datetime.now()
-    # 1) 인덱스 우선
-    s = _from_sentiment_index(symbol, now)
-    if s != 0.0:
-        return float(max(-1.0, min(1.0, s)))
-
-    # 2) 키워드 추론
-    text = _latest_news_text()
-    aliases_map = _load_aliases()
-    aliases = aliases_map.get(symbol, set())
-    return _kw_sentiment_for_symbol(symbol, text, aliases)
+    c = _refresh()
+    # 1) 인덱스 우선 (시간감쇠라 메모하지 않음)
+    index = c["index"]
+    items = index.get(symbol) if isinstance(index, dict) else None
+    if items:
+        s = _index_score(items, now or datetime.now())
+        if s != 0.0:
+            return float(max(-1.0, min(1.0, s)))
+
+    # 2) 키워드 추론 (파일이 바뀔 때까지 심볼별 메모)
+    kw = c["kw"]
+    v = kw.get(symbol)
+    if v is None:
+        v = kw[symbol] = _kw_from_sentences(symbol, c["sentences"], c["aliases"].get(symbol, set()))
+    return v
 
 def score_with_decay(symbol: str, ts: datetime, now: datetime | None = None) -> float:
     """
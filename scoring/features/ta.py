@@ -1,4 +1,16 @@
-﻿def ma_cross(snapshot) -> float:
+﻿from ._array import np
+
+def cross(f: float, s: float) -> float:
+    """ma_cross 커널: sign(fast - slow)"""
+    if f > s:  return 1.0
+    if f < s:  return -1.0
+    return 0.0
+
+def cross_many(f, s, ok):
+    """cross 의 배열판 (ok 가 거짓인 행 = fast/slow 없음 → 0)"""
+    return np.where(ok, np.where(f > s, 1.0, np.where(f < s, -1.0, 0.0)), 0.0)
+
+def ma_cross(snapshot) -> float:
     """
     단순 이동평균 크로스:
       fast > slow → +1
@@ -14,6 +26,4 @@
         f = float(fast); s = float(slow)
     except (TypeError, ValueError):
         return 0.0
-    if f > s:  return 1.0
-    if f < s:  return -1.0
-    return 0.0
+    return cross(f, s)
@@ -1,6 +1,22 @@
-﻿def _clip(x: float, lo: float = -1.0, hi: float = 1.0) -> float:
+﻿from ._array import clip_many, np
+
+def _clip(x: float, lo: float = -1.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
+def flow(buy: float, sell: float) -> float:
+    """tick_flow 커널: (buy - sell) / (buy + sell) 클리핑, 합<=0 → 0"""
+    tot = buy + sell
+    if tot <= 0.0:
+        return 0.0
+    return _clip((buy - sell) / tot)
+
+def flow_many(buy, sell):
+    """flow 의 배열판 (원소별 결과가 flow 와 비트 단위 동일)"""
+    tot = buy + sell
+    pos = ~(tot <= 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(pos, clip_many((buy - sell) / np.where(pos, tot, 1.0)), 0.0)
+
 def _from_prints(prints) -> tuple[float, float]:
     buy = sell = 0.0
     for p in prints or []:
@@ -25,8 +41,4 @@ def tick_flow(snapshot) -> float:
     if buy is None or sell is None:
         buy, sell = _from_prints(snapshot.get("prints"))
 
-    tot = (buy or 0.0) + (sell or 0.0)
-    if tot <= 0.0:
-        return 0.0
-    raw = ((buy or 0.0) - (sell or 0.0)) / tot
-    return _clip(raw)
+    return flow(buy or 0.0, sell or 0.0)
@@ -1,6 +1,20 @@
-﻿def _clip(x: float, lo: float = -1.0, hi: float = 1.0) -> float:
+﻿from ._array import clip_many, np
+
+def _clip(x: float, lo: float = -1.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
+def surge(curr: float, avg: float) -> float:
+    """volume_surge 커널: avg<=0 → 0, 아니면 curr/avg - 1 클리핑"""
+    if avg <= 0:
+        return 0.0
+    return _clip(curr / avg - 1.0)
+
+def surge_many(curr, avg):
+    """surge 의 배열판 (원소별 결과가 surge 와 비트 단위 동일, NaN avg 는 비교가 거짓이라 계산 쪽으로)"""
+    ok = ~(avg <= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ok, clip_many(curr / np.where(ok, avg, 1.0) - 1.0), 0.0)
+
 def volume_surge(snapshot) -> float:
     """
     (현재거래량 / 평균거래량) - 1  값을 [-1, 1]로 클리핑.
@@ -8,6 +22,4 @@ def volume_surge(snapshot) -> float:
     """
     curr = float(snapshot.get("curr_vol") or snapshot.get("volume") or 0.0)
     avg  = float(snapshot.get("avg_vol")  or snapshot.get("volume_avg") or 0.0)
-    if avg <= 0:
-        return 0.0
-    return _clip(curr / avg - 1.0)
+    return surge(curr, avg)
@@ -3,11 +3,28 @@
 통합 익절·손절·트레일링 스탑 엔진 (HubTrade 루프 통합 대응판)
 - 개별 룰(TP/SL/Trailing) 통합
 - 배치 API: apply_exit_batch(portfolio, ctx) → [{symbol, qty, price, reason}]
-- 쿨다운/최고가/보유틱 상태 관리
+- 쿨다운/최고가/보유틱 상태 관리 (쿨다운은 common.cooldown 타이밍 휠, 키=(symbol, "exit"))
+- bind_book(PositionBook) 시 최고가/보유틱은 북 컬럼(last_high/hold_ticks)을 직접 읽고 씀
+- 북 API: apply_exit_book(book, ids, prices, tick_index) → 열린 포지션 전체를 한 번에 마스크 평가
+  (NumPy 있으면 TP/SL/트레일링 마스크 벡터 연산, 없으면 같은 규칙의 순수 파이썬 루프)
 """
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
+
+from common.cooldown import CooldownService
+from common.position_book import PositionBook, EXIT_REASONS
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # NumPy 미설치 시 순수 파이썬 경로
+    np = None  # type: ignore
+
+COOLDOWN_REASON = "exit"  # 쿨다운 키 (symbol, COOLDOWN_REASON)
+
+# 청산 코드 (PositionBook.exit_code 와 동일 테이블)
+_NONE, _TP, _SL, _TRAIL = 0, EXIT_REASONS.index("take_profit"), EXIT_REASONS.index("stop_loss"), \
+    EXIT_REASONS.index("trailing_stop")
 
 
 @dataclass
@@ -28,6 +45,37 @@ class ExitResult:
     pnl_pct: Optional[float] = None
 
 
+def _exit_codes_np(p: "ExitParams", price, avg, high, hold=None, pnl=None):
+    """
+    벡터 판정: 행별 청산 코드 배열(int8). 우선순위 TP > SL > 트레일링 (apply_exit 와 동일).
+    hold 가 주어지면 min_hold_ticks 미만 행은 0.
+    """
+    if pnl is None:
+        pnl = np.divide(price, avg, out=np.ones_like(price), where=avg != 0) - 1.0
+    dd = np.divide(price, high, out=np.zeros_like(price), where=high != 0) - 1.0
+    tp = pnl >= p.tp_pct
+    sl = ~tp & (pnl <= p.sl_pct)
+    tr = ~tp & ~sl & (pnl > 0) & (dd <= -p.trailing_pct)
+    codes = np.zeros(price.shape[0], dtype=np.int8)
+    codes[tp] = _TP
+    codes[sl] = _SL
+    codes[tr] = _TRAIL
+    if hold is not None:
+        codes[hold < p.min_hold_ticks] = _NONE
+    return codes
+
+
+def _exit_code(p: "ExitParams", price: float, high: float, pnl: float) -> int:
+    """스칼라 판정 (NumPy 없는 경로)"""
+    if pnl >= p.tp_pct:
+        return _TP
+    if pnl <= p.sl_pct:
+        return _SL
+    if pnl > 0 and high and (price / high - 1.0) <= -p.trailing_pct:
+        return _TRAIL
+    return _NONE
+
+
 class ExitRules:
     """
     ExitRule 통합 엔진.
@@ -51,7 +99,16 @@ class ExitRules:
         self.p = params or ExitParams()
         self.highest_since_entry: Dict[str, float] = {}
         self.hold_ticks: Dict[str, int] = {}
-        self.cooldown_until_tick: Dict[str, int] = {}  # 심볼별 재진입 금지 종료 틱
+        self.cooldowns = CooldownService()  # 재진입 금지(틱) — Hub가 공유 서비스로 교체
+        self.book: Optional[PositionBook] = None
+
+    def bind_cooldowns(self, cooldowns: CooldownService) -> None:
+        """Hub 쿨다운 서비스 공유 (스로틀 정책 등이 같은 키를 조회)"""
+        self.cooldowns = cooldowns
+
+    def bind_book(self, book: Optional[PositionBook]) -> None:
+        """Hub 포지션 북 공유: 북에 있는 심볼은 최고가/보유틱을 북 컬럼에 기록"""
+        self.book = book
 
     # ---------- 상태 훅(선택) ----------
     def on_entry_fill(self, symbol: str, entry_price: float, tick_index: int) -> None:
@@ -59,13 +116,13 @@ class ExitRules:
         self.highest_since_entry[symbol] = entry_price
         self.hold_ticks[symbol] = 0
         # 진입 순간에는 쿨다운 없음
-        self.cooldown_until_tick.pop(symbol, None)
+        self.cooldowns.ticks.cancel((symbol, COOLDOWN_REASON))
 
     def on_exit_fill(self, symbol: str, tick_index: int) -> None:
         """청산 체결 시 쿨다운 시작"""
         self.highest_since_entry.pop(symbol, None)
         self.hold_ticks.pop(symbol, None)
-        self.cooldown_until_tick[symbol] = tick_index + self.p.cooldown_ticks
+        self.cooldowns.ticks.arm((symbol, COOLDOWN_REASON), tick_index + self.p.cooldown_ticks, tick_index)
 
     # ---------- 내부 유틸 ----------
     @staticmethod
@@ -75,18 +132,27 @@ class ExitRules:
     # ---------- 단일 심볼 API (기존 호환용) ----------
     def apply_exit(self, symbol: str, entry_price: float, current_price: float, ctx: Dict[str, Any]) -> ExitResult:
         p = self.p
-        tick_idx = int(ctx.get("tick_index", 0))
-        ticks = self.hold_ticks.get(symbol, 0) + 1
-        self.hold_ticks[symbol] = ticks
+        book = self.book
+        i = book.id_of(symbol) if book is not None else None
+        if i is not None:
+            ticks = book.hold_ticks[i] + 1
+            book.hold_ticks[i] = ticks
+        else:
+            ticks = self.hold_ticks.get(symbol, 0) + 1
+            self.hold_ticks[symbol] = ticks
 
         # 최소 보유틱 미만이면 보류
         if ticks < p.min_hold_ticks:
             return ExitResult(False, reason=f"hold_too_short:{ticks}")
 
         # 최고가 갱신
-        prev_high = self.highest_since_entry.get(symbol, entry_price)
-        new_high = max(prev_high, current_price)
-        self.highest_since_entry[symbol] = new_high
+        if i is not None:
+            new_high = max(book.last_high[i] or entry_price, current_price)
+            book.last_high[i] = new_high
+        else:
+            prev_high = self.highest_since_entry.get(symbol, entry_price)
+            new_high = max(prev_high, current_price)
+            self.highest_since_entry[symbol] = new_high
 
         pnl = self._pnl_pct(entry_price, current_price)
 
@@ -117,6 +183,8 @@ class ExitRules:
         pnl_ctx: Dict[str, float] = ctx.get("pnl_open_pct", {}) or {}
         tick_idx: int = int(ctx.get("tick_index", 0))
 
+        # 1) 상태 갱신(보유틱/최고가)만 루프에서 하고, 판정은 한 번에
+        rows: List[tuple] = []
         for sym, pos in portfolio.items():
             qty = int(pos.get("qty", 0) or 0)
             if qty <= 0:
@@ -145,34 +213,99 @@ class ExitRules:
             pnl_now = pnl_ctx.get(sym)
             if pnl_now is None:
                 pnl_now = self._pnl_pct(avg_price, price_now)
-
-            # 룰 판단
-            reason: Optional[str] = None
-
-            if pnl_now >= p.tp_pct:
-                reason = "take_profit"
-            elif pnl_now <= p.sl_pct:
-                reason = "stop_loss"
-            else:
-                drawdown_from_high = (price_now / new_high - 1.0)
-                if pnl_now > 0 and drawdown_from_high <= -p.trailing_pct:
-                    reason = "trailing_stop"
-
-            if reason:
+            rows.append((sym, qty, float(price_now), float(new_high), float(pnl_now)))
+
+        if not rows:
+            return results
+
+        # 2) 룰 판단
+        if np is not None:
+            _, _, px, hi, pnl = zip(*rows)
+            px_a = np.fromiter(px, dtype=np.float64, count=len(rows))
+            codes = _exit_codes_np(p, px_a, None, np.fromiter(hi, dtype=np.float64, count=len(rows)),
+                                   pnl=np.fromiter(pnl, dtype=np.float64, count=len(rows))).tolist()
+        else:
+            codes = [_exit_code(p, px, hi, pnl) for _, _, px, hi, pnl in rows]
+
+        for (sym, qty, price_now, _, _), code in zip(rows, codes):
+            if code:
                 # 청산 결정
                 results.append({
                     "symbol": sym,
                     "qty": qty,
-                    "price": float(price_now),
-                    "reason": reason,
+                    "price": price_now,
+                    "reason": EXIT_REASONS[code],
                 })
                 # 쿨다운 시작 및 상태 리셋
                 self.on_exit_fill(sym, tick_idx)
 
         return results
 
+    # ---------- 북 API (Hub 전용, 벡터) ----------
+    def apply_exit_book(
+        self,
+        book: PositionBook,
+        ids: Sequence[int],
+        prices: Sequence[float],
+        tick_index: int,
+    ) -> List[dict]:
+        """
+        열린 포지션 행(ids)과 현재가(prices)로 TP/SL/트레일링을 한 번에 판정.
+        - 북 컬럼 hold_ticks +1, last_high 갱신 (제자리)
+        - min_hold_ticks 미만 행은 제외, 청산 행은 재진입 쿨다운 시작
+        반환: [{symbol, qty, price, reason, pnl_pct}]
+        """
+        if not len(ids):
+            return []
+        p = self.p
+        if np is not None:
+            idx = np.asarray(ids, dtype=np.intp)
+            px = np.asarray(prices, dtype=np.float64)
+            hold_col = book.view("hold_ticks")
+            high_col = book.view("last_high")
+            hold_col[idx] += 1
+            avg = book.view("avg_price")[idx]
+            high = high_col[idx]
+            high = np.maximum(np.where(high > 0, high, avg), px)
+            high_col[idx] = high
+            codes = _exit_codes_np(p, px, avg, high, hold=hold_col[idx])
+            hit = np.flatnonzero(codes).tolist()
+            codes = codes.tolist()
+            del hold_col, high_col  # 북 버퍼 뷰 해제 (이후 intern 시 BufferError 방지)
+        else:
+            hold_col, high_col, avg_col = book.hold_ticks, book.last_high, book.avg_price
+            codes, hit = [], []
+            for k, (i, price) in enumerate(zip(ids, prices)):
+                hold_col[i] += 1
+                a = avg_col[i]
+                high = max(high_col[i] or a, price)
+                high_col[i] = high
+                code = _NONE
+                if hold_col[i] >= p.min_hold_ticks:
+                    code = _exit_code(p, price, high, self._pnl_pct(a, price))
+                codes.append(code)
+                if code:
+                    hit.append(k)
+
+        exits: List[dict] = []
+        until = tick_index + p.cooldown_ticks
+        wheel = self.cooldowns.ticks
+        syms, qty, avg_col = book.symbols, book.qty, book.avg_price
+        for k in hit:
+            i = ids[k]
+            sym = syms[i]
+            price = float(prices[k])
+            exits.append({
+                "symbol": sym,
+                "qty": int(qty[i]),
+                "price": price,
+                "reason": EXIT_REASONS[codes[k]],
+                "pnl_pct": self._pnl_pct(avg_col[i], price),
+            })
+            wheel.arm((sym, COOLDOWN_REASON), until, tick_index)
+        return exits
+
     # ---------- 보조: 재진입 가능 여부(선택) ----------
     def can_reenter(self, symbol: str, tick_index: int) -> bool:
         """허브에서 신규 진입 전에 호출하면 쿨다운 존중 가능 (선택)"""
-        until = self.cooldown_until_tick.get(symbol)
-        return True if until is None else (tick_index >= until)
+        return not self.cooldowns.ticks.active((symbol, COOLDOWN_REASON), tick_index)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/bench_exit_engine.py — 보유 포지션 청산 판정 마이크로벤치
+
+- before: 포지션마다 ExitRules.apply_exit 호출 (구 Hub 루프 방식)
+- after : ExitRules.apply_exit_book 1회 호출 (PositionBook 컬럼 마스크 판정)
+- 가격은 평단 ±0.5% 안에서 흔들어 대부분 '보유'로 남게 함 (판정 비용만 측정)
+
+사용: python scripts/bench_exit_engine.py --positions 1000 10000 --rounds 50
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.position_book import PositionBook
+from scoring.rules.exit_rules import ExitRules, ExitParams, np
+
+
+def run(n_positions: int, rounds: int) -> None:
+    rng = random.Random(0)
+    params = ExitParams(min_hold_ticks=1, tp_pct=1.0, sl_pct=-1.0)  # 청산 없이 판정만 반복
+    book = PositionBook()
+    symbols = [f"{i:06d}" for i in range(n_positions)]
+    for sym in symbols:
+        book.open(sym, 10, rng.uniform(1_000, 100_000))
+    ids = book.open_ids()
+    avg = [book.avg_price[i] for i in ids]
+    ticks = [[a * (1 + rng.uniform(-0.005, 0.005)) for a in avg] for _ in range(rounds)]
+
+    single = ExitRules(params)
+    t0 = time.perf_counter()
+    for t, prices in enumerate(ticks, 1):
+        ctx = {"tick_index": t}
+        for sym, a, px in zip(symbols, avg, prices):
+            single.apply_exit(sym, a, px, ctx)
+    before = (time.perf_counter() - t0) / rounds
+
+    vec = ExitRules(params)
+    t0 = time.perf_counter()
+    for t, prices in enumerate(ticks, 1):
+        vec.apply_exit_book(book, ids, prices, t)
+    after = (time.perf_counter() - t0) / rounds
+
+    print(f"positions={n_positions} rounds={rounds} numpy={'yes' if np is not None else 'no'}")
+    print(f"before : {before * 1e3:8.3f} ms/tick")
+    print(f"after  : {after * 1e3:8.3f} ms/tick  (x{before / max(after, 1e-12):.1f})")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--positions", type=int, nargs="+", default=[1_000, 10_000])
+    ap.add_argument("--rounds", type=int, default=50)
+    a = ap.parse_args()
+    for n in a.positions:
+        run(n, a.rounds)
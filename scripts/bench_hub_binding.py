@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/bench_hub_binding.py — Hub 스코어/리스크 호출 오버헤드 마이크로벤치
+
+- before: 매 호출 TypeError 기반 시그니처 탐색 (구 Hub._safe_score/_risk_eval 방식)
+- after : hub.binding 으로 1회 바인딩된 호출자
+- 스코어/리스크 본체는 비워 두어 '디스패치 비용'만 측정
+
+사용: python scripts/bench_hub_binding.py --symbols 500 --rounds 20
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hub.binding import RiskEvalRes, bind_scorer, bind_risk
+
+
+class StubScorer:
+    """ScoreEngine.score(tick) 와 같은 1-인자 시그니처"""
+    def score(self, tick):
+        return 0.1
+
+
+class StubGate:
+    """RiskGate.evaluate(context) 와 같은 1-인자 시그니처"""
+    def evaluate(self, context):
+        return {"allow": True, "reason": "ok"}
+
+
+# ---- before: 구 Hub 의 호출 탐색 루프 ----
+def legacy_score(s, sym, price, ctx):
+    snap = {sym: price}
+    for args in ((sym, price, ctx), (sym, price), (snap, ctx), (snap,), (price,), (sym,), tuple()):
+        try:
+            return float(s.score(*args))
+        except TypeError:
+            continue
+        except Exception:
+            return 0.0
+    return 0.0
+
+
+def legacy_risk(r, symbol, price, portfolio, score, ctx):
+    methods = ("evaluate_entry", "evaluate", "check_entry", "gate", "allow")
+    for meth in methods:
+        fn = getattr(r, meth, None)
+        if not callable(fn):
+            continue
+        try:
+            res = fn(symbol=symbol, price=price, portfolio=portfolio, score=score, ctx=ctx)
+            return RiskEvalRes(bool(res.get("allow", True)), str(res.get("reason", "")))
+        except TypeError:
+            pass
+    arg_sets = (
+        (symbol, price, portfolio, score, ctx),
+        (symbol, price, portfolio, ctx),
+        (portfolio, ctx),
+        (symbol, price, ctx),
+        (symbol, price),
+        (portfolio,),
+        (ctx,),
+        tuple(),
+    )
+    for meth in methods:
+        fn = getattr(r, meth, None)
+        if not callable(fn):
+            continue
+        for args in arg_sets:
+            try:
+                res = fn(*args)
+            except TypeError:
+                continue
+            return RiskEvalRes(bool(res.get("allow", True)), str(res.get("reason", "")))
+    return RiskEvalRes(True)
+
+
+def run(n_symbols: int, rounds: int) -> None:
+    scorer, gate = StubScorer(), StubGate()
+    symbols = [f"{i:06d}" for i in range(n_symbols)]
+    pf: dict = {}
+    ctx: dict = {}
+    calls = n_symbols * rounds
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for sym in symbols:
+            sc = legacy_score(scorer, sym, 100.0, ctx)
+            legacy_risk(gate, sym, 100.0, pf, sc, ctx)
+    before = (time.perf_counter() - t0) / calls
+
+    score_fn, _ = bind_scorer(scorer)
+    risk_fn, _ = bind_risk(gate)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for sym in symbols:
+            sc = score_fn(sym, 100.0, {"symbol": sym, "price": 100.0}, ctx)
+            risk_fn(sym, 100.0, pf, sc, ctx)
+    after = (time.perf_counter() - t0) / calls
+
+    print(f"symbols={n_symbols} rounds={rounds}")
+    print(f"before : {before * 1e6:8.2f} us/symbol")
+    print(f"after  : {after * 1e6:8.2f} us/symbol  (x{before / max(after, 1e-12):.1f})")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--rounds", type=int, default=20)
+    a = ap.parse_args()
+    run(a.symbols, a.rounds)
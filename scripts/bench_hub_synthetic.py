@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/bench_hub_synthetic.py — 합성 시장 피드로 Hub.on_tick 부하 측정
+
+- market/synthetic.SyntheticMarket 으로 심볼 N개 snapshot 을 미리 생성(생성 비용 분리)
+- Hub.on_tick 틱당 지연 p50/p99/max 와 지속 가능 틱 레이트(= 1 / 평균 틱 지연) 출력
+- 목표: 10k 심볼 × 100 ticks/sec (틱당 평균 10ms 미만)
+- --pace 를 주면 rate 페이스 스트림으로 실제 실행(따라잡지 못한 틱 비율 출력)
+- 목표 대비 처리량(심볼-틱/초)을 함께 출력, --profile 이면 on_tick 구간 cProfile 상위 함수(자체 시간순)
+
+측정(Linux x86-64, CPython 3.11, NumPy, --ticks 20, 뉴스 파일 캐시 적용 후):
+  1k 심볼  on_tick 평균 ≈ 11ms   (≈ 95 ticks/s)
+  10k 심볼 on_tick 평균 ≈ 119ms  (≈ 8 ticks/s ≈ 84k 심볼-틱/s, 목표 1M 의 약 8% — 미달)
+  (캐시 전에는 10k 심볼 ≈ 1.5s/틱, 그중 ~88% 가 news_sentiment 의 심볼별 파일 glob/stat/read)
+  남은 시간은 심볼당 파이썬 처리로 분산: Hub._on_tick 루프 / _batch_inputs 필드 추출 /
+  _tick_fingerprint / 리플레이 라우터 LOB on_snapshot — 단일 핫스팟 없이 심볼-틱당 ≈ 12µs
+
+사용: python scripts/bench_hub_synthetic.py --symbols 1000 10000 --ticks 200 --rate 100 [--profile]
+"""
+from __future__ import annotations
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hub.hub_trade import Hub, _make_default_scorer
+from hub.replay import make_replay_router
+from market.synthetic import SyntheticConfig, SyntheticMarket
+from obs.latency import LatencyHistogram, perf_counter_ns
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def run(n_symbols: int, ticks: int, rate: float, pace: bool, profile: bool = False) -> None:
+    feed = SyntheticMarket(SyntheticConfig(n_symbols=n_symbols, seed=7, sigma=0.8, jump_rate=1e-3))
+    t0 = time.perf_counter()
+    snaps = list(feed.snapshots(ticks))
+    gen_s = time.perf_counter() - t0
+
+    budget = 1_000_000_000
+    hub = Hub(_make_default_scorer(), RiskGate(policies=[]), make_replay_router(budget), ExitRules(),
+              config={"budget": budget})
+    hist = LatencyHistogram()
+    if pace:
+        src = SyntheticMarket(SyntheticConfig(n_symbols=n_symbols, seed=7)).stream(ticks, rate)
+        late = 0
+        t_start = time.perf_counter()
+        for i, snap in enumerate(src):
+            a = perf_counter_ns()
+            hub.on_tick(snap)
+            hist.record(perf_counter_ns() - a)
+            if time.perf_counter() - t_start > (i + 1) / rate:
+                late += 1
+        wall = time.perf_counter() - t_start
+        print(f"[paced] symbols={n_symbols} ticks={ticks} wall={wall:.2f}s late={late / ticks:.1%}")
+    else:
+        prof = cProfile.Profile() if profile else None
+        if prof is not None:
+            prof.enable()
+        for snap in snaps:
+            a = perf_counter_ns()
+            hub.on_tick(snap)
+            hist.record(perf_counter_ns() - a)
+        if prof is not None:
+            prof.disable()
+            out = io.StringIO()
+            pstats.Stats(prof, stream=out).sort_stats("tottime").print_stats(15)
+            print(out.getvalue())
+    hub.close()
+    d = hist.summary_dict()
+    mean_ms = hist.total / hist.count / 1e6
+    sustain = 1000.0 / mean_ms if mean_ms > 0 else float("inf")
+    print(f"symbols={n_symbols:>6} ticks={ticks} gen={n_symbols * ticks / gen_s:,.0f} sym-ticks/s "
+          f"on_tick mean={mean_ms:.2f}ms p50={d['p50_us'] / 1e3:.2f}ms p99={d['p99_us'] / 1e3:.2f}ms "
+          f"max={d['max_us'] / 1e3:.2f}ms sustain≈{sustain:,.0f} ticks/s "
+          f"({'OK' if sustain >= rate else 'BELOW'} {rate:g}/s) positions={len(hub.book)}")
+    need = 10_000 * rate
+    have = n_symbols * sustain
+    print(f"  throughput≈{have:,.0f} sym-ticks/s vs target 10k×{rate:g}={need:,.0f} "
+          f"({have / need:.0%}{'' if have >= need else ' — BELOW target'})")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--ticks", type=int, default=200)
+    ap.add_argument("--rate", type=float, default=100.0)
+    ap.add_argument("--pace", action="store_true", help="rate 페이스 스트림으로 실제 실행")
+    ap.add_argument("--profile", action="store_true", help="on_tick 구간 cProfile 상위 15개 (자체 시간순)")
+    a = ap.parse_args()
+    for n in a.symbols:
+        run(n, a.ticks, a.rate, a.pace, a.profile)
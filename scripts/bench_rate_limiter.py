@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/bench_rate_limiter.py — 주문 버스트 처리량: 고정 sleep vs 토큰 버킷
+
+- before: 주문마다 락 안에서 rate_limit_ms 고정 sleep (구 KiwoomAdapter._rate_limit)
+- after : 토큰 버킷 (버스트 capacity 까지 즉시 통과, 부족하면 retry_after 만큼만 대기 후 재시도)
+- 같은 지속 속도(1000/rate_limit_ms 건/초)로 맞춰 버스트 구간 차이만 비교
+- DRY_RUN KiwoomAdapter 로 실제 place_order 경로를 탄다
+
+사용: python scripts/bench_rate_limiter.py --orders 5 20 --rate-limit-ms 120 --burst 5
+"""
+from __future__ import annotations
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order.adapters.kiwoom import KiwoomAdapter
+from order.ratelimit import RateLimiter, TokenBucket, ORDER, CANCEL, QUERY
+
+_quiet = logging.getLogger("bench.rate")
+_quiet.addHandler(logging.NullHandler())
+_quiet.propagate = False
+
+
+class FixedSleepAdapter(KiwoomAdapter):
+    """구 방식 재현: 최근 주문 여부와 무관하게 매번 고정 sleep"""
+    _rl_lock = threading.Lock()
+
+    def _rate_limit(self, kind: str = ORDER) -> float:
+        with self._rl_lock:
+            time.sleep(self.rate_limit_ms / 1000.0)
+        return 0.0
+
+
+def _burst(adapter: KiwoomAdapter, n: int) -> float:
+    """n건 주문이 모두 접수될 때까지 걸린 시간(초) — 첫 접수까지의 지연 포함"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        while True:
+            r = adapter.place_order(f"{i:06d}", "BUY", 1, price=1.0, order_type="LMT")
+            wait = (r.raw or {}).get("retry_after") if not r.ok else None
+            if wait is None:
+                break
+            time.sleep(wait)
+    return time.perf_counter() - t0
+
+
+def run(n: int, rate_limit_ms: int, burst: float) -> None:
+    old = FixedSleepAdapter("00000000", dry_run=True, logger=_quiet, rate_limit_ms=rate_limit_ms)
+    old.connect()
+    before = _burst(old, n)
+
+    rate = 1000.0 / rate_limit_ms
+    new = KiwoomAdapter("00000000", dry_run=True, logger=_quiet,
+                        limiter=RateLimiter({k: TokenBucket(rate, burst) for k in (ORDER, CANCEL, QUERY)}))
+    new.connect()
+    after = _burst(new, n)
+
+    print(f"orders={n} rate={rate:.2f}/s burst={burst:g}")
+    print(f"before : {before * 1e3:8.1f} ms  ({n / before:6.1f} orders/s)")
+    print(f"after  : {after * 1e3:8.1f} ms  ({n / max(after, 1e-9):6.1f} orders/s, x{before / max(after, 1e-9):.1f})")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--orders", type=int, nargs="+", default=[5, 20])
+    ap.add_argument("--rate-limit-ms", type=int, default=120)
+    ap.add_argument("--burst", type=float, default=5)
+    a = ap.parse_args()
+    for n in a.orders:
+        run(n, a.rate_limit_ms, a.burst)
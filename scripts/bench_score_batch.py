@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/bench_score_batch.py — ScoreEngine.evaluate vs evaluate_many 처리량
+
+- 심볼 N개 snapshot(거래량/평균거래량/매수·매도 체결/이평) 을 rounds 번 평가
+- before: 심볼마다 evaluate (가중치 4회 해석 + 피처 3개 + 뉴스 감정)
+- after : evaluate_many 1회 (N×F 피처 행렬 + 가중합)
+- 뉴스 감정은 --news 를 주지 않으면 0 으로 고정 (파일 I/O 를 빼고 스코어 경로만 측정)
+- 두 결과가 같은지 함께 검사
+
+사용: python scripts/bench_score_batch.py --symbols 1000 10000 --rounds 20
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring.core as core
+from scoring.core import ScoreEngine
+from scoring.weights import Weights
+
+
+def run(n_symbols: int, rounds: int) -> None:
+    rng = random.Random(0)
+    snaps = [{"symbol": f"{i:06d}", "price": rng.uniform(1_000, 100_000),
+              "volume": rng.uniform(0, 2_000), "avg_vol": 500.0,
+              "buy_vol": rng.uniform(0, 50), "sell_vol": rng.uniform(0, 50),
+              "fast": rng.uniform(0.9, 1.1), "slow": 1.0} for i in range(n_symbols)]
+    eng = ScoreEngine(Weights())
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        single = [eng.evaluate(s) for s in snaps]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        batch = eng.evaluate_many(snaps)
+    t_batch = time.perf_counter() - t0
+
+    cols = {k: [s[k] for s in snaps] for k in snaps[0]}
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        eng.evaluate_many(cols)
+    t_cols = time.perf_counter() - t0
+
+    n = n_symbols * rounds
+    print(f"symbols={n_symbols:>6} evaluate={n / t_single:>12,.0f}/s  evaluate_many={n / t_batch:>12,.0f}/s "
+          f"(x{t_single / t_batch:.1f})  columnar={n / t_cols:>12,.0f}/s (x{t_single / t_cols:.1f})  "
+          f"equal={single == batch}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--news", action="store_true", help="news_logs 기반 뉴스 감정 포함")
+    a = ap.parse_args()
+    if not a.news:
+        core.news_senti_score = lambda symbol: 0.0
+    for n in a.symbols:
+        run(n, a.rounds)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+unit_conflate.py
+- ConflatingBuffer: 심볼별 최신값 병합 / 용량 초과 드롭 / 닫힘 처리
+- HubTrade.run_session(conflate=True): Hub가 느려도 최신값만 처리
+"""
+import time
+
+from bus.conflate import ConflatingBuffer
+from hub.hub_trade import HubTrade
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def test_merge_drop_and_close():
+    buf = ConflatingBuffer(max_symbols=2)
+    buf.put({"AAA": 1.0, "BBB": 2.0})
+    buf.put({"AAA": 1.5, "CCC": 3.0})        # AAA 병합, CCC 드롭
+    assert buf.take(timeout=0) == {"AAA": 1.5, "BBB": 2.0}
+    m = buf.summary_dict()
+    assert (m["received"], m["merged"], m["dropped"], m["batches"]) == (4, 1, 1, 1)
+    assert buf.take(timeout=0) == {}
+    buf.close()
+    assert buf.take() is None
+
+
+class SlowScorer:
+    def __init__(self):
+        self.seen = []
+
+    def score(self, tick):
+        self.seen.append(tick["price"])
+        time.sleep(0.005)
+        return 0.0
+
+
+class NullRouter:
+    def buy(self, *a, **k):
+        return False, 0, 0.0
+
+    def sell(self, *a, **k):
+        return False, 0, 0.0
+
+
+def test_run_session_conflates_fast_feed():
+    scorer = SlowScorer()
+    ht = HubTrade(["AAA"], scorer=scorer, risk=RiskGate(policies=[]), router=NullRouter(),
+                  exit_rules=ExitRules(), config={"budget": 1_000_000})
+    feed = ({"AAA": 100.0 + i} for i in range(500))
+    ticks = ht.run_session(feed, max_ticks=10_000, conflate=True)
+    m = ht.input_buffer.summary_dict()
+    assert ticks < 500 and m["merged"] > 0 and m["received"] == 500
+    assert scorer.seen[-1] == 599.0           # 마지막 결정은 최신값 기준
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+unit_cooldown.py
+- TimingWheel: arm/active/cancel, 만료 후 메모리 회수, 한 바퀴 넘는 만료
+- ThrottlePolicy/Hub 가 같은 CooldownService 를 보는지
+"""
+from common.cooldown import TimingWheel, CooldownService
+from risk.context import RiskContext, PolicyContext
+from risk.policies.throttle import ThrottlePolicy
+
+
+def test_wheel_arm_check_expire():
+    w = TimingWheel(1, slots=8)
+    w.arm(("AAA", "exit"), 5, now=0)
+    w.arm(("BBB", "exit"), 20, now=0)          # 한 바퀴(8) 넘는 만료
+    assert w.active(("AAA", "exit"), 4) and not w.active(("AAA", "exit"), 5)
+    assert w.remaining(("BBB", "exit"), 0) == 20
+    w.advance(6)
+    assert ("AAA", "exit") not in w and len(w) == 1
+    w.advance(19)
+    assert w.active(("BBB", "exit"), 19)
+    w.advance(21)
+    assert len(w) == 0
+    w.arm(("CCC", "exit"), 3, now=21)          # 이미 지난 시각 → 무시
+    assert len(w) == 0
+
+
+def test_memory_bounded_over_long_session():
+    w = TimingWheel(1, slots=64)
+    for tick in range(1, 20_000):
+        w.arm((f"S{tick % 3000:04d}", "reentry"), tick + 10, now=tick)
+    assert len(w) <= 11
+
+
+def test_clock_wheel_fractional_seconds():
+    w = TimingWheel(60.0, slots=4)
+    w.arm(("*", "daydd"), 1000.5, now=100.0)
+    assert w.until(("*", "daydd"), 999.0) == 1000.5
+    w.advance(5000.0)
+    assert len(w) == 0
+
+
+def test_throttle_reads_shared_service():
+    cd = CooldownService()
+    rc = RiskContext(budget=1_000_000, cooldowns=cd)
+    pol = ThrottlePolicy()
+    cd.ticks.arm(("AAA", "reentry"), 15, now=10)
+    assert pol.check_entry("AAA", 10.0, {}, PolicyContext(rc, tick_idx=12)).reason == "cooldown:reentry"
+    assert pol.check_entry("AAA", 10.0, {}, PolicyContext(rc, tick_idx=15)).allow
+    pol.arm(PolicyContext(rc, tick_idx=20), "BBB")
+    assert not pol.check_entry("BBB", 10.0, {}, PolicyContext(rc, tick_idx=21)).allow
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+unit_exit_engine.py
+- ExitRules.apply_exit_book(벡터) 판정이 단건 apply_exit 와 같은지 (NumPy/순수 파이썬 양쪽)
+"""
+import random
+
+import pytest
+
+import scoring.rules.exit_rules as exit_mod
+from common.position_book import PositionBook
+from scoring.rules.exit_rules import ExitRules, ExitParams
+
+
+def _run_both(seed: int):
+    rng = random.Random(seed)
+    params = ExitParams(min_hold_ticks=1)
+    single, vec = ExitRules(params), ExitRules(params)
+    book = PositionBook()
+    avgs = {}
+    for n in range(200):
+        sym = f"S{n:03d}"
+        avgs[sym] = rng.uniform(10, 100)
+        book.open(sym, 10, avgs[sym])
+
+    got_single, got_vec = [], []
+    for tick in range(1, 6):
+        prices = {s: a * (1 + rng.uniform(-0.02, 0.02)) for s, a in avgs.items() if s in book}
+        for s, px in prices.items():
+            dec = single.apply_exit(s, avgs[s], px, {"tick_index": tick})
+            if dec.exit:
+                got_single.append((tick, s, dec.reason))
+        ids = [book.id_of(s) for s in prices]
+        for ex in vec.apply_exit_book(book, ids, list(prices.values()), tick):
+            got_vec.append((tick, ex["symbol"], ex["reason"]))
+            book.close(ex["symbol"], ex["reason"])
+    return got_single, got_vec, vec
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_book_matches_single_api(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(exit_mod, "np", None)
+    elif exit_mod.np is None:
+        pytest.skip("numpy 미설치")
+    single, vec, rules = _run_both(7)
+    assert vec and vec == single
+    tick, sym, _ = vec[0]
+    assert rules.cooldowns.ticks.until((sym, "exit"), tick) == tick + rules.p.cooldown_ticks
+    assert not rules.can_reenter(sym, tick) and rules.can_reenter(sym, tick + rules.p.cooldown_ticks)
+
+
+def test_min_hold_blocks_early_exit():
+    book = PositionBook()
+    i = book.open("AAA", 1, 100.0)
+    rules = ExitRules(ExitParams(min_hold_ticks=3))
+    assert rules.apply_exit_book(book, [i], [90.0], 1) == []
+    assert rules.apply_exit_book(book, [i], [90.0], 2) == []
+    assert rules.apply_exit_book(book, [i], [90.0], 3)[0]["reason"] == "stop_loss"
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+unit_feature_vector.py
+- ScoreEngine.features: 틱당 1회 계산 — score_with_detail/evaluate 가 같은 FeatureVector 공유,
+  상태 있는 폴백(모멘텀/틱플로우)이 한 번만 전진
+- evaluate_many 결과를 lookup 으로 지연 조회 (features() 단건 계산과 동일), 틱 중간 가중치 변경 반영
+- Hub: 진입 시점 FeatureVector 가 청산 실현손익과 함께 Calibrator 기여도로 전달
+"""
+import pytest
+
+import scoring.core as core
+from hub.hub_trade import Hub
+from risk.core import RiskGate
+from scoring.calibrator import Calibrator
+from scoring.core import ScoreEngine
+from scoring.rules.exit_rules import ExitRules
+
+
+@pytest.fixture(autouse=True)
+def _no_news(monkeypatch):
+    monkeypatch.setattr(core, "news_senti_score", lambda s: 0.0)
+    core._state_prev_price.clear()
+    yield
+    core._state_prev_price.clear()
+
+
+def test_detail_and_evaluate_share_one_pass(monkeypatch):
+    calls = []
+
+    def flow(snap):                       # 상태 있는 폴백 피처 흉내
+        calls.append(snap["price"])
+        return 0.0
+
+    monkeypatch.setattr(core, "tick_flow", flow)
+    eng = ScoreEngine({"volume": 0.5, "tickflow": 0.3, "ta": 0.2})
+    eng.begin_tick(1)
+    eng.evaluate({"symbol": "AAA", "price": 10.0})
+    eng.begin_tick(2)
+    s1 = eng.evaluate({"symbol": "AAA", "price": 10.1})
+    s2, detail = eng.score_with_detail({"symbol": "AAA", "price": 10.1})
+    assert calls == [10.0, 10.1]
+    assert s1 == s2 == pytest.approx(0.01 * 50 * 0.2 + 0.5)   # 모멘텀이 두 번 전진하지 않음
+    assert detail == {"volume": 0.0, "tickflow": 0.0, "ta": 0.0, "news": 0.0}
+    assert eng.lookup("AAA").fallback == pytest.approx((0.1, 0.5))
+
+
+def test_batch_lookup_matches_single_and_reweights():
+    pytest.importorskip("numpy")
+    snaps = [{"symbol": "AAA", "price": 100.0, "volume": 800.0, "avg_vol": 500.0, "buy_vol": 3.0, "sell_vol": 1.0},
+             {"symbol": "BBB", "price": 10.0},
+             {"symbol": "CCC", "price": 50.0, "fast": 1.0, "slow": 2.0}]
+    eng = ScoreEngine({"volume": 0.5, "tickflow": 0.3, "ta": 0.2})
+    eng.begin_tick(7)
+    out = eng.evaluate_many(snaps)
+    single = ScoreEngine({"volume": 0.5, "tickflow": 0.3, "ta": 0.2})
+    core._state_prev_price.clear()
+    for snap, sc in zip(snaps, out):
+        fv, ref = eng.lookup(snap["symbol"]), single.features(snap)
+        assert (fv.values(), fv.fallback, fv.score, fv.tick) == (ref.values(), ref.fallback, sc, 7)
+
+    eng.weights = {"volume": 0.0, "tickflow": 1.0, "ta": 0.0}   # 틱 중간 가중치 변경
+    assert eng.evaluate(snaps[0]) == 0.5
+    eng.begin_tick(8)
+    assert eng.lookup("AAA") is None
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def test_hub_passes_entry_features_to_calibrator():
+    cal = Calibrator()
+    eng = ScoreEngine(calibrator=cal)
+    hub = Hub(eng, RiskGate(policies=[]), Router(), ExitRules(), config={"budget": 1_000_000})
+    hub.on_tick({"AAA": {"price": 100.0, "volume": 1000.0, "avg_vol": 500.0,
+                         "buy_vol": 10.0, "sell_vol": 0.0, "fast": 2.0, "slow": 1.0}})
+    assert "AAA" in hub.book
+    for _ in range(4):                             # 최소 홀드 틱 이후 손절
+        hub.on_tick({"AAA": {"price": 90.0}})
+    assert "AAA" not in hub.book
+    (pnl, feats), = cal._attr
+    assert pnl == pytest.approx(-0.1)
+    assert feats == (1.0, 1.0, 1.0, 0.0)
+    assert cal.attribution()["volume"] == pytest.approx(-0.1)
+    hub.close()
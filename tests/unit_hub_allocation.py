@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+unit_hub_allocation.py
+- 신규 진입이 snapshot 순서가 아니라 점수 순서로 노출 한도를 배분하는지
+- 상위 K 밖 후보는 리스크 평가 자체를 하지 않는지
+"""
+from hub.hub_trade import Hub
+from risk.core import RiskGate
+from risk.policies.exposure import ExposurePolicy, ExposureConfig
+from scoring.rules.exit_rules import ExitRules
+
+SCORES = {"AAA": 0.6, "BBB": 0.9, "CCC": 0.8, "DDD": 0.1}
+
+
+class TableScorer:
+    buy_threshold = 0.5
+
+    def score(self, tick):
+        return SCORES[tick["symbol"]]
+
+
+class RecRouter:
+    def __init__(self):
+        self.buys = []
+
+    def buy(self, symbol, qty, price, reason):
+        self.buys.append((symbol, qty))
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+class CountingGate(RiskGate):
+    def __init__(self, *a, **k):
+        super().__init__(*a, **k)
+        self.checked = []
+
+    def check(self, symbol, price, portfolio, ctx=None):
+        self.checked.append(symbol)
+        return super().check(symbol, price, portfolio, ctx)
+
+
+def make_hub(top_k):
+    gate = CountingGate(policies=[ExposurePolicy(ExposureConfig(max_total_exposure_pct=0.3,
+                                                                max_symbol_exposure_pct=0.2))])
+    router = RecRouter()
+    hub = Hub(TableScorer(), gate, router, ExitRules(),
+              config={"budget": 1_000_000, "entry_top_k": top_k})
+    return hub, gate, router
+
+
+def test_budget_goes_to_highest_scores_first():
+    hub, gate, router = make_hub(top_k=10)
+    hub.on_tick({s: 100.0 for s in ("AAA", "BBB", "CCC", "DDD")})
+    assert router.buys == [("BBB", 2000), ("CCC", 1000)]
+    assert gate.checked == ["BBB", "CCC", "AAA"]   # DDD는 임계 미달 → 리스크 평가 없음
+    assert hub.book.exposure() == 300_000
+
+
+def test_top_k_limits_risk_evaluations():
+    hub, gate, router = make_hub(top_k=1)
+    hub.on_tick({s: 100.0 for s in ("AAA", "BBB", "CCC")})
+    assert gate.checked == ["BBB"] and router.buys == [("BBB", 2000)]
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+unit_hub_binding.py
+- scorer/risk 시그니처가 생성 시 1회 바인딩되는지, 바인딩 불가 시 즉시 예외인지 확인
+"""
+import pytest
+
+from hub.binding import RiskEvalRes, bind_scorer, bind_risk
+from risk.core import RiskGate
+
+
+class SnapScorer:
+    def score(self, tick):
+        return 0.7 if tick["symbol"] == "AAA" else 0.1
+
+
+class TupleGate:
+    def check(self, symbol, price, portfolio, ctx=None):
+        return (price < 100, "tuple", 3)
+
+
+def test_scorer_binds_snapshot_form():
+    fn, sig = bind_scorer(SnapScorer())
+    assert sig.endswith("score(snap,)")
+    assert fn("AAA", 10.0, {"symbol": "AAA", "price": 10.0}, {}) == 0.7
+
+
+def test_risk_binds_check_and_normalizes_tuple():
+    fn, sig = bind_risk(TupleGate())
+    assert "check(symbol, price, portfolio, ctx)" in sig
+    assert fn("AAA", 50.0, {}, 0.5, {}) == RiskEvalRes(True, "tuple", 3)
+    assert fn("AAA", 150.0, {}, 0.5, {}).allow is False
+
+
+def test_riskgate_binds_check():
+    _, sig = bind_risk(RiskGate(policies=[]))
+    assert sig.startswith("RiskGate.check(")
+
+
+def test_unbindable_fails_loudly():
+    with pytest.raises(RuntimeError):
+        bind_scorer(object())
+    with pytest.raises(RuntimeError):
+        bind_risk(object())
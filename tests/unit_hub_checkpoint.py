@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+unit_hub_checkpoint.py
+- encode/decode 왕복: 북 컬럼(고점/보유틱/청산사유)·쿨다운·tick_idx·저널 seq 보존, crc 손상 거부
+- Hub(checkpoint_path + journal_path): 재시작 시 체크포인트 복원 + 이후 저널 체결만 재적용
+- 심볼 5000개 북 복원이 저널 재생 없이 빠르게 끝남
+- 쿨다운 재무장은 Hub 시계 기준, run_session 종료 시 체크포인트 기록 스레드 종료
+"""
+import time
+
+import pytest
+
+from common.position_book import PositionBook
+from hub.checkpoint import decode_checkpoint, encode_checkpoint, load_checkpoint, save_checkpoint
+from hub.hub_trade import Hub, HubTrade
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+class Scorer:
+    def score(self, tick):
+        return 0.9
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def _hub(cfg):
+    return Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(), config=dict(cfg))
+
+
+def _rows(book):
+    return {s: book.position(s) for s in book}
+
+
+def test_roundtrip_and_corruption(tmp_path):
+    hub = _hub({"budget": 1_000_000})
+    hub.on_tick({"AAA": 100.0, "BBB": 200.0})
+    hub.on_tick({"AAA": 103.0, "BBB": 201.0})
+    hub.cooldowns.ticks.arm(("CCC", "reentry"), hub.tick_idx + 5)
+    hub.cooldowns.clock.arm(("*", "daydd"), time.time() + 60)
+    ck = hub.checkpoint_state()
+    data = encode_checkpoint(ck)
+
+    back = decode_checkpoint(data)
+    assert (back.tick_idx, back.symbols) == (2, ck.symbols)
+    assert {w for w, _, _ in back.cooldowns} == {"ticks", "clock"}
+
+    other = _hub({"budget": 1_000_000})
+    other.restore_state(back)
+    assert _rows(other.book) == _rows(hub.book)
+    assert other.book.hold_ticks.tolist() == hub.book.hold_ticks.tolist()
+    assert other.book.last_high.tolist() == hub.book.last_high.tolist()
+    assert other.tick_idx == 2
+    assert other.cooldowns.ticks.active(("CCC", "reentry"), other.tick_idx)
+    assert other.cooldowns.clock.active(("*", "daydd"), time.time())
+
+    bad = bytearray(data)
+    bad[40] ^= 0xFF
+    with pytest.raises(RuntimeError):
+        decode_checkpoint(bytes(bad))
+
+
+def test_atomic_save_keeps_previous_on_partial_tmp(tmp_path):
+    path = str(tmp_path / "h.ckpt")
+    hub = _hub({"budget": 1_000_000})
+    hub.on_tick({"AAA": 100.0})
+    save_checkpoint(path, hub.checkpoint_state())
+    with open(path + ".tmp", "wb") as fh:        # 교체 전 크래시 흉내
+        fh.write(b"HCKP\x01")
+    assert set(load_checkpoint(path).symbols) == {"AAA"}
+    assert load_checkpoint(str(tmp_path / "none.ckpt")) is None
+
+
+def test_hub_restart_replays_only_journal_tail(tmp_path):
+    cfg = {"budget": 1_000_000, "journal_path": str(tmp_path / "o.ojnl"),
+           "checkpoint_path": str(tmp_path / "h.ckpt"), "checkpoint_every": 1}
+    hub = _hub(cfg)
+    hub.on_tick({"AAA": 100.0, "BBB": 200.0})
+    hub.on_tick({"AAA": 104.0, "BBB": 201.0})
+    hub._ckpt_writer.close()                     # 주기 체크포인트(틱 2) 기록 완료 대기
+    ck = load_checkpoint(cfg["checkpoint_path"])
+    assert ck.tick_idx == 2 and ck.journal_seq == hub.journal.seq
+    # 체크포인트 이후 체결 (저널에만 남음)
+    hub._ckpt_writer = None
+    prev = hub.book.position("AAA")
+    hub.risk_ctx.set_position("AAA", 0, 0.0, reason="exit")
+    hub._sell("AAA", 104.0, prev.qty, reason="exit", prev=prev)
+    hub._apply_fills()
+    hub.close()
+
+    again = _hub(cfg)
+    assert again.tick_idx == 2
+    assert set(again.book) == {"BBB"}
+    assert again.book.last_high[again.book.id_of("BBB")] == 201.0   # 저널만으로는 복원 불가한 고점
+    again.close()
+
+
+def test_restore_5000_symbols_fast():
+    book = PositionBook()
+    for i in range(5000):
+        book.open(f"S{i:05d}", 10 + i, 1000.0 + i, float(i))
+        book.hold_ticks[i] = i % 50
+    syms, cols = book.dump()
+    other = PositionBook()
+    t0 = time.perf_counter()
+    other.restore(syms, cols)
+    assert time.perf_counter() - t0 < 0.5
+    assert len(other) == 5000 and other.position("S04999").qty == 5009
+    assert other.hold_ticks.tolist() == book.hold_ticks.tolist()
+
+
+def test_restore_rearms_clock_cooldowns_on_hub_clock():
+    sim = 1_735_700_000.0                        # 벽시계보다 과거인 리플레이 시각
+    hub = _hub({"budget": 1_000_000})
+    hub.clock = lambda: sim
+    hub.cooldowns.clock.arm(("*", "daydd"), sim + 60, now=sim)
+    other = _hub({"budget": 1_000_000})
+    other.clock = lambda: sim + 30
+    other.restore_state(hub.checkpoint_state())
+    assert other.cooldowns.clock.active(("*", "daydd"), sim + 30)
+    assert not other.cooldowns.clock.active(("*", "daydd"), sim + 60)
+
+
+def test_run_session_stops_checkpoint_writer(tmp_path):
+    cfg = {"budget": 1_000_000, "checkpoint_path": str(tmp_path / "s.ckpt"), "checkpoint_every": 1}
+    ht = HubTrade(["AAA"], scorer=Scorer(), risk=RiskGate(policies=[]), router=Router(),
+                  exit_rules=ExitRules(), config=dict(cfg))
+    ht.run_session(iter([{"AAA": 100.0}, {"AAA": 101.0}]), max_ticks=10)
+    assert not ht.hub._ckpt_writer._thread.is_alive()
+    assert load_checkpoint(cfg["checkpoint_path"]).tick_idx == 2
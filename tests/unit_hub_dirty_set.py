@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+unit_hub_dirty_set.py
+- 입력 지문/RiskContext version 이 그대로면 스코어·리스크 평가를 건너뛰는지 확인
+"""
+from hub.hub_trade import Hub
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+class CountingScorer:
+    def __init__(self):
+        self.calls = 0
+
+    def score(self, tick):
+        self.calls += 1
+        return 0.0  # 진입 없음 → version 고정
+
+
+class NullRouter:
+    def buy(self, *a, **k):
+        return False, 0, 0.0
+
+    def sell(self, *a, **k):
+        return False, 0, 0.0
+
+
+def make_hub():
+    scorer = CountingScorer()
+    hub = Hub(scorer, RiskGate(policies=[]), NullRouter(), ExitRules(), config={"budget": 1_000_000})
+    return hub, scorer
+
+
+def test_unchanged_inputs_are_skipped():
+    hub, scorer = make_hub()
+    hub.on_tick({"AAA": 100.0, "BBB": {"price": 50.0, "volume": 10}})
+    hub.on_tick({"AAA": 100.0, "BBB": {"price": 50.0, "volume": 10}})
+    assert scorer.calls == 2
+    assert hub.stats["last_skipped"] == 2 and hub.stats["last_evaluated"] == 0
+
+    hub.on_tick({"AAA": 100.0, "BBB": {"price": 50.0, "volume": 11}})  # 거래량만 변경
+    assert scorer.calls == 3
+    assert hub.stats["symbols_evaluated"] == 3 and hub.stats["symbols_skipped"] == 3
+
+
+def test_context_version_change_marks_all_dirty():
+    hub, scorer = make_hub()
+    hub.on_tick({"AAA": 100.0, "BBB": 50.0})
+    hub.risk_ctx.set_position("ZZZ", 1, 10.0)  # 체결 → version 증가
+    hub.on_tick({"AAA": 100.0, "BBB": 50.0})
+    assert scorer.calls == 4
+
+
+class FixedScorer:
+    def score(self, tick):
+        return 0.9
+
+
+class FillRouter:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def test_risk_denied_symbol_is_reevaluated_after_recovery():
+    from risk.policies.day_dd import DayDrawdownPolicy
+    hub = Hub(FixedScorer(), RiskGate(policies=[DayDrawdownPolicy()]), FillRouter(), ExitRules(),
+              config={"budget": 1_000_000})
+    t0 = 1_735_700_000.0
+    hub.on_tick({"AAA": 100.0}, {"today_pnl_pct": -3.0, "now_ts": t0})     # 하드 차단
+    assert "AAA" not in hub.book
+    hub.on_tick({"AAA": 100.0}, {"today_pnl_pct": 0.0, "now_ts": t0 + 60})  # 쿨다운 유지
+    assert "AAA" not in hub.book and hub.stats["last_evaluated"] == 1
+    hub.on_tick({"AAA": 100.0}, {"today_pnl_pct": 0.0, "now_ts": t0 + 3600})  # 회복 → 같은 지문이어도 진입
+    assert hub.stats["last_skipped"] == 0
+    assert "AAA" in hub.book
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+unit_hub_replay.py
+- 틱 파일(CSV/JSONL) → 같은 ts 행을 snapshot 으로 묶음, ts 역행 거부
+- 같은 테이프를 두 번 재생하면 체결 결정이 완전히 같음 (시뮬레이션 시계/LOB 브로커)
+- 결정의 ts 는 테이프 시각, write_session_report 로 FIFO 실현손익 리포트
+- 기본 ScoreEngine 도 결정적: 리플레이마다 scorer 상태 초기화, 벽시계 의존 뉴스 감정은 기본 끔
+"""
+import csv
+import json
+
+import pytest
+
+from hub.replay import ReplayEngine, group_ticks, read_tick_file
+from obs.log import get_logger
+from run_daytrade import write_session_report
+
+T0 = 1_735_700_000.0
+PATH = [100.0, 101.0, 103.0, 106.0, 108.0, 104.0, 99.0, 97.0, 98.0, 100.0]
+
+
+class Scorer:
+    buy_threshold = 0.5
+
+    def score(self, tick):
+        return 0.9
+
+
+def _write_csv(path):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        wr = csv.writer(fh)
+        wr.writerow(["ts", "symbol", "price", "volume"])
+        for i, p in enumerate(PATH):
+            wr.writerow([T0 + i, "AAA", p, 1000])
+            wr.writerow([T0 + i, "BBB", p * 2, 1000])
+    return str(path)
+
+
+def _replay(path):
+    rp = ReplayEngine.build(["AAA", "BBB"], budget=1_000_000, scorer=Scorer())
+    return rp.run(read_tick_file(path))
+
+
+def test_group_ticks_csv_and_jsonl(tmp_path):
+    path = _write_csv(tmp_path / "t.csv")
+    snaps = list(read_tick_file(path))
+    assert len(snaps) == len(PATH)
+    ts, snap = snaps[3]
+    assert ts == T0 + 3 and snap["BBB"] == {"price": 212.0, "volume": 1000.0}
+
+    jl = tmp_path / "t.jsonl"
+    jl.write_text("\n".join(json.dumps({"ts": T0 + i, "symbol": "AAA", "price": p})
+                            for i, p in enumerate(PATH)), encoding="utf-8")
+    assert [s["AAA"]["price"] for _, s in read_tick_file(str(jl))] == PATH
+
+    with pytest.raises(RuntimeError):
+        list(group_ticks([{"ts": 2, "symbol": "A", "price": 1}, {"ts": 1, "symbol": "A", "price": 1}]))
+
+
+def test_replay_is_deterministic_and_reports(tmp_path):
+    path = _write_csv(tmp_path / "t.csv")
+    a = _replay(path)
+    b = _replay(path)
+    assert a.ticks == len(PATH) and a.rows == 2 * len(PATH)
+    assert a.decisions and a.decisions == b.decisions
+    assert a.positions == b.positions
+    assert {d["action"] for d in a.decisions} == {"BUY", "SELL"}
+    assert all(T0 <= d["ts"] <= T0 + len(PATH) for d in a.decisions)
+    assert a.ticks_per_sec > 0
+
+    out = write_session_report(a.decisions, get_logger("test"), out_path=str(tmp_path / "r.csv"))
+    with open(out, encoding="utf-8-sig") as fh:
+        rows = list(csv.DictReader(fh))
+    sells = [r for r in rows if r["action"] == "SELL"]
+    assert len(rows) == len(a.decisions) and sells and all(r["pnl_net"] != "" for r in sells)
+
+
+@pytest.mark.parametrize("prices", [[9.0, 9.0, 9.0, 8.0], [8.0, 9.0, 9.0, 9.0, 8.0]])
+def test_default_score_engine_replay_is_deterministic(monkeypatch, prices):
+    import itertools
+
+    import scoring.core as core
+    ticker = itertools.count()
+    monkeypatch.setattr(core, "news_senti_score", lambda sym: (next(ticker) % 3) - 1.0)
+    tape = [(T0 + i, {"AAA": {"price": p}}) for i, p in enumerate(prices)]
+
+    def run():
+        rp = ReplayEngine.build(["AAA"], budget=1_000_000)
+        return [(d["action"], d["price"], d["ts"]) for d in rp.run(iter(tape)).decisions]
+
+    first = run()
+    assert run() == first
+    assert run() == first
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+unit_indicators.py
+- IndicatorEngine.update: SMA/EMA/RSI/ATR/VWAP/롤링 고저를 전체 재계산과 비교, 링 버퍼로 메모리 고정
+- warmup(이력 일괄) == update 반복 (이후 스트리밍도 같은 결과)
+- enrich: 입력 미수정, slow 창 전에는 fast/slow 미기재, 상위 fast/slow 유지
+- Hub(indicators + warm-up 저장소): 스코어러가 fast/slow 가 붙은 snapshot 을 받음
+"""
+import random
+
+import pytest
+
+from hub.hub_trade import Hub
+from market.indicators import IndicatorConfig, IndicatorEngine
+from market.tickstore import TickRecorder
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def _walk(n, seed=3):
+    rng = random.Random(seed)
+    px = [100.0]
+    for _ in range(n - 1):
+        px.append(px[-1] * (1 + rng.gauss(0, 0.01)))
+    return px, [rng.randint(0, 40) for _ in range(n)]
+
+
+def test_update_matches_full_recompute():
+    cfg = IndicatorConfig(fast=3, slow=8, rsi_period=5, atr_period=4, hl_window=6)
+    px, vol = _walk(200)
+    ind = IndicatorEngine(cfg)
+    for p, v in zip(px, vol):
+        ind.update("X", p, v)
+    val = ind.values("X")
+    assert val["fast"] == pytest.approx(sum(px[-3:]) / 3)
+    assert val["slow"] == pytest.approx(sum(px[-8:]) / 8)
+    assert (val["hl_high"], val["hl_low"]) == (max(px[-6:]), min(px[-6:]))
+    assert val["vwap"] == pytest.approx(sum(p * v for p, v in zip(px, vol)) / sum(vol))
+    ema = px[0]
+    for p in px[1:]:
+        ema += 2 / 4 * (p - ema)
+    assert val["ema_fast"] == pytest.approx(ema)
+    assert 0.0 <= val["rsi"] <= 100.0 and val["atr"] > 0
+    st = ind._state["X"]
+    assert len(st.ring) == 8 and len(st.hi) <= 6 and len(st.lo) <= 6
+
+
+@pytest.mark.parametrize("cfg", [IndicatorConfig(), IndicatorConfig(fast=4, slow=4, ma="ema", hl_window=1)])
+def test_warmup_equals_streaming(cfg):
+    px, vol = _walk(500)
+    for T in (1, 2, cfg.slow, 300):
+        a, b = IndicatorEngine(cfg), IndicatorEngine(cfg)
+        for p, v in zip(px[:T], vol[:T]):
+            a.update("X", p, v)
+        b.warmup("X", px[:T], vol[:T])
+        for p, v in zip(px[T:T + 40], vol[T:T + 40]):
+            a.update("X", p, v)
+            b.update("X", p, v)
+        va, vb = a.values("X"), b.values("X")
+        assert va.keys() == vb.keys()
+        for k in va:
+            assert vb[k] == pytest.approx(va[k], rel=1e-9)
+
+
+def test_enrich_fields():
+    ind = IndicatorEngine(IndicatorConfig(fast=2, slow=3))
+    raw = {"AAA": {"price": 10.0, "volume": 5.0}, "BBB": 20.0, "CCC": {"price": 1.0, "fast": 9.0, "slow": 1.0}}
+    out = ind.enrich(raw)
+    assert "fast" not in out["AAA"] and "vwap" in out["AAA"] and "vwap" not in raw["AAA"]
+    assert out["CCC"]["fast"] == 9.0
+    for p in (11.0, 12.0):
+        out = ind.enrich({"AAA": {"price": p}, "BBB": p})
+    assert out["AAA"]["fast"] == 11.5 and out["AAA"]["slow"] == 11.0
+    assert out["BBB"] == {"price": 12.0, **ind.values("BBB")}
+    with pytest.raises(RuntimeError):
+        IndicatorEngine(IndicatorConfig(slow=0))
+
+
+class Scorer:
+    def __init__(self):
+        self.seen = []
+
+    def score(self, snap):
+        self.seen.append(snap)
+        return 0.0
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def test_hub_warmup_and_enrich(tmp_path):
+    rec = TickRecorder(str(tmp_path))
+    for i in range(10):
+        rec.record_snapshot(1_735_700_000.0 + i, {"AAA": {"price": 100.0 + i, "volume": 10}})
+    rec.close()
+    sc = Scorer()
+    hub = Hub(sc, RiskGate(policies=[]), Router(), ExitRules(),
+              config={"budget": 1_000_000, "indicators": {"fast": 2, "slow": 5},
+                      "indicator_warmup_dir": str(tmp_path)})
+    assert hub.indicators._state["AAA"].n == 10
+    assert "vwap" not in hub.indicators.values("AAA")     # 지난 일자 이력 → 세션 누적 초기화
+    hub.on_tick({"AAA": 110.0})
+    snap = sc.seen[-1]
+    assert snap["fast"] == pytest.approx(109.5) and snap["slow"] == pytest.approx(108.0)
+    hub.close()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+unit_latency.py
+- LatencyHistogram: log-linear 버킷 백분위 오차(≈3%) 이내
+- Hub: latency_stats 켜면 단계별 기록, 끄면 아무것도 기록하지 않음
+"""
+from obs.latency import LatencyHistogram
+from hub.hub_trade import Hub
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for v in range(1, 100_001):          # 1ns ~ 100µs 균등
+        h.record(v)
+    assert h.count == 100_000 and h.max == 100_000
+    assert abs(h.percentile(50) - 50_000) / 50_000 < 0.04
+    assert abs(h.percentile(99) - 99_000) / 99_000 < 0.04
+    d = h.summary_dict()
+    assert d["max_us"] == 100.0 and set(d) == {"count", "p50_us", "p99_us", "max_us", "mean_us"}
+
+
+class Scorer:
+    def score(self, tick):
+        return 0.9
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def _run(enabled):
+    hub = Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(),
+              config={"budget": 1_000_000, "latency_stats": enabled})
+    for px in (100.0, 101.0, 102.0):
+        hub.on_tick({"AAA": px, "BBB": px * 2})
+    return hub.latency
+
+
+def test_hub_records_stages_when_enabled():
+    summary = _run(True).summary_dict()
+    assert {"context", "exit", "score", "risk", "route", "tick"} <= set(summary)
+    assert summary["tick"]["count"] == 3
+    assert summary["tick"]["max_us"] >= summary["score"]["max_us"]
+
+
+def test_hub_disabled_records_nothing():
+    lat = _run(False)
+    assert lat.summary_dict() == {}
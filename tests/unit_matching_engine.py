@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+unit_matching_engine.py
+- MKT: 매도호가 체결 + 틱 거래량 초과분 IOC 취소
+- LMT: 최우선 호가 잔량 뒤 대기(queue position) → 부분체결 → 완전체결, 관통 체결, 취소
+- OrderRouter(adapter=LobAdapter) + Hub: 체결가가 테이프를 따름
+"""
+from hub.hub_trade import Hub
+from order.adapters.lob import LobAdapter
+from order.matching import MatchingEngine
+from order.router import OrderRouter
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def test_market_order_takes_touch_and_ioc_remainder():
+    eng = MatchingEngine()
+    assert eng.submit("o0", "AAA", "BUY", 10)[0].status == "CANCELED"   # 시세 없음
+    eng.on_trade("AAA", 100.0, volume=30, bid=99.5, ask=100.5)
+    o, fills = eng.submit("o1", "AAA", "BUY", 50)
+    assert [(f.qty, f.price) for f in fills] == [(30, 100.5)]
+    assert (o.filled, o.status) == (30, "PARTIAL_CANCELED")
+
+
+def test_limit_queue_position_partial_fill_and_cancel():
+    eng = MatchingEngine()
+    eng.on_trade("AAA", 99.0, volume=10, bid=99.0, ask=99.5, bid_size=100, ask_size=80)
+    buy, fills = eng.submit("b1", "AAA", "BUY", 50, 99.0, "LMT")
+    assert not fills and buy.queue_ahead == 100
+    assert [(f.qty, f.price) for f in eng.on_trade("AAA", 99.0, volume=120)] == [(20, 99.0)]
+    assert buy.status == "PARTIAL"
+    assert [f.qty for f in eng.on_trade("AAA", 99.0, volume=100)] == [30]
+    assert buy.status == "FILLED"
+
+    sell, _ = eng.submit("s1", "AAA", "SELL", 10, 101.0, "LMT")
+    eng.submit("s2", "AAA", "SELL", 10, 101.5, "LMT")
+    fills = eng.on_trade("AAA", 102.0, volume=15)                    # 두 레벨 관통
+    assert [(f.oid, f.qty, f.price) for f in fills] == [("s1", 10, 101.0), ("s2", 5, 101.5)]
+
+    eng.submit("b2", "AAA", "BUY", 5, 95.0, "LMT")
+    assert eng.cancel("b2").status == "CANCELED" and eng.cancel("b2") is None
+    assert not eng.on_trade("AAA", 90.0, volume=100)
+
+
+class Scorer:
+    def score(self, tick):
+        return 0.9
+
+
+def test_hub_fills_follow_tape_through_router():
+    adapter = LobAdapter()
+    router = OrderRouter(adapter=adapter)
+    router.connect()
+    hub = Hub(Scorer(), RiskGate(policies=[]), router, ExitRules(), config={"budget": 1_000_000})
+    hub.on_tick({"AAA": {"price": 123.0, "volume": 1e9}})
+    pos = hub.book.position("AAA")
+    assert pos is not None and pos.avg_price == 123.0
+    assert adapter.get_positions()[0].qty == pos.qty
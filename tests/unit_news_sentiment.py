@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+unit_news_sentiment.py
+- 키워드 점수: 심볼/별칭이 들어간 문장만 (POS-NEG)/(POS+NEG)
+- 파일 캐시: REFRESH_SEC 안에서는 파일을 다시 읽지 않고, 주기가 지나 mtime 이 바뀌면 재적재
+- 인덱스(sentiment_index.json)가 있으면 키워드보다 우선
+"""
+import json
+import os
+
+import pytest
+
+import scoring.features.news_sentiment as ns
+
+
+@pytest.fixture
+def news_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ns, "NEWS_DIR", tmp_path)
+    monkeypatch.setattr(ns, "SENTI_FILE", tmp_path / "sentiment_index.json")
+    monkeypatch.setattr(ns, "ALIASES_FILE", tmp_path / "aliases.json")
+    monkeypatch.setattr(ns, "_cache", {"checked": None, "key": None, "index": {}, "sentences": [],
+                                       "aliases": {}, "kw": {}})
+    return tmp_path
+
+
+def test_keyword_score_is_cached_until_file_changes(news_dir, monkeypatch):
+    (news_dir / "aliases.json").write_text(json.dumps({"005930": ["삼성전자"]}), encoding="utf-8")
+    news = news_dir / "a.txt"
+    news.write_text("삼성전자 수주 호재. 다른 종목 하락.\n", encoding="utf-8")
+    assert ns.score("005930") == 1.0
+    assert ns.score("000660") == 0.0
+
+    reads = []
+    real = ns._latest_news_text
+    monkeypatch.setattr(ns, "_latest_news_text", lambda: reads.append(1) or real())
+    news.write_text("삼성전자 실적 부진 악재.\n", encoding="utf-8")
+    os.utime(news, (1, 2_000_000_000))
+    assert ns.score("005930") == 1.0 and reads == []     # 확인 주기 안 → 캐시
+    monkeypatch.setattr(ns, "REFRESH_SEC", 0.0)
+    assert ns.score("005930") == -1.0 and reads == [1]   # mtime 변경 → 재적재
+    assert ns.score("005930") == -1.0 and reads == [1]   # 변경 없음 → stat 만
+
+
+def test_index_takes_priority(news_dir):
+    (news_dir / "a.txt").write_text("005930 하락 악재.\n", encoding="utf-8")
+    (news_dir / "sentiment_index.json").write_text(
+        json.dumps({"005930": [{"ts": "2025-01-02T09:00:00", "score": 0.6}]}), encoding="utf-8")
+    from datetime import datetime
+    assert ns.score("005930", now=datetime(2025, 1, 2, 9, 0)) == pytest.approx(0.6)
+    assert ns.score("000660") == 0.0
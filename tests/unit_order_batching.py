@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+unit_order_batching.py
+- OrderBatcher: 같은 방향 합산 / 반대 방향 상계 / 지정가는 가격별로 분리
+- allocate_fills: 순수량 체결을 원래 의도별로 분배 (상계분은 내부 교차)
+- OrderPipeline(coalesce=True): hold~release 사이 의도를 최소 주문 집합으로 전송
+"""
+from order.pipeline import OrderIntent, OrderPipeline
+from order.router import OrderBatcher, allocate_fills
+
+
+def _it(sym, side, qty, price=100.0, ot="MKT", reason=""):
+    return OrderIntent(sym, side, qty, price, reason, ot)
+
+
+def test_batcher_nets_and_merges():
+    b = OrderBatcher()
+    for it in (_it("AAA", "BUY", 10, reason="a"), _it("AAA", "SELL", 4, reason="b"), _it("AAA", "BUY", 2, reason="a"),
+               _it("BBB", "SELL", 3, 50.0, "LMT"), _it("BBB", "SELL", 1, 51.0, "LMT"),
+               _it("CCC", "BUY", 5), _it("CCC", "SELL", 5)):
+        b.add(it)
+    nets = {(n.symbol, n.price if n.order_type == "LMT" else None): n for n in b.drain()}
+    aaa = nets[("AAA", None)]
+    assert (aaa.side, aaa.qty, aaa.user_tag) == ("BUY", 8, "a|b")
+    assert nets[("BBB", 50.0)].qty == 3 and nets[("BBB", 51.0)].qty == 1
+    assert nets[("CCC", None)].qty == 0
+    assert (b.intents_in, b.orders_out, b.netted_qty, len(b)) == (7, 3, 18, 0)
+
+    # 브로커가 8주 중 6주만 체결 → 상계 4주 + 6주를 매수 leg 에 도착순 분배
+    alloc = [(leg.side, leg.qty, q) for leg, q, _ in allocate_fills(aaa, 6, 101.0)]
+    assert alloc == [("BUY", 10, 10), ("SELL", 4, 4), ("BUY", 2, 0)]
+
+
+class CountingRouter:
+    def __init__(self):
+        self.calls = []
+
+    def buy(self, symbol, qty, price, reason):
+        self.calls.append(("BUY", symbol, qty))
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        self.calls.append(("SELL", symbol, qty))
+        return True, qty, price
+
+
+def test_pipeline_coalesces_held_intents():
+    router = CountingRouter()
+    pipe = OrderPipeline(router, threaded=True, coalesce=True)
+    with pipe.batch():
+        for it in (_it("AAA", "BUY", 5), _it("AAA", "SELL", 5), _it("BBB", "BUY", 1), _it("BBB", "BUY", 2)):
+            pipe.submit(it)
+    assert pipe.flush(timeout=2.0)
+    fills = pipe.poll_fills()
+    assert router.calls == [("BUY", "BBB", 3)]
+    assert [(f.symbol, f.side, f.ok, f.qty) for f in fills] == [
+        ("AAA", "BUY", True, 5), ("AAA", "SELL", True, 5), ("BBB", "BUY", True, 1), ("BBB", "BUY", True, 2)]
+    assert fills[0].message == "NETTED"
+    assert pipe.summary_dict()["coalesced"] == 3
+    pipe.close()
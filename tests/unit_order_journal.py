@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+unit_order_journal.py
+- OrderJournal: 고정 크기 레코드 왕복 / 그룹 커밋(N건마다 fsync) / 잘린 꼬리 감지 후 이어쓰기
+- recover(): FILL 로 포지션(수량/평단) 재구성, 미종결 의도 식별
+- Hub(journal_path): 재시작 시 포지션 복구
+- HubTrade.run_session: 피드 예외로 끝나도 저널을 닫음 (커밋된 체결로 재시작 복구)
+"""
+import pytest
+
+from hub.hub_trade import Hub, HubTrade
+from order.journal import FILL, INTENT, REJECT, OrderJournal, read_journal, recover
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+def test_group_commit_roundtrip_and_torn_tail(tmp_path):
+    path = str(tmp_path / "o.ojnl")
+    j = OrderJournal(path, flush_interval_ms=10_000, flush_records=10)
+    for i in range(25):
+        j.append(INTENT, "005930", "BUY", i + 1, 70_000.5, intent_id=i + 1)
+    assert j.commits == 2                       # 10건마다 1회
+    j.close()
+    assert j.commits == 3
+    recs = list(read_journal(path))
+    assert [r.seq for r in recs] == list(range(1, 26))
+    assert (recs[4].symbol, recs[4].side, recs[4].qty, recs[4].price) == ("005930", "BUY", 5, 70_000.5)
+
+    with open(path, "ab") as fh:                # 크래시 중 부분 기록 흉내
+        fh.write(b"\x4a\x00garbage")
+    assert len(list(read_journal(path))) == 25
+    j = OrderJournal(path, flush_interval_ms=0)
+    assert (j.seq, j.last_intent_id) == (25, 25)
+    j.append(FILL, "005930", "BUY", 1, 70_000.0, intent_id=1)
+    j.close()
+    assert [r.seq for r in read_journal(path)][-2:] == [25, 26]
+
+
+def test_recover_positions_and_open_intents(tmp_path):
+    path = str(tmp_path / "o.ojnl")
+    j = OrderJournal(path, flush_interval_ms=0)
+    j.append(INTENT, "AAA", "BUY", 10, 100.0, intent_id=1)
+    j.append(FILL, "AAA", "BUY", 10, 100.0, intent_id=1)
+    j.append(INTENT, "AAA", "BUY", 10, 110.0, intent_id=2)
+    j.append(FILL, "AAA", "BUY", 10, 110.0, intent_id=2)
+    j.append(INTENT, "AAA", "SELL", 5, 120.0, intent_id=3)
+    j.append(FILL, "AAA", "SELL", 5, 120.0, intent_id=3)
+    j.append(INTENT, "BBB", "BUY", 3, 50.0, intent_id=4)
+    j.append(REJECT, "BBB", "BUY", 3, 0.0, intent_id=4)
+    j.append(INTENT, "CCC", "BUY", 1, 10.0, intent_id=5)   # 결과 기록 전 크래시
+    j.close()
+    rec = recover(path)
+    qty, avg, _ = rec.positions["AAA"]
+    assert (qty, avg) == (15, 105.0) and set(rec.positions) == {"AAA"}
+    assert [r.intent_id for r in rec.open_intents] == [5]
+
+
+class Scorer:
+    def score(self, tick):
+        return 0.9
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def test_hub_restores_positions_from_journal(tmp_path):
+    cfg = {"budget": 1_000_000, "journal_path": str(tmp_path / "hub.ojnl")}
+    hub = Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(), config=dict(cfg))
+    hub.on_tick({"AAA": 100.0, "BBB": 200.0})
+    before = {s: (hub.book.position(s).qty, hub.book.position(s).avg_price) for s in hub.book}
+    hub.close()
+
+    again = Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(), config=dict(cfg))
+    after = {s: (again.book.position(s).qty, again.book.position(s).avg_price) for s in again.book}
+    assert after == before and len(after) == 2
+    assert next(again.orders._ids) == 3          # intent_id 이어서 발급
+    again.close()
+
+
+def test_run_session_closes_journal_on_feed_error(tmp_path):
+    cfg = {"budget": 1_000_000, "journal_path": str(tmp_path / "s.ojnl")}
+    ht = HubTrade(["AAA"], scorer=Scorer(), risk=RiskGate(policies=[]), router=Router(),
+                  exit_rules=ExitRules(), config=dict(cfg))
+
+    def feed():
+        yield {"AAA": 100.0}
+        raise ConnectionError("feed lost")
+
+    with pytest.raises(ConnectionError):
+        ht.run_session(feed(), max_ticks=10)
+    assert ht.hub.journal._closed
+    assert set(recover(cfg["journal_path"]).positions) == {"AAA"}
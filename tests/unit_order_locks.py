@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+unit_order_locks.py
+- TimedLock: 경합 시에만 대기 시간 기록
+- OrderRouter: 서로 다른 심볼 주문은 병렬, 같은 심볼은 직렬, 계좌 조회는 주문에 막히지 않음
+- OrderPipeline(workers>1): 심볼별로 나눠 병렬 전송
+"""
+import threading
+import time
+
+from common.locks import TimedLock
+from order.adapters.kiwoom import OrderResult
+from order.pipeline import OrderIntent, OrderPipeline
+from order.router import OrderRouter
+
+
+def test_timed_lock_records_contention_only():
+    lk = TimedLock()
+    with lk:
+        pass
+    assert (lk.acquires, lk.contended) == (1, 0)
+
+    held = threading.Event()
+
+    def _hold():
+        with lk:
+            held.set()
+            time.sleep(0.03)
+
+    th = threading.Thread(target=_hold)
+    th.start()
+    held.wait()
+    with lk:
+        pass
+    th.join()
+    s = lk.summary_dict()
+    assert s["contended"] == 1 and s["wait_max_us"] >= 10_000 and s["wait_per_acquire_us"] > 0
+
+
+class SlowAdapter:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+
+    def place_order(self, symbol, side, qty, price=None, order_type="MKT", user_tag=None):
+        time.sleep(self.delay)
+        return OrderResult(True, f"{symbol}-{time.perf_counter_ns()}", "FILLED", {"qty": qty, "price": 1.0})
+
+    def get_cash(self):
+        return 1
+
+
+def _elapsed(fn, args_list):
+    ths = [threading.Thread(target=fn, args=a) for a in args_list]
+    t0 = time.perf_counter()
+    for t in ths:
+        t.start()
+    for t in ths:
+        t.join()
+    return time.perf_counter() - t0
+
+
+def test_router_stripes_by_symbol():
+    router = OrderRouter(adapter=SlowAdapter())
+    stripes = router._stripes
+    a = "AAA"
+    b = next(s for s in ("BBB", "CCC", "DDD", "EEE") if stripes.for_key(s) is not stripes.for_key(a))
+    assert _elapsed(router.buy, [(a, 1), (b, 1)]) < 0.09       # 다른 스트라이프 → 병렬
+    assert _elapsed(router.buy, [(a, 1), (a, 1)]) >= 0.095     # 같은 심볼 → 직렬
+
+    th = threading.Thread(target=router.buy, args=(a, 1))
+    th.start()
+    t0 = time.perf_counter()
+    assert router.get_cash() == 1 and time.perf_counter() - t0 < 0.03
+    th.join()
+    st = router.lock_stats()
+    assert st["orders"]["acquires"] == 5 and st["orders"]["contended"] >= 1
+    assert st["account"]["contended"] == 0
+
+
+def test_pipeline_workers_dispatch_symbols_in_parallel():
+    router = OrderRouter(adapter=SlowAdapter())
+    pipe = OrderPipeline(router, threaded=True, workers=4)
+    syms = ("AAA", "BBB", "CCC", "DDD")
+    t0 = time.perf_counter()
+    with pipe.batch():
+        for s in syms:
+            pipe.submit(OrderIntent(s, "BUY", 1, 1.0))
+    assert pipe.flush(timeout=2.0)
+    dt = time.perf_counter() - t0
+    assert sorted(f.symbol for f in pipe.poll_fills()) == list(syms)
+    assert len({id(router._stripes.for_key(s)) for s in syms}) == len(syms)
+    assert dt < 0.15                                           # 직렬이면 4 × 50ms
+    pipe.close()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+unit_order_pipeline.py
+- OrderPipeline: 라우터 호출 형태(OrderResult / 레거시 튜플) 흡수, 실패는 FillEvent(ok=False)
+- Hub(async_orders=True): 느린 브로커여도 on_tick 은 즉시 반환, 체결은 이벤트로 포지션에 반영
+- SELL 실패 시 낙관적으로 닫은 포지션 복원
+"""
+import threading
+import time
+
+from hub.hub_trade import Hub
+from order.adapters.kiwoom import OrderResult
+from order.pipeline import OrderIntent, OrderPipeline
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules
+
+
+class ResultRouter:
+    """실제 OrderRouter 시그니처: buy(symbol, qty, price=None, order_type="MKT", user_tag=None)"""
+    def __init__(self):
+        self.calls = []
+
+    def buy(self, symbol, qty, price=None, order_type="MKT", user_tag=None):
+        self.calls.append((symbol, qty, price, order_type, user_tag))
+        return OrderResult(True, "OID1", "OK", {"qty": qty, "price": 10.0})
+
+    def sell(self, symbol, qty, price=None, order_type="MKT", user_tag=None):
+        raise RuntimeError("거부")
+
+
+def test_pipeline_binds_call_form_and_normalizes_results():
+    router = ResultRouter()
+    pipe = OrderPipeline(router, threaded=False)
+    pipe.submit(OrderIntent("AAA", "BUY", 3, 100.0, reason="score=0.9"))
+    pipe.submit(OrderIntent("AAA", "SELL", 3, 100.0, reason="stop_loss"))
+    buy, sell = pipe.poll_fills()
+    assert router.calls == [("AAA", 3, 100.0, "MKT", "score=0.9")]
+    assert (buy.ok, buy.qty, buy.price, buy.order_id) == (True, 3, 10.0, "OID1")
+    assert not sell.ok and sell.message.startswith("error:")
+    assert pipe.summary_dict()["failed"] == 1
+
+
+class Scorer:
+    def score(self, tick):
+        return 0.9
+
+
+class SlowRouter:
+    def __init__(self, delay):
+        self.delay = delay
+        self.threads = set()
+
+    def buy(self, symbol, qty, price, reason):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        time.sleep(self.delay)
+        return True, qty, price
+
+
+def test_async_hub_does_not_block_on_broker():
+    router = SlowRouter(0.05)
+    hub = Hub(Scorer(), RiskGate(policies=[]), router, ExitRules(),
+              config={"budget": 1_000_000, "async_orders": True})
+    t0 = time.perf_counter()
+    hub.on_tick({"AAA": 100.0, "BBB": 200.0, "CCC": 50.0})
+    assert time.perf_counter() - t0 < 0.05          # 3건 × 50ms 를 기다리지 않음
+    assert set(hub._inflight) == {"AAA", "BBB", "CCC"} and len(hub.book) == 0
+    hub.on_tick({"AAA": 100.0, "BBB": 200.0, "CCC": 50.0})
+    assert hub.orders.summary_dict()["submitted"] == 3  # 처리 중인 심볼은 재주문하지 않음
+    assert hub.drain_orders(timeout=2.0)
+    assert set(hub.book) == {"AAA", "BBB", "CCC"} and not hub._inflight
+    assert router.threads == {"order-dispatch"}
+    hub.orders.close()
+
+
+class RejectSellRouter:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return False, 0, 0.0
+
+
+def test_failed_sell_restores_position():
+    hub = Hub(Scorer(), RiskGate(policies=[]), RejectSellRouter(), ExitRules(),
+              config={"budget": 1_000_000})
+    hub.on_tick({"AAA": 100.0})
+    qty = hub.book.position("AAA").qty
+    for _ in range(10):                               # 손절 조건 유도
+        hub.on_tick({"AAA": 50.0})
+    pos = hub.book.position("AAA")
+    assert hub.orders.summary_dict()["failed"] >= 1   # 청산 SELL 이 실제로 거부됨
+    assert "AAA" in hub.book and pos.qty == qty and pos.avg_price == 100.0
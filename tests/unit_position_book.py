@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+unit_position_book.py
+- PositionBook: id 인턴/슬롯 재사용, 컬럼 집계(노출/MTM/PnL), Mapping 호환
+- Hub: 보유 포지션 청산이 북 컬럼(last_high/hold_ticks)을 통해 동작하는지
+"""
+from common.position_book import PositionBook
+from hub.hub_trade import Hub
+from risk.core import RiskGate
+from scoring.rules.exit_rules import ExitRules, ExitParams
+
+
+def test_intern_and_slot_reuse():
+    book = PositionBook()
+    i = book.open("AAA", 10, 100.0, entry_ts=1.0)
+    book.open("BBB", 5, 200.0)
+    book.close("AAA", "stop_loss")
+    assert "AAA" not in book and len(book) == 1
+    assert book.exit_reason("AAA") == "stop_loss"
+    assert book.open("AAA", 3, 90.0) == i and book.exit_reason("AAA") is None
+    assert book.get("AAA") == {"qty": 3.0, "avg_price": 90.0, "last_high": 90.0}
+    assert sorted(book) == ["AAA", "BBB"]
+
+
+def test_column_aggregates():
+    book = PositionBook()
+    book.open("AAA", 10, 100.0)
+    book.open("BBB", 5, 200.0)
+    book.open("CCC", 1, 50.0)
+    book.close("CCC")
+    ids, prices = book.gather({"AAA": 110.0, "BBB": {"price": 190.0}},
+                              lambda v: v if isinstance(v, float) else v["price"])
+    book.mark(ids, prices)
+    assert book.exposure() == 2000.0
+    assert book.mtm() == 2050.0
+    assert book.unrealized_pnl() == 50.0
+    assert book.get("AAA")["last_high"] == 110.0 and book.get("BBB")["last_high"] == 200.0
+    assert book.sector_values({"AAA": "IT"}.get) == {"IT": 1000.0, "UNKNOWN": 1000.0}
+
+
+class FixedScorer:
+    def score(self, tick):
+        return 0.9
+
+
+class FillRouter:
+    def __init__(self):
+        self.sells = []
+
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        self.sells.append((symbol, qty, reason))
+        return True, qty, price
+
+
+def test_hub_exit_uses_book():
+    router = FillRouter()
+    hub = Hub(FixedScorer(), RiskGate(policies=[]), router,
+              ExitRules(ExitParams(min_hold_ticks=1)), config={"budget": 1_000_000})
+    hub.on_tick({"AAA": 100.0})
+    assert hub.positions.get("AAA")["qty"] >= 1
+    hub.on_tick({"AAA": 100.5})
+    hub.on_tick({"AAA": 101.5})
+    assert router.sells and router.sells[0][2] == "take_profit"
+    assert "AAA" not in hub.positions and hub.risk_ctx.portfolio is hub.book
+    assert hub.book.exit_reason("AAA") == "take_profit"
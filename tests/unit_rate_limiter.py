@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+unit_rate_limiter.py
+- TokenBucket: capacity 까지 버스트, 이후 sleep 없이 wait hint 반환, 시간 경과로 보충
+- KiwoomAdapter(DRY_RUN): 토큰 부족 시 RATE_LIMITED + retry_after (주문/취소 버킷 분리)
+- OrderPipeline: retry_after 만큼 기다렸다 재시도해 체결
+- OrderRouter: 직접 호출(buy/sell/route)은 기본 block → retry_after 대기 후 재시도, block=False 면 즉시 RATE_LIMITED
+  (파이프라인은 block=False 로 호출하고 재시도를 직접 맡음)
+"""
+import logging
+import time
+
+from order.adapters.kiwoom import KiwoomAdapter
+from order.pipeline import OrderIntent, OrderPipeline
+from order.router import OrderRouter
+from order.ratelimit import RateLimiter, TokenBucket, ORDER, CANCEL
+
+_log = logging.getLogger("test.rate")
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_bucket_burst_then_hint_then_refill():
+    clk = Clock()
+    b = TokenBucket(rate=5.0, capacity=5, clock=clk)
+    assert [b.acquire() for _ in range(5)] == [0.0] * 5
+    assert abs(b.acquire() - 0.2) < 1e-9              # 다음 토큰까지 1/5초
+    clk.t = 0.2
+    assert b.acquire() == 0.0 and b.wait_hint() > 0
+    clk.t = 100.0
+    assert b.tokens == 5.0                            # capacity 이상 쌓이지 않음
+    assert (b.granted, b.limited) == (6, 1)
+
+
+def test_adapter_returns_wait_hint_without_sleeping():
+    clk = Clock()
+    lim = RateLimiter({ORDER: TokenBucket(5.0, 2, clk), CANCEL: TokenBucket(5.0, 1, clk)})
+    kw = KiwoomAdapter("00000000", dry_run=True, logger=_log, limiter=lim)
+    kw.connect()
+    t0 = time.perf_counter()
+    res = [kw.place_order("AAA", "BUY", 1, price=1.0, order_type="LMT") for _ in range(3)]
+    assert time.perf_counter() - t0 < 0.05
+    assert [r.ok for r in res] == [True, True, False]
+    assert res[2].message == "RATE_LIMITED" and abs(res[2].raw["retry_after"] - 0.2) < 1e-9
+    # 취소는 별도 버킷 → 주문 버킷이 비어도 통과(대상 주문은 이미 체결이라 거절 메시지)
+    assert kw.cancel_order(res[0].order_id).message == "already filled"
+
+
+class LimitedRouter:
+    def __init__(self):
+        self.kw = KiwoomAdapter("00000000", dry_run=True, logger=_log,
+                                limiter=RateLimiter({ORDER: TokenBucket(100.0, 1)}))
+        self.kw.connect()
+
+    def buy(self, symbol, qty, price=None, order_type="MKT", user_tag=None):
+        return self.kw.place_order(symbol, "BUY", qty, price=price, order_type=order_type, user_tag=user_tag)
+
+    def sell(self, symbol, qty, price=None, order_type="MKT", user_tag=None):
+        return self.kw.place_order(symbol, "SELL", qty, price=price, order_type=order_type, user_tag=user_tag)
+
+
+def test_pipeline_retries_after_hint():
+    pipe = OrderPipeline(LimitedRouter(), threaded=True)
+    for sym in ("AAA", "BBB", "CCC"):
+        pipe.submit(OrderIntent(sym, "BUY", 1, 1.0, order_type="LMT"))
+    assert pipe.flush(timeout=2.0)
+    fills = pipe.poll_fills()
+    assert [f.ok for f in fills] == [True, True, True]
+    assert pipe.summary_dict()["rate_waits"] >= 2
+    pipe.close()
+
+
+def _router(**kw):
+    adapter = KiwoomAdapter("00000000", dry_run=True, logger=_log)
+    router = OrderRouter(adapter=adapter, **kw)
+    adapter.set_rate_limiter(RateLimiter({ORDER: TokenBucket(100.0, 2)}))
+    router.connect()
+    return router
+
+
+def test_router_paces_direct_callers_by_default():
+    router = _router()
+    res = [router.buy(f"S{i}", 1, price=1.0, order_type="LMT") for i in range(8)]
+    assert [r.message for r in res] == ["FILLED"] * 8
+    assert router.rate_waits >= 5
+    routed = router.route({"action": "SELL", "symbol": "S0", "qty": 1, "price": 1.0, "order_type": "LMT"})
+    assert routed.ok
+
+
+def test_router_non_blocking_returns_hint_and_pipeline_opts_out():
+    router = _router(block=False)
+    res = [router.buy(f"S{i}", 1, price=1.0, order_type="LMT") for i in range(4)]
+    assert [r.message for r in res][:2] == ["FILLED", "FILLED"] and "RATE_LIMITED" in [r.message for r in res]
+
+    router = _router()
+    pipe = OrderPipeline(router, threaded=True)
+    for sym in ("AAA", "BBB", "CCC", "DDD"):
+        pipe.submit(OrderIntent(sym, "BUY", 1, 1.0, order_type="LMT"))
+    assert pipe.flush(timeout=2.0)
+    assert [f.ok for f in pipe.poll_fills()] == [True] * 4
+    assert pipe.summary_dict()["rate_waits"] >= 1 and router.rate_waits == 0
+    pipe.close()
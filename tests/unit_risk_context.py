@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+unit_risk_context.py
+- RiskContext: 변경 시에만 version 증가, 정책은 참조로 읽기
+- PolicyContext: 읽기 전용, 정책 인스턴스에 ctx 주입 없음
+"""
+import pytest
+
+from risk.context import RiskContext, PolicyContext
+from risk.core import RiskGate
+from risk.policies.exposure import ExposurePolicy, ExposureConfig
+
+
+def test_version_bumps_only_on_change():
+    rc = RiskContext(budget=1_000_000)
+    v0 = rc.version
+    assert rc.set_equity(1_000_000) is False and rc.version == v0
+    assert rc.set_equity(990_000) is True and rc.version == v0 + 1
+    rc.set_position("AAA", 10, 100.0)
+    assert rc.version == v0 + 2
+    assert rc["account"]["equity"] == 990_000
+    assert rc["portfolio"] is rc.portfolio
+
+
+def test_sector_exposure_tracks_fills():
+    rc = RiskContext(budget=1_000_000, sector_map={"AAA": "IT", "BBB": "IT"})
+    rc.set_position("AAA", 10, 100.0)
+    rc.set_position("BBB", 5, 200.0)
+    assert rc["sector_exposure"] == {"IT": 2000.0}
+    rc.set_position("AAA", 0, 0.0)
+    assert rc["sector_exposure"] == {"IT": 1000.0}
+
+
+def test_gate_reads_context_by_reference():
+    rc = RiskContext(budget=1_000_000)
+    gate = RiskGate(policies=[ExposurePolicy(ExposureConfig(max_total_exposure_pct=0.1))])
+    allow, _, hint = gate.check("AAA", 100.0, rc.portfolio, rc)
+    assert allow and hint == 1000
+    rc.set_position("BBB", 500, 100.0)            # 50,000 사용 → 잔여 50,000
+    allow, _, hint = gate.check("AAA", 100.0, rc.portfolio, rc)
+    assert allow and hint == 500
+
+
+def test_policy_context_is_read_only():
+    rc = RiskContext(budget=1_000_000)
+    pc = PolicyContext(rc, symbol="AAA", price=100.0)
+    assert pc["symbol"] == "AAA" and pc.get("equity") == 1_000_000
+    with pytest.raises(TypeError):
+        pc["symbol"] = "BBB"  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        pc.symbol = "BBB"  # type: ignore[attr-defined]
+    assert PolicyContext.of(pc, price=101.0)["symbol"] == "AAA"
+
+
+def test_daydd_block_survives_read_only_ctx():
+    from risk.policies.day_dd import DayDrawdownPolicy, DayDDParams
+    gate = RiskGate(policies=[DayDrawdownPolicy(DayDDParams(limit_pct=-2.0, cool_minutes=1))])
+    allow, reason, _ = gate.check("AAA", 10.0, {}, {"today_pnl_pct": -3.0, "now_ts": 1000.0})
+    assert not allow and "daydd_hard" in reason
+    allow, reason, _ = gate.check("AAA", 10.0, {}, {"today_pnl_pct": 0.0, "now_ts": 1030.0})
+    assert not allow and "daydd_cooldown" in reason
+    assert not hasattr(gate.policies[0], "ctx")
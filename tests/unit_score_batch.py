@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+unit_score_batch.py
+- ScoreEngine.evaluate_many == [evaluate(s) ...] 비트 단위 (test_scoring_core.py 케이스 + 혼합 입력)
+- 임계값 폴백 상태(_state_prev_price)가 행 순서대로 진행, 컬럼형 배치 입력
+- Hub 가 dirty 심볼을 배치로 평가해도 진입 결과 동일
+"""
+import random
+
+import pytest
+
+import scoring.core as core
+from scoring.core import ScoreEngine
+from scoring.weights import Weights
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def _fixed_news(monkeypatch):
+    monkeypatch.setattr(core, "news_senti_score", lambda s: {"AAA": 0.5, "BBB": -0.3}.get(s, 0.0))
+    core._state_prev_price.clear()
+    yield
+    core._state_prev_price.clear()
+
+
+def _mixed(n, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        d = {"symbol": rng.choice(["AAA", "BBB", "CCC"]), "price": rng.choice([10.0, 10.2, 10.5, rng.uniform(5, 20)])}
+        if rng.random() < 0.6:
+            d["volume"] = rng.choice([0, 100, rng.uniform(0, 1000)])
+        if rng.random() < 0.5:
+            d["avg_vol"] = rng.choice([0, 500, rng.uniform(0, 1000), "x", float("nan")])
+        if rng.random() < 0.5:
+            d["buy_vol"], d["sell_vol"] = rng.uniform(0, 10), rng.choice([0, rng.uniform(0, 10), None])
+        if rng.random() < 0.2:
+            d["prints"] = [{"side": "BUY", "size": 3}, {"side": "SELL", "size": 1}]
+        if rng.random() < 0.4:
+            d["fast"], d["slow"] = rng.choice([1.0, 2.0, "3", None]), rng.choice([1.0, 2.0, "bad"])
+        out.append(d)
+    return out
+
+
+@pytest.mark.parametrize("weights", [Weights(), {"volume": 0.5, "tickflow": 0.2, "ta": 0.3, "news": 0.1}])
+def test_matches_evaluate_exactly(weights):
+    snaps = [{"dummy": "data"}, ("AAA", 10.0)] + _mixed(3000)
+    eng = ScoreEngine(weights)
+    expect = [eng.evaluate(s) for s in snaps]
+    core._state_prev_price.clear()
+    got, X = eng.evaluate_many(snaps, return_features=True)
+    assert got == expect
+    assert X.shape == (len(snaps), len(core.FEATURES))
+
+
+def test_columnar_batch():
+    eng = ScoreEngine(Weights())
+    rows = [{"symbol": f"S{i}", "price": 100.0 + i, "volume": 100.0 * i, "avg_vol": 250.0,
+             "buy_vol": float(i % 7), "sell_vol": 3.0, "fast": float(i % 3), "slow": 1.0} for i in range(50)]
+    cols = {k: [r[k] for r in rows] for k in rows[0]}
+    assert eng.evaluate_many(cols) == [eng.evaluate(r) for r in rows]
+
+
+def test_hub_batch_scoring_same_entries():
+    from hub.hub_trade import Hub
+    from risk.core import RiskGate
+    from scoring.rules.exit_rules import ExitRules
+
+    class Router:
+        def buy(self, symbol, qty, price, reason):
+            return True, qty, price
+
+        def sell(self, symbol, qty, price, reason):
+            return True, qty, price
+
+    ticks = [{f"S{i}": {"price": 100.0 + i, "volume": 900.0 + t * 50 * i, "avg_vol": 500.0,
+                        "buy_vol": 5.0 + i, "sell_vol": 1.0} for i in range(30)} for t in range(3)]
+    books = []
+    for batch in (True, False):
+        core._state_prev_price.clear()
+        hub = Hub(ScoreEngine(Weights()), RiskGate(policies=[]), Router(), ExitRules(),
+                  config={"budget": 1_000_000, "batch_score": batch})
+        assert (hub._score_batch is not None) == batch
+        for snap in ticks:
+            hub.on_tick(snap)
+        books.append({s: hub.book.position(s).qty for s in hub.book})
+    assert books[0] == books[1] and books[0]
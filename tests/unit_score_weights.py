@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+unit_score_weights.py
+- ScoreEngine 가중치 컴파일: evaluate 는 to_dict/해석 없이 컴파일된 벡터 사용
+- weights_version: 대입 / reload_weights / Calibrator 조정 때만 증가 (변화 없는 조정은 유지)
+"""
+import pytest
+
+import scoring.core as core
+from scoring.calibrator import Calibrator
+from scoring.core import ScoreEngine
+from scoring.weights import Weights
+
+
+@pytest.fixture(autouse=True)
+def _no_news(monkeypatch):
+    monkeypatch.setattr(core, "news_senti_score", lambda s: 0.0)
+
+
+class CountingWeights:
+    def __init__(self, **w):
+        self.w = dict(w)
+        self.calls = 0
+
+    def to_dict(self):
+        self.calls += 1
+        return self.w
+
+
+SNAP = {"symbol": "AAA", "price": 100.0, "volume": 750.0, "avg_vol": 500.0,
+        "buy_vol": 3.0, "sell_vol": 1.0, "fast": 2.0, "slow": 1.0}
+
+
+def test_compiled_vector_and_no_per_score_resolution():
+    w = CountingWeights(volume=0.5, tickflow="0.2", ta={"value": 0.3})
+    eng = ScoreEngine(w)
+    assert eng.weight_vector == (0.5, 0.2, 0.3, 0.10)
+    assert w.calls == 1
+    for _ in range(100):
+        eng.evaluate(SNAP)
+    assert w.calls == 1
+    assert eng.evaluate(SNAP) == pytest.approx(0.5 * 0.5 + 0.2 * 0.5 + 0.3 * 1.0)
+
+
+def test_version_bumps_only_on_change():
+    w = Weights(volume=1.0, tickflow=0.0, ta=0.0)
+    eng = ScoreEngine(w)
+    v0 = eng.weights_version
+    assert eng.evaluate(SNAP) == 0.5
+
+    w.volume = 0.0                      # 엔진 밖 수정은 reload 전까지 반영 안 됨
+    assert eng.evaluate(SNAP) == 0.5 and eng.weights_version == v0
+    assert eng.reload_weights() == v0 + 1
+    assert eng.evaluate(SNAP) == 0.0
+
+    eng.weights = {"volume": 0.0, "tickflow": 1.0, "ta": 0.0}
+    assert eng.weights_version == v0 + 2
+    assert eng.evaluate(SNAP) == 0.5
+
+
+def test_calibrator_adjust_recompiles():
+    cal = Calibrator(lr=0.5, clip=0.5)
+    eng = ScoreEngine({"volume": 0.45, "tickflow": 0.35, "ta": 0.20}, calibrator=cal)
+    v0 = eng.weights_version
+    eng.maybe_adjust_weights()           # 성과 기록 없음 → 변화 없음
+    assert eng.weights_version == v0
+
+    eng.on_realized_pnl(0.05)
+    eng.maybe_adjust_weights()
+    assert eng.weights_version == v0 + 1
+    assert eng.weight_vector[0] < 0.45 and eng.weight_vector[1] > 0.35
+    assert eng.weight_vector[:3] == tuple(eng.weights[k] for k in ("volume", "tickflow", "ta"))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+unit_synthetic_feed.py
+- 같은 seed → 같은 경로, 배치 경계와 무관하게 이어지는 가격/EMA
+- 팩터 상관(rho) 반영, 거래량 = buy_vol + sell_vol, 가격 양수
+- rate=0 스트림은 sleep 없이 즉시, snapshot 은 Hub 입력 형태
+"""
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from market.synthetic import SyntheticConfig, SyntheticMarket
+
+
+def test_deterministic_and_fields():
+    cfg = SyntheticConfig(n_symbols=50, seed=3, batch_ticks=16)
+    a = list(SyntheticMarket(cfg, start_ts=0.0).snapshots(40))
+    b = list(SyntheticMarket(cfg, start_ts=0.0).snapshots(40))
+    assert a == b and len(a) == 40 and len(a[0]) == 50
+    tick = a[-1]["S00"]
+    assert set(tick) == {"price", "volume", "buy_vol", "sell_vol", "fast", "slow"}
+    assert tick["price"] > 0 and tick["volume"] == tick["buy_vol"] + tick["sell_vol"]
+
+
+def test_correlation_and_jumps():
+    feed = SyntheticMarket(SyntheticConfig(n_symbols=200, seed=1, rho=0.6, jump_rate=0.0))
+    b = feed.next_batch(2000)
+    r = np.diff(np.log(b.price), axis=0)
+    c = np.corrcoef(r[:, :20].T)
+    off = c[~np.eye(20, dtype=bool)]
+    assert 0.45 < off.mean() < 0.75
+    jumpy = SyntheticMarket(SyntheticConfig(n_symbols=200, seed=1, jump_rate=0.01, jump_sigma=0.2))
+    rj = np.abs(np.diff(np.log(jumpy.next_batch(500).price), axis=0))
+    assert rj.max() > 10 * np.abs(r).max()
+
+
+def test_unpaced_stream_is_fast():
+    feed = SyntheticMarket(SyntheticConfig(n_symbols=1000, seed=2))
+    t0 = time.perf_counter()
+    n = sum(1 for _ in feed.stream(100, rate=0))
+    assert n == 100 and time.perf_counter() - t0 < 5.0
+    paced = SyntheticMarket(SyntheticConfig(n_symbols=10, seed=2))
+    t0 = time.perf_counter()
+    assert sum(1 for _ in paced.stream(5, rate=100)) == 5
+    assert time.perf_counter() - t0 >= 0.035
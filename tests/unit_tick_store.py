@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+unit_tick_store.py
+- TickRecorder: snapshot → 일자/심볼별 고정폭 컬럼 append (flush 여러 번 + 재시작 후 이어쓰기), index.json
+- TickStore: mmap 컬럼 조회(NumPy memmap / memoryview 폴백), 어긋난 컬럼 길이 보정, ts 병합 snapshot
+- iter_snapshots: 심볼별 chunk 행씩만 변환 (첫 snapshot 전에 하루치를 전부 리스트로 만들지 않음)
+- Hub(tick_record_dir) 로 기록한 저장소를 hub/replay 로 재생
+"""
+import os
+
+import market.tickstore as tickstore
+from market.tickstore import TickRecorder, TickStore
+from hub.replay import read_tick_source
+
+T0 = 1_735_700_000.0
+
+
+def _record(root, n=50, flush_rows=7):
+    rec = TickRecorder(root, flush_rows=flush_rows)
+    for i in range(n):
+        rec.record_snapshot(T0 + i * 0.5, {
+            "AAA": {"price": 100.0 + i, "volume": 10 * i, "buy_vol": 3, "sell_vol": 1},
+            "BBB": 200.0 - i,
+        })
+    rec.close()
+    return rec
+
+
+def test_roundtrip_columns_and_append(tmp_path):
+    root = str(tmp_path)
+    _record(root, 30)
+    _record(root, 20)        # 재시작 후 같은 파일에 이어쓰기
+    store = TickStore(root)
+    day = store.days()[0]
+    assert store.symbols(day) == ["AAA", "BBB"]
+    assert store.index(day)["AAA"]["rows"] == 50
+    c = store.columns(day, "AAA")
+    assert len(c) == 50
+    if tickstore.np is not None:
+        assert isinstance(c.price, tickstore.np.memmap)
+    assert c.price[31] == 101.0 and c.volume[31] == 10 and c.side[0] == 1
+    assert int(c.ts[1]) == int(round((T0 + 0.5) * 1e9))
+    b = store.columns(day, "BBB")
+    assert b.volume.sum() == 0 and b.side.sum() == 0
+
+
+def test_torn_columns_and_memoryview_fallback(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    _record(root, 10)
+    day = TickStore(root).days()[0]
+    with open(os.path.join(root, day, "AAA.px"), "ab") as fh:   # ts 기록 전 크래시 흉내
+        fh.write(b"\x00" * 8 * 3)
+    monkeypatch.setattr(tickstore, "np", None)
+    store = TickStore(root)
+    c = store.columns(day, "AAA")
+    assert len(c) == 10 and isinstance(c.price, memoryview)
+    assert c.price[9] == 109.0
+    snaps = list(store.iter_snapshots(day))
+    assert len(snaps) == 10
+    ts, snap = snaps[2]
+    assert ts == T0 + 1.0 and snap["AAA"] == {"price": 102.0, "volume": 20.0, "side": 1}
+    assert snap["BBB"]["price"] == 198.0
+    del c, snaps, snap
+    store.close()
+
+
+class _Spy:
+    """컬럼 뷰 래퍼: 잘라 읽은 최대 행 수 기록"""
+    def __init__(self, col, seen):
+        self.col, self.seen = col, seen
+
+    def __len__(self):
+        return len(self.col)
+
+    def __getitem__(self, sl):
+        part = self.col[sl]
+        self.seen.append(len(part))
+        return part
+
+
+def test_iter_snapshots_streams_in_chunks(tmp_path):
+    root = str(tmp_path)
+    _record(root, 50)
+    store = TickStore(root)
+    day = store.days()[0]
+    full = list(store.iter_snapshots(day))
+    assert list(store.iter_snapshots(day, chunk=3)) == full
+
+    seen = []
+    real = store.columns
+
+    def spy_columns(d, sym):
+        c = real(d, sym)
+        return tickstore.TickColumns(sym, *(_Spy(x, seen) for x in (c.ts, c.price, c.volume, c.side)))
+
+    store.columns = spy_columns
+    it = store.iter_snapshots(day, chunk=4)
+    assert next(it) == full[0]
+    assert seen and max(seen) == 4 and len(seen) == 2 * 4     # 심볼 2개 × 컬럼 4개의 첫 chunk 만
+    assert [next(it) for _ in range(len(full) - 1)] == full[1:]
+
+
+def test_hub_records_and_replays(tmp_path):
+    from hub.replay import ReplayEngine
+    root = str(tmp_path / "ticks")
+    src = ReplayEngine.build(["AAA", "BBB"], budget=1_000_000, config={"tick_record_dir": root})
+    feed = [(T0 + i, {"AAA": {"price": 100.0 + i, "volume": 5.0}, "BBB": 50.0}) for i in range(8)]
+    src.run(iter(feed))
+    src.trade.hub.close()
+    got = list(read_tick_source(root))
+    assert [t for t, _ in got] == [t for t, _ in feed]
+    assert [s["AAA"]["price"] for _, s in got] == [s["AAA"]["price"] for _, s in feed]
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+unit_volume_baseline.py
+- 첫날: 장중 EWMA 기준선(현재 틱 반영 전), 다음 날: 시간대 버킷 곡선 (일간 EWMA, 거래 없던 버킷 유지)
+- roll_day NumPy 경로 == 순수 파이썬 경로, save/load 왕복 + crc 손상 거부
+- enrich: 상위 avg_vol 유지, volume_surge 가 외부 avg_vol 없이 동작
+- Hub(volume_baseline + path): close 때 저장, 다음 날 재시작 시 곡선으로 avg_vol 산출
+- HubTrade.run_session 이 끝나면 (close 를 따로 부르지 않아도) 저장 → 새 Hub 가 로드
+"""
+from datetime import datetime
+
+import pytest
+
+import market.volume_baseline as vbm
+from hub.hub_trade import Hub, HubTrade
+from market.volume_baseline import VolumeBaseline, VolumeBaselineConfig
+from risk.core import RiskGate
+from scoring.features.volume import volume_surge
+from scoring.rules.exit_rules import ExitRules
+
+D1 = datetime(2025, 1, 2, 9, 0).timestamp()
+D2 = datetime(2025, 1, 3, 9, 0).timestamp()
+
+
+def _day(vb, t0, morning=100.0, later=10.0):
+    for i in range(60):                       # 09:00~09:10 (버킷 0, 1)
+        vb.update("AAA", t0 + i * 10, morning if i < 30 else later)
+
+
+def test_intraday_ewma_then_bucket_curve():
+    vb = VolumeBaseline(VolumeBaselineConfig(span=9, day_alpha=0.5))
+    assert vb.update("AAA", D1, 50.0) == 0.0            # 첫 틱: 기준선 없음
+    assert vb.update("AAA", D1 + 1, 70.0) == 50.0       # 자기 자신 미포함
+    assert vb.baseline("AAA", D1 + 2) == pytest.approx(50.0 + 0.2 * 20.0)
+    _day(vb, D1 + 3)
+    assert vb.update("AAA", D2, 1.0) == pytest.approx((50 + 70 + 100 * 30) / 32)   # 일자 전환 → 버킷 0 곡선
+    assert vb.rolls == 1 and vb.day == "20250103"
+    assert vb.baseline("AAA", D2 + 400) == pytest.approx(10.0)                    # 버킷 1
+    _day(vb, D2 + 1, morning=40.0)
+    vb.update("AAA", D2 + 86400, 1.0)
+    k = vb.n_buckets - 1                                   # 거래 없던 버킷은 미학습
+    assert vb.days[k] == 0 and vb.days[1] == 2
+    assert vb.curve[1] == pytest.approx(10.0)
+
+
+def test_roll_day_paths_and_persistence(tmp_path, monkeypatch):
+    vb = VolumeBaseline()
+    _day(vb, D1)
+    vb.update("BBB", D1 + 7200, 5.0)
+    vb.update("AAA", D2, 1.0)
+    _day(vb, D2, morning=300.0)
+    data = vb.encode()
+    a, b = VolumeBaseline.decode(data), VolumeBaseline.decode(data)
+    a.roll_day()
+    monkeypatch.setattr(vbm, "np", None)
+    b.roll_day()
+    assert a.curve.tolist() == b.curve.tolist() and a.days.tolist() == b.days.tolist()
+
+    path = str(tmp_path / "vb.vbl")
+    vb.save(path)
+    back = VolumeBaseline.load(path)
+    assert (back.symbols, back.day, back.today_sum.tolist()) == (["AAA", "BBB"], "20250103", vb.today_sum.tolist())
+    assert VolumeBaseline.load(str(tmp_path / "none.vbl")) is None
+    bad = bytearray(data)
+    bad[30] ^= 0xFF
+    with pytest.raises(RuntimeError):
+        VolumeBaseline.decode(bytes(bad))
+
+
+def test_enrich_feeds_volume_surge():
+    vb = VolumeBaseline()
+    vb.enrich({"AAA": {"price": 1.0, "volume": 100.0}}, D1)
+    out = vb.enrich({"AAA": {"price": 1.0, "volume": 150.0}, "BBB": 5.0,
+                     "CCC": {"price": 1.0, "volume": 9.0, "avg_vol": 3.0}}, D1 + 1)
+    assert out["AAA"]["avg_vol"] == 100.0 and volume_surge(out["AAA"]) == pytest.approx(0.5)
+    assert out["BBB"] == 5.0 and out["CCC"]["avg_vol"] == 3.0
+
+
+class Scorer:
+    def __init__(self):
+        self.seen = []
+
+    def score(self, snap):
+        self.seen.append(snap)
+        return 0.0
+
+
+class Router:
+    def buy(self, symbol, qty, price, reason):
+        return True, qty, price
+
+    def sell(self, symbol, qty, price, reason):
+        return True, qty, price
+
+
+def test_hub_persists_between_days(tmp_path):
+    cfg = {"budget": 1_000_000, "volume_baseline": True, "volume_baseline_path": str(tmp_path / "vb.vbl")}
+    hub = Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(), config=cfg)
+    hub.clock = lambda: D1
+    for v in (100.0, 100.0, 100.0):
+        hub.on_tick({"AAA": {"price": 10.0, "volume": v}})
+    hub.close()
+
+    sc = Scorer()
+    again = Hub(sc, RiskGate(policies=[]), Router(), ExitRules(), config=cfg)
+    again.clock = lambda: D2
+    again.on_tick({"AAA": {"price": 10.0, "volume": 300.0}})
+    assert sc.seen[-1]["avg_vol"] == pytest.approx(100.0)
+    assert volume_surge(sc.seen[-1]) == 1.0
+    again.close()
+
+
+def test_run_session_saves_baseline_for_next_hub(tmp_path):
+    cfg = {"budget": 1_000_000, "volume_baseline": True, "volume_baseline_path": str(tmp_path / "vb.vbl")}
+    ht = HubTrade(["AAA"], scorer=Scorer(), risk=RiskGate(policies=[]), router=Router(),
+                  exit_rules=ExitRules(), config=dict(cfg))
+    ht.hub.clock = lambda: D1
+    ht.run_session(iter([{"AAA": {"price": 10.0, "volume": 100.0}}] * 3), max_ticks=10)
+
+    again = Hub(Scorer(), RiskGate(policies=[]), Router(), ExitRules(), config=dict(cfg))
+    assert again.volume_baseline.symbols == ["AAA"]
+    assert again.volume_baseline.baseline("AAA", D1) == pytest.approx(100.0)
+    again.close()